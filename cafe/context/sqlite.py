@@ -0,0 +1,67 @@
+import pickle
+import sqlite3
+import threading
+from typing import Any
+
+from .base import BaseContext
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS context (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL
+);
+"""
+
+
+class SQLiteContext(BaseContext):
+    """
+    Persistent context backed by a SQLite file. Values are pickled, so any
+    picklable object can be stored; missing keys read as None.
+    Safe to share between threads, and between processes via the same file.
+    """
+
+    def __init__(self, db_path: str = ":memory:", timeout: float = 30.0):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            db_path, timeout=timeout, check_same_thread=False, isolation_level=None
+        )
+        with self._lock:
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get_data(self, key: str) -> Any:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM context WHERE key = ?", (key,)
+            ).fetchone()
+        return None if row is None else pickle.loads(row[0])
+
+    def set_data(self, key: str, value: Any) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO context (key, value) VALUES (?, ?)",
+                (key, blob),
+            )
+
+    def delete_data(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM context WHERE key = ?", (key,))
+
+    def keys(self, prefix: str = "") -> list:
+        """Stored keys starting with prefix."""
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM context WHERE key LIKE ? ESCAPE '\\' ORDER BY key",
+                (escaped + "%",),
+            ).fetchall()
+        return [row[0] for row in rows]
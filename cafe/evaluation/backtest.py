@@ -0,0 +1,308 @@
+import math
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import numpy as np  # type: ignore
+
+from cafe.sources.processing.metaculus import parse_time
+from cafe.sources.question import MetaculusForecastQuestion
+
+from .evaluator import DefaultEvaluator, Evaluator
+
+
+def _time_or_none(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return parse_time(value) if isinstance(value, str) else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _time_or_nan(value: Any) -> float:
+    parsed = _time_or_none(value)
+    return math.nan if parsed is None else parsed
+
+
+def _parse_resolution(value: Any) -> Optional[float]:
+    """Binary resolution as 1.0/0.0 ("yes"/"no" or numeric); None if annulled."""
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in ("yes", "true"):
+            return 1.0
+        if lowered in ("no", "false"):
+            return 0.0
+    try:
+        resolution = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(resolution) else resolution
+
+
+def _first_center(entry: dict) -> float:
+    value = entry.get("centers", entry.get("q2"))
+    if isinstance(value, (list, tuple)):
+        value = value[0] if value else None
+    if value is None:
+        # Aggregation entries without a center carry no prediction
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class QuestionState:
+    """
+    What was known about one question at a cutoff. The resolution is
+    deliberately absent; history arrays are views into the store.
+    """
+
+    def __init__(
+        self,
+        question: MetaculusForecastQuestion,
+        cutoff: float,
+        community_prediction: Optional[float],
+        history_times: np.ndarray,
+        history_values: np.ndarray,
+        comments: List[dict],
+    ):
+        self.question = question
+        self.cutoff = cutoff
+        self.community_prediction = community_prediction
+        self.history_times = history_times
+        self.history_values = history_values
+        self.comments = comments
+
+    def to_context(self) -> Dict[str, Any]:
+        """Initial ForecastPipeline context for this state."""
+        return {
+            "question": self.question,
+            "cutoff": self.cutoff,
+            "community_prediction": self.community_prediction,
+            "history": {"times": self.history_times, "values": self.history_values},
+            "comments": self.comments,
+        }
+
+
+class _IndexedQuestion:
+    def __init__(self, raw: dict, comments: List[dict]):
+        qdata = raw.get("question", raw)
+        self.qid = str(raw.get("id"))
+        self.title = raw.get("title") or qdata.get("title") or ""
+        self.description = qdata.get("description")
+        self.resolution_criteria = qdata.get("resolution_criteria")
+        self.tags = qdata.get("tags") or raw.get("tags") or []
+        self.open_time = _time_or_none(
+            qdata.get("open_time") or qdata.get("created_at") or raw.get("created_at")
+        )
+        self.resolve_time = _time_or_none(
+            qdata.get("actual_resolve_time")
+            or qdata.get("resolve_time")
+            or raw.get("resolved_at")
+        )
+        self.resolution = _parse_resolution(
+            qdata.get("resolution", raw.get("resolution"))
+        )
+        # Any of these keys may be present but null in API payloads
+        history = (raw.get("community_prediction") or {}).get("history")
+        if history is None:
+            aggregations = qdata.get("aggregations") or {}
+            history = (aggregations.get("recency_weighted") or {}).get("history")
+        # A snapshot becomes known when its aggregation window starts
+        known = np.array(
+            [
+                _time_or_nan(h.get("start_time", h.get("end_time")))
+                for h in history or []
+            ],
+            dtype=float,
+        )
+        values = np.array([_first_center(h) for h in history or []], dtype=float)
+        # Snapshots without a time or a center carry no prediction
+        keep = ~np.isnan(known) & ~np.isnan(values)
+        order = np.argsort(known[keep], kind="stable")
+        self.history_times = known[keep][order]
+        self.history_values = values[keep][order]
+        comment_times = np.array(
+            [_time_or_nan(c.get("created_at")) for c in comments],
+            dtype=float,
+        )
+        keep = ~np.isnan(comment_times)
+        order = np.argsort(comment_times[keep], kind="stable")
+        self.comment_times = comment_times[keep][order]
+        kept = [c for c, k in zip(comments, keep) if k]
+        self.comments = [kept[i] for i in order]
+
+
+class PointInTimeStore:
+    """
+    Pre-indexed Metaculus questions and comments for point-in-time replay.
+    Community prediction snapshots are ordered by when they became known and
+    comments by creation time, so the state at any cutoff is a binary search.
+    A question is only available at cutoffs after it opened and before it
+    resolved, and its resolution is never part of the state.
+    """
+
+    def __init__(
+        self,
+        questions: Iterable[dict],
+        comments_by_qid: Optional[Dict[str, List[dict]]] = None,
+    ):
+        comments_by_qid = comments_by_qid or {}
+        self._questions: Dict[str, _IndexedQuestion] = {}
+        for raw in questions:
+            qid = str(raw.get("id"))
+            self._questions[qid] = _IndexedQuestion(raw, comments_by_qid.get(qid, []))
+
+    def question_ids(self) -> List[str]:
+        return list(self._questions)
+
+    def resolution(self, qid: str) -> Optional[float]:
+        """Resolution label used for scoring only."""
+        return self._questions[qid].resolution
+
+    def states(self, qid: str, cutoffs: Sequence[float]) -> Iterator[QuestionState]:
+        """States of one question at every valid cutoff (vectorized lookup)."""
+        indexed = self._questions[qid]
+        times = np.asarray(cutoffs, dtype=float)
+        valid = np.ones(times.shape, dtype=bool)
+        if indexed.open_time is not None:
+            valid &= times >= indexed.open_time
+        if indexed.resolve_time is not None:
+            valid &= times < indexed.resolve_time
+        times = times[valid]
+        n_snapshots = np.searchsorted(indexed.history_times, times, side="right")
+        n_comments = np.searchsorted(indexed.comment_times, times, side="right")
+        for cutoff, k, c in zip(times.tolist(), n_snapshots, n_comments):
+            question = MetaculusForecastQuestion(
+                id=indexed.qid,
+                title=indexed.title,
+                description=indexed.description,
+                resolution_criteria=indexed.resolution_criteria,
+                status="open",
+                community_prediction=(
+                    float(indexed.history_values[k - 1]) if k else None
+                ),
+                tags=indexed.tags,
+            )
+            yield QuestionState(
+                question=question,
+                cutoff=cutoff,
+                community_prediction=question.community_prediction,
+                history_times=indexed.history_times[:k],
+                history_values=indexed.history_values[:k],
+                comments=indexed.comments[:c],
+            )
+
+    def iter_states(
+        self, cutoffs: Sequence[float], qids: Optional[Iterable[str]] = None
+    ) -> Iterator[QuestionState]:
+        """Lazily yield every valid (question, cutoff) state."""
+        for qid in qids if qids is not None else self._questions:
+            yield from self.states(str(qid), cutoffs)
+
+
+def default_probability(context: Dict[str, Any]) -> Optional[float]:
+    value = context.get("probability")
+    return None if value is None else float(value)
+
+
+class Backtester:
+    """
+    Replays a ForecastPipeline over (question, cutoff) states in a thread pool
+    and scores the probabilities against resolutions with an Evaluator.
+    Args:
+        store: PointInTimeStore with the corpus.
+        pipeline: Object with run(context) -> context (e.g. ForecastPipeline).
+        extract_probability: Reads the forecast probability from the final
+            context (default: context["probability"]).
+        evaluator: Evaluator used for scoring (default: DefaultEvaluator).
+        max_workers: Pipelines run concurrently.
+    """
+
+    def __init__(
+        self,
+        store: PointInTimeStore,
+        pipeline: Any,
+        extract_probability: Callable[
+            [Dict[str, Any]], Optional[float]
+        ] = default_probability,
+        evaluator: Evaluator = DefaultEvaluator,
+        max_workers: int = 8,
+    ):
+        self.store = store
+        self.pipeline = pipeline
+        self.extract_probability = extract_probability
+        self.evaluator = evaluator
+        self.max_workers = max_workers
+
+    def _forecast(
+        self, position: int, state: QuestionState
+    ) -> Tuple[int, Dict[str, Any]]:
+        record: Dict[str, Any] = {"qid": state.question.id, "cutoff": state.cutoff}
+        try:
+            context = self.pipeline.run(state.to_context())
+            record["probability"] = self.extract_probability(context)
+        except Exception as e:
+            record["probability"] = None
+            record["error"] = str(e)
+        return position, record
+
+    def run(
+        self, cutoffs: Sequence[float], qids: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Forecast every valid (question, cutoff) pair and score them.
+        Returns {"predictions": [...], "metrics": {...}, "by_cutoff": {...}}.
+        Predictions are ordered by question, then cutoff.
+        """
+        states = self.store.iter_states(cutoffs, qids)
+        indexed: List[Tuple[int, Dict[str, Any]]] = []
+        # Bounded submission keeps memory flat for large corpora
+        max_pending = self.max_workers * 4
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending: Set[Future] = set()
+            for position, state in enumerate(states):
+                pending.add(executor.submit(self._forecast, position, state))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    indexed.extend(f.result() for f in done)
+            indexed.extend(f.result() for f in pending)
+        indexed.sort(key=lambda item: item[0])
+        records = [record for _, record in indexed]
+        for record in records:
+            record["resolution"] = self.store.resolution(record["qid"])
+        return {"predictions": records, **self.score(records)}
+
+    def score(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Overall and per-cutoff metrics over scorable predictions."""
+        scored = [
+            r
+            for r in records
+            if r.get("probability") is not None
+            and math.isfinite(r["probability"])
+            and r.get("resolution") in (0.0, 1.0)
+        ]
+        if not scored:
+            return {"metrics": {}, "by_cutoff": {}}
+        y_true = np.array([r["resolution"] for r in scored])
+        y_prob = np.array([r["probability"] for r in scored])
+        y_pred = (y_prob >= 0.5).astype(float)
+        cutoffs = np.array([r["cutoff"] for r in scored])
+        return {
+            "metrics": self.evaluator.evaluate(y_true, y_prob, y_pred),
+            "by_cutoff": self.evaluator.evaluate_grouped(
+                y_true, y_prob, cutoffs, y_pred
+            ),
+        }
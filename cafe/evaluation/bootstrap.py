@@ -0,0 +1,221 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np  # type: ignore
+
+from .metrics import (
+    ArrayLike,
+    accuracy,
+    brier_score,
+    log_loss,
+    pointwise_accuracy,
+    pointwise_brier,
+    pointwise_log_loss,
+)
+
+# Metrics that are means of per-forecast losses: resamples reduce to a
+# vectorized mean over resample indices. Other metrics are recomputed per resample.
+POINTWISE_METRICS: Dict[Callable, Callable] = {
+    brier_score: pointwise_brier,
+    log_loss: pointwise_log_loss,
+    accuracy: pointwise_accuracy,
+}
+
+# Resamples per task, also capped so one task indexes at most
+# MAX_CHUNK_ELEMENTS values. Chunking depends only on the sample size, so
+# results do not depend on the number of workers.
+CHUNK_SIZE = 200
+MAX_CHUNK_ELEMENTS = 4_000_000
+# Use worker processes once resampling touches this many elements
+PARALLEL_THRESHOLD = 20_000_000
+
+# (metric, arguments, arguments of the compared model or None)
+GenericMetric = Tuple[Callable, Sequence[np.ndarray], Optional[Sequence[np.ndarray]]]
+
+
+def _resample_chunk(
+    seed: np.random.SeedSequence,
+    size: int,
+    pointwise: np.ndarray,
+    generic: List[GenericMetric],
+) -> np.ndarray:
+    """
+    Statistics of `size` resamples: row means of every pointwise loss, then
+    every generic metric. Returns a (n_stats, size) array.
+    """
+    n = pointwise.shape[1] if pointwise.size else len(generic[0][1][0])
+    idx = np.random.default_rng(seed).integers(0, n, size=(size, n))
+    stats = (
+        [np.vstack([row[idx].mean(axis=1) for row in pointwise])]
+        if pointwise.size
+        else []
+    )
+    if generic:
+        values = np.empty((len(generic), size))
+        for j, (metric, args, other_args) in enumerate(generic):
+            for r in range(size):
+                rows = idx[r]
+                value = metric(*[a[rows] for a in args])
+                if other_args is not None:
+                    value -= metric(*[a[rows] for a in other_args])
+                values[j, r] = value
+        stats.append(values)
+    return np.vstack(stats)
+
+
+def _resample_stats(
+    pointwise: np.ndarray,
+    generic: List[GenericMetric],
+    n_resamples: int,
+    seed: int,
+    processes: Optional[int],
+) -> np.ndarray:
+    n = pointwise.shape[1] if pointwise.size else len(generic[0][1][0])
+    chunk = max(1, min(CHUNK_SIZE, MAX_CHUNK_ELEMENTS // max(n, 1)))
+    sizes = [min(chunk, n_resamples - start) for start in range(0, n_resamples, chunk)]
+    # One independent child stream per chunk makes results reproducible
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if processes is None:
+        processes = 0 if n_resamples * n >= PARALLEL_THRESHOLD else 1
+    if processes == 1 or len(sizes) == 1:
+        chunks = [
+            _resample_chunk(s, k, pointwise, generic) for s, k in zip(seeds, sizes)
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=processes or None) as executor:
+            chunks = list(
+                executor.map(
+                    _resample_chunk,
+                    seeds,
+                    sizes,
+                    [pointwise] * len(sizes),
+                    [generic] * len(sizes),
+                )
+            )
+    return np.hstack(chunks)
+
+
+def _summarize(
+    estimate: float, samples: np.ndarray, confidence: float, paired: bool
+) -> Dict[str, float]:
+    alpha = 1.0 - confidence
+    lower, upper = np.quantile(samples, [alpha / 2, 1 - alpha / 2])
+    summary = {
+        "estimate": float(estimate),
+        "lower": float(lower),
+        "upper": float(upper),
+        "std": float(np.std(samples, ddof=1)) if samples.size > 1 else 0.0,
+    }
+    if paired:
+        # Two-sided bootstrap p-value for "no difference"
+        below = float(np.mean(samples <= 0))
+        above = float(np.mean(samples >= 0))
+        summary["p_value"] = min(1.0, 2 * min(below, above))
+    return summary
+
+
+def bootstrap_ci(
+    values: ArrayLike,
+    n_resamples: int = 1000,
+    confidence: float = 0.95,
+    seed: int = 0,
+    processes: Optional[int] = None,
+) -> Dict[str, float]:
+    """
+    Percentile bootstrap interval of the mean of per-forecast values
+    (e.g. pointwise Brier scores).
+    Returns {"estimate", "lower", "upper", "std"}.
+    """
+    pointwise = np.atleast_2d(np.asarray(values, dtype=float))
+    samples = _resample_stats(pointwise, [], n_resamples, seed, processes)[0]
+    return _summarize(pointwise.mean(), samples, confidence, paired=False)
+
+
+def paired_bootstrap(
+    values_a: ArrayLike,
+    values_b: ArrayLike,
+    n_resamples: int = 1000,
+    confidence: float = 0.95,
+    seed: int = 0,
+    processes: Optional[int] = None,
+) -> Dict[str, float]:
+    """
+    Paired bootstrap of mean(values_a) - mean(values_b), resampling the same
+    forecasts for both models.
+    Returns {"estimate", "lower", "upper", "std", "p_value"}.
+    """
+    diff = np.asarray(values_a, dtype=float) - np.asarray(values_b, dtype=float)
+    samples = _resample_stats(np.atleast_2d(diff), [], n_resamples, seed, processes)[0]
+    return _summarize(diff.mean(), samples, confidence, paired=True)
+
+
+def bootstrap_metrics(
+    metrics: Dict[str, Callable],
+    prediction_metrics: Sequence[str],
+    y_true: ArrayLike,
+    y_prob: ArrayLike,
+    y_pred: Optional[ArrayLike] = None,
+    y_prob_b: Optional[ArrayLike] = None,
+    y_pred_b: Optional[ArrayLike] = None,
+    n_resamples: int = 1000,
+    confidence: float = 0.95,
+    seed: int = 0,
+    processes: Optional[int] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Bootstrap intervals for named metrics, all computed on the same resamples.
+    With y_prob_b the bootstrap is paired and intervals are for the difference
+    metric(model a) - metric(model b).
+    Args:
+        metrics: Metric functions by name (as in Evaluator).
+        prediction_metrics: Names of metrics called with predictions instead of
+            probabilities; they are skipped without predictions.
+        processes: Worker processes. None parallelizes only large workloads;
+            1 runs inline; 0 uses every core.
+    """
+    y_true_arr = np.asarray(y_true, dtype=float)
+    paired = y_prob_b is not None
+    inputs = {
+        "prob": (np.asarray(y_prob, dtype=float), _optional_array(y_prob_b)),
+        "pred": (_optional_array(y_pred), _optional_array(y_pred_b)),
+    }
+    names: List[str] = []
+    generic_names: List[str] = []
+    pointwise_rows: List[np.ndarray] = []
+    generic: List[GenericMetric] = []
+    estimates: Dict[str, float] = {}
+    for name, metric in metrics.items():
+        kind = "pred" if name in prediction_metrics else "prob"
+        forecast_a, forecast_b = inputs[kind]
+        if forecast_a is None:
+            continue
+        args_b: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        if paired:
+            if forecast_b is None:
+                continue
+            args_b = (y_true_arr, forecast_b)
+        estimates[name] = metric(y_true_arr, forecast_a) - (
+            metric(*args_b) if args_b else 0.0
+        )
+        pointwise_fn = POINTWISE_METRICS.get(metric)
+        if pointwise_fn is not None:
+            losses = pointwise_fn(y_true_arr, forecast_a)
+            if args_b:
+                losses = losses - pointwise_fn(*args_b)
+            names.append(name)
+            pointwise_rows.append(losses)
+        else:
+            generic_names.append(name)
+            generic.append((metric, (y_true_arr, forecast_a), args_b))
+    if not estimates:
+        return {}
+    pointwise = np.vstack(pointwise_rows) if pointwise_rows else np.empty((0, 0))
+    samples = _resample_stats(pointwise, generic, n_resamples, seed, processes)
+    return {
+        name: _summarize(estimates[name], samples[i], confidence, paired)
+        for i, name in enumerate(names + generic_names)
+    }
+
+
+def _optional_array(values: Optional[ArrayLike]) -> Optional[np.ndarray]:
+    return None if values is None else np.asarray(values, dtype=float)
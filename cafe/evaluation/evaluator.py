@@ -1,25 +1,123 @@
-from typing import Callable, Dict, Optional, Sequence
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence
 
-from .metrics import accuracy, brier_score, log_loss
+import numpy as np  # type: ignore
+
+from .bootstrap import bootstrap_metrics
+from .metrics import ArrayLike, accuracy, brier_score, log_loss
 
 
 class Evaluator:
-    def __init__(self, metrics: Dict[str, Callable]):
+    """
+    Applies named metric functions to forecasts.
+    Metrics are called as metric(y_true, y_prob), except those listed in
+    prediction_metrics (default: "accuracy"), which are called with y_pred and
+    skipped when no predictions are given.
+    """
+
+    def __init__(
+        self,
+        metrics: Dict[str, Callable],
+        prediction_metrics: Sequence[str] = ("accuracy",),
+    ):
         self.metrics = metrics
+        self.prediction_metrics = set(prediction_metrics)
 
     def evaluate(
         self,
-        y_true: Sequence[float],
-        y_prob: Sequence[float],
-        y_pred: Optional[Sequence[float]] = None,
-    ) -> Dict[str, float]:
+        y_true: ArrayLike,
+        y_prob: ArrayLike,
+        y_pred: Optional[ArrayLike] = None,
+    ) -> Dict[str, Any]:
         results = {}
-        if "brier" in self.metrics:
-            results["brier"] = self.metrics["brier"](y_true, y_prob)
-        if "log_loss" in self.metrics:
-            results["log_loss"] = self.metrics["log_loss"](y_true, y_prob)
-        if "accuracy" in self.metrics and y_pred is not None:
-            results["accuracy"] = self.metrics["accuracy"](y_true, y_pred)
+        for name, metric in self.metrics.items():
+            if name in self.prediction_metrics:
+                if y_pred is not None:
+                    results[name] = metric(y_true, y_pred)
+            else:
+                results[name] = metric(y_true, y_prob)
+        return results
+
+    def evaluate_with_ci(
+        self,
+        y_true: ArrayLike,
+        y_prob: ArrayLike,
+        y_pred: Optional[ArrayLike] = None,
+        n_resamples: int = 1000,
+        confidence: float = 0.95,
+        seed: int = 0,
+        processes: Optional[int] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Point estimates with percentile bootstrap intervals:
+        {metric: {"estimate", "lower", "upper", "std"}}.
+        """
+        return bootstrap_metrics(
+            self.metrics,
+            sorted(self.prediction_metrics),
+            y_true,
+            y_prob,
+            y_pred,
+            n_resamples=n_resamples,
+            confidence=confidence,
+            seed=seed,
+            processes=processes,
+        )
+
+    def compare(
+        self,
+        y_true: ArrayLike,
+        y_prob_a: ArrayLike,
+        y_prob_b: ArrayLike,
+        y_pred_a: Optional[ArrayLike] = None,
+        y_pred_b: Optional[ArrayLike] = None,
+        n_resamples: int = 1000,
+        confidence: float = 0.95,
+        seed: int = 0,
+        processes: Optional[int] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Paired bootstrap of metric(a) - metric(b) on the same questions:
+        {metric: {"estimate", "lower", "upper", "std", "p_value"}}.
+        """
+        return bootstrap_metrics(
+            self.metrics,
+            sorted(self.prediction_metrics),
+            y_true,
+            y_prob_a,
+            y_pred_a,
+            y_prob_b=y_prob_b,
+            y_pred_b=y_pred_b,
+            n_resamples=n_resamples,
+            confidence=confidence,
+            seed=seed,
+            processes=processes,
+        )
+
+    def evaluate_grouped(
+        self,
+        y_true: ArrayLike,
+        y_prob: ArrayLike,
+        groups: ArrayLike,
+        y_pred: Optional[ArrayLike] = None,
+    ) -> Dict[Hashable, Dict[str, Any]]:
+        """
+        Evaluate every group label separately (e.g. by tag, model or time bucket).
+        Rows are sorted by group once and each group is scored on a slice.
+        """
+        y_true_arr = np.asarray(y_true, dtype=float)
+        y_prob_arr = np.asarray(y_prob, dtype=float)
+        y_pred_arr = None if y_pred is None else np.asarray(y_pred, dtype=float)
+        labels, codes = np.unique(np.asarray(groups), return_inverse=True)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+        results: Dict[Hashable, Dict[str, Any]] = {}
+        for i, label in enumerate(labels):
+            rows = order[bounds[i] : bounds[i + 1]]
+            results[label.item() if hasattr(label, "item") else label] = self.evaluate(
+                y_true_arr[rows],
+                y_prob_arr[rows],
+                None if y_pred_arr is None else y_pred_arr[rows],
+            )
         return results
 
 
@@ -1,30 +1,150 @@
-from typing import Sequence
+from typing import Dict, Sequence, Union
 
 import numpy as np  # type: ignore
 
+ArrayLike = Union[Sequence[float], np.ndarray]
 
-def brier_score(y_true: Sequence[float], y_prob: Sequence[float]) -> float:
+
+def _as_float(values: ArrayLike) -> np.ndarray:
+    # np.asarray does not copy float64 arrays (or views of them)
+    return np.asarray(values, dtype=float)
+
+
+def pointwise_brier(y_true: ArrayLike, y_prob: ArrayLike) -> np.ndarray:
+    """Per-forecast squared error."""
+    return (_as_float(y_true) - _as_float(y_prob)) ** 2
+
+
+def brier_score(y_true: ArrayLike, y_prob: ArrayLike) -> float:
     """Compute the Brier score for probabilistic forecasts."""
-    y_true_arr = np.array(y_true, dtype=float)
-    y_prob_arr = np.array(y_prob, dtype=float)
-    return float(np.mean((y_true_arr - y_prob_arr) ** 2))
+    return float(np.mean(pointwise_brier(y_true, y_prob)))
+
+
+def pointwise_log_loss(
+    y_true: ArrayLike, y_prob: ArrayLike, eps: float = 1e-15
+) -> np.ndarray:
+    """Per-forecast log loss."""
+    y_true_arr = _as_float(y_true)
+    y_prob_arr = np.clip(_as_float(y_prob), eps, 1 - eps)
+    return -(y_true_arr * np.log(y_prob_arr) + (1 - y_true_arr) * np.log1p(-y_prob_arr))
 
 
-def log_loss(
-    y_true: Sequence[float], y_prob: Sequence[float], eps: float = 1e-15
-) -> float:
+def log_loss(y_true: ArrayLike, y_prob: ArrayLike, eps: float = 1e-15) -> float:
     """Compute the log loss for probabilistic forecasts."""
-    y_true_arr = np.array(y_true, dtype=float)
-    y_prob_arr = np.clip(np.array(y_prob, dtype=float), eps, 1 - eps)
-    return float(
-        -np.mean(
-            y_true_arr * np.log(y_prob_arr) + (1 - y_true_arr) * np.log(1 - y_prob_arr)
-        )
-    )
+    return float(np.mean(pointwise_log_loss(y_true, y_prob, eps)))
 
 
-def accuracy(y_true: Sequence[float], y_pred: Sequence[float]) -> float:
+def pointwise_accuracy(y_true: ArrayLike, y_pred: ArrayLike) -> np.ndarray:
+    """1.0 where the prediction matches the outcome, else 0.0."""
+    return (_as_float(y_true) == _as_float(y_pred)).astype(float)
+
+
+def accuracy(y_true: ArrayLike, y_pred: ArrayLike) -> float:
     """Compute accuracy for binary outcomes."""
-    y_true_arr = np.array(y_true, dtype=float)
-    y_pred_arr = np.array(y_pred, dtype=float)
-    return float(np.mean(y_true_arr == y_pred_arr))
+    return float(np.mean(pointwise_accuracy(y_true, y_pred)))
+
+
+def probability_bins(y_prob: ArrayLike, n_bins: int = 10) -> np.ndarray:
+    """
+    Index of the equal-width probability bin of every forecast.
+    Probabilities are clipped to [0, 1] first, as log_loss clips them.
+    """
+    y_prob_arr = np.clip(_as_float(y_prob), 0.0, 1.0)
+    return np.minimum((y_prob_arr * n_bins).astype(np.intp), n_bins - 1)
+
+
+def bin_statistics(
+    y_true: ArrayLike, y_prob: ArrayLike, n_bins: int = 10
+) -> Dict[str, np.ndarray]:
+    """Per-bin forecast count, summed probability and summed outcome."""
+    y_true_arr = _as_float(y_true)
+    y_prob_arr = _as_float(y_prob)
+    bins = probability_bins(y_prob_arr, n_bins)
+    return {
+        "count": np.bincount(bins, minlength=n_bins).astype(float),
+        "sum_prob": np.bincount(bins, weights=y_prob_arr, minlength=n_bins),
+        "sum_true": np.bincount(bins, weights=y_true_arr, minlength=n_bins),
+    }
+
+
+def calibration_from_bins(
+    count: np.ndarray, sum_prob: np.ndarray, sum_true: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Calibration curve from bin statistics (empty bins are NaN)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return {
+            "bin_edges": np.linspace(0.0, 1.0, len(count) + 1),
+            "mean_prob": np.where(count > 0, sum_prob / count, np.nan),
+            "frac_true": np.where(count > 0, sum_true / count, np.nan),
+            "count": count,
+        }
+
+
+def decomposition_from_bins(
+    count: np.ndarray, sum_prob: np.ndarray, sum_true: np.ndarray
+) -> Dict[str, float]:
+    """Murphy decomposition of the Brier score from bin statistics."""
+    total = count.sum()
+    if total == 0:
+        return {"reliability": np.nan, "resolution": np.nan, "uncertainty": np.nan}
+    filled = count > 0
+    mean_prob = sum_prob[filled] / count[filled]
+    frac_true = sum_true[filled] / count[filled]
+    base_rate = sum_true.sum() / total
+    return {
+        "reliability": float(
+            np.sum(count[filled] * (mean_prob - frac_true) ** 2) / total
+        ),
+        "resolution": float(
+            np.sum(count[filled] * (frac_true - base_rate) ** 2) / total
+        ),
+        "uncertainty": float(base_rate * (1 - base_rate)),
+    }
+
+
+def calibration_curve(
+    y_true: ArrayLike, y_prob: ArrayLike, n_bins: int = 10
+) -> Dict[str, np.ndarray]:
+    """
+    Reliability diagram data over equal-width probability bins.
+    Returns bin_edges, mean_prob, frac_true and count per bin.
+    """
+    return calibration_from_bins(**bin_statistics(y_true, y_prob, n_bins))
+
+
+def brier_decomposition(
+    y_true: ArrayLike, y_prob: ArrayLike, n_bins: int = 10
+) -> Dict[str, float]:
+    """
+    Reliability, resolution and uncertainty of binned forecasts.
+    brier ~= reliability - resolution + uncertainty (exact when every forecast
+    in a bin has the same probability).
+    """
+    return decomposition_from_bins(**bin_statistics(y_true, y_prob, n_bins))
+
+
+def pointwise_crps_cdf(
+    cdf: ArrayLike, grid: ArrayLike, outcome: ArrayLike
+) -> np.ndarray:
+    """
+    CRPS of forecasts given as CDFs evaluated on a shared grid (e.g. Metaculus
+    continuous forecasts): integral of (F(x) - 1{x >= y})^2 dx by the
+    trapezoid rule.
+    Args:
+        cdf: (n_forecasts, n_grid) CDF values, or one (n_grid,) CDF.
+        grid: (n_grid,) increasing evaluation points.
+        outcome: (n_forecasts,) resolved values.
+    Returns:
+        (n_forecasts,) CRPS values.
+    """
+    cdf_arr = np.atleast_2d(_as_float(cdf))
+    grid_arr = _as_float(grid)
+    outcome_arr = np.atleast_1d(_as_float(outcome))
+    step = (grid_arr[None, :] >= outcome_arr[:, None]).astype(float)
+    squared = (cdf_arr - step) ** 2
+    return 0.5 * ((squared[:, 1:] + squared[:, :-1]) @ np.diff(grid_arr))
+
+
+def crps_cdf(cdf: ArrayLike, grid: ArrayLike, outcome: ArrayLike) -> float:
+    """Mean CRPS of CDF forecasts (see pointwise_crps_cdf)."""
+    return float(np.mean(pointwise_crps_cdf(cdf, grid, outcome)))
@@ -0,0 +1,186 @@
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Union
+
+import numpy as np  # type: ignore
+
+from .metrics import (
+    ArrayLike,
+    _as_float,
+    calibration_from_bins,
+    decomposition_from_bins,
+    pointwise_log_loss,
+    probability_bins,
+)
+
+
+def time_buckets(timestamps: ArrayLike, seconds: float) -> np.ndarray:
+    """Floor epoch timestamps to buckets of `seconds` (for grouping by time)."""
+    return np.floor(_as_float(timestamps) / seconds) * seconds
+
+
+class StreamingMetrics:
+    """
+    Online accumulator for binary forecast metrics over chunks of forecasts.
+    Only per-group sufficient statistics are kept (sums and per-bin counts),
+    so memory does not grow with the number of forecasts.
+
+    Every update may carry several grouping columns (e.g. tag, status, model,
+    time bucket); all of them are accumulated in the same pass. Extra
+    per-forecast losses (e.g. pointwise CRPS) can be averaged alongside.
+
+    Accuracy thresholds probabilities at 0.5.
+    """
+
+    _BASE = ("count", "sum_true", "sum_sq_err", "sum_log_loss", "correct")
+
+    def __init__(self, n_bins: int = 10, eps: float = 1e-15):
+        self.n_bins = n_bins
+        self.eps = eps
+        # dimension -> group label -> statistics vector
+        self._stats: Dict[str, Dict[Hashable, np.ndarray]] = {}
+        self._loss_names: Dict[str, int] = {}
+
+    @property
+    def _width(self) -> int:
+        # Each extra loss keeps its own sum and count
+        return len(self._BASE) + 3 * self.n_bins + 2 * len(self._loss_names)
+
+    def update(
+        self,
+        y_true: ArrayLike,
+        y_prob: ArrayLike,
+        groups: Optional[Mapping[str, ArrayLike]] = None,
+        losses: Optional[Mapping[str, ArrayLike]] = None,
+    ) -> "StreamingMetrics":
+        """
+        Add a chunk of forecasts.
+        Args:
+            y_true: Outcomes (0/1).
+            y_prob: Forecast probabilities.
+            groups: Grouping columns, each with one label per forecast.
+            losses: Extra per-forecast losses to average, by name.
+        """
+        y_true_arr = _as_float(y_true)
+        y_prob_arr = _as_float(y_prob)
+        n = y_true_arr.shape[0]
+        for name in losses or {}:
+            if name not in self._loss_names:
+                self._add_loss_column(name)
+        columns = [
+            np.ones(n),
+            y_true_arr,
+            (y_true_arr - y_prob_arr) ** 2,
+            pointwise_log_loss(y_true_arr, y_prob_arr, self.eps),
+            ((y_prob_arr >= 0.5) == (y_true_arr >= 0.5)).astype(float),
+        ]
+        loss_columns = [np.zeros(n)] * (2 * len(self._loss_names))
+        for name, values in (losses or {}).items():
+            pos = 2 * self._loss_names[name]
+            loss_columns[pos] = _as_float(values)
+            loss_columns[pos + 1] = np.ones(n)
+        bins = probability_bins(y_prob_arr, self.n_bins)
+        dimensions: Dict[str, Any] = {"": np.zeros(n, dtype=np.intp)}
+        dimensions.update(groups or {})
+        for dimension, labels in dimensions.items():
+            unique: Union[List[None], np.ndarray]
+            if dimension == "":
+                # Single overall group, stored under the label None
+                unique, codes = [None], labels
+            else:
+                unique, codes = np.unique(np.asarray(labels), return_inverse=True)
+            n_groups = len(unique)
+            sums = [
+                np.bincount(codes, weights=col, minlength=n_groups) for col in columns
+            ]
+            binned = codes * self.n_bins + bins
+            size = n_groups * self.n_bins
+            bin_sums = [
+                np.bincount(binned, weights=w, minlength=size).reshape(
+                    n_groups, self.n_bins
+                )
+                for w in (None, y_prob_arr, y_true_arr)
+            ]
+            loss_sums = [
+                np.bincount(codes, weights=col, minlength=n_groups)
+                for col in loss_columns
+            ]
+            chunk = np.column_stack(sums + bin_sums + loss_sums)
+            table = self._stats.setdefault(dimension, {})
+            for i, label in enumerate(unique):
+                key = label.item() if hasattr(label, "item") else label
+                if key in table:
+                    table[key] += chunk[i]
+                else:
+                    table[key] = chunk[i].copy()
+        return self
+
+    def _add_loss_column(self, name: str) -> None:
+        self._loss_names[name] = len(self._loss_names)
+        for table in self._stats.values():
+            for key in table:
+                table[key] = np.append(table[key], [0.0, 0.0])
+
+    def _metrics(self, stats: np.ndarray) -> Dict[str, Any]:
+        base = len(self._BASE)
+        count, sum_true, sse, sll, correct = stats[:base]
+        bins = stats[base : base + 3 * self.n_bins].reshape(3, self.n_bins)
+        losses = stats[base + 3 * self.n_bins :]
+        result: Dict[str, Any] = {
+            "count": int(count),
+            "base_rate": float(sum_true / count),
+            "brier": float(sse / count),
+            "log_loss": float(sll / count),
+            "accuracy": float(correct / count),
+        }
+        result.update(decomposition_from_bins(*bins))
+        result["calibration"] = calibration_from_bins(*bins)
+        for name, pos in self._loss_names.items():
+            total, seen = losses[2 * pos], losses[2 * pos + 1]
+            result[name] = float(total / seen) if seen else float("nan")
+        return result
+
+    def result(self) -> Dict[str, Any]:
+        """Metrics over every forecast seen so far."""
+        overall = self._stats.get("", {}).get(None)
+        if overall is None:
+            return {"count": 0}
+        return self._metrics(overall)
+
+    def grouped(
+        self, dimension: Optional[str] = None
+    ) -> Dict[str, Dict[Hashable, Dict[str, Any]]]:
+        """
+        Metrics per group label, for one dimension or all of them:
+        {dimension: {label: metrics}}.
+        """
+        names = [dimension] if dimension else [d for d in self._stats if d]
+        return {
+            name: {
+                label: self._metrics(stats)
+                for label, stats in self._stats.get(name, {}).items()
+            }
+            for name in names
+        }
+
+    def merge(self, other: "StreamingMetrics") -> "StreamingMetrics":
+        """Add another accumulator's statistics (e.g. from a worker process)."""
+        if other.n_bins != self.n_bins:
+            raise ValueError("Cannot merge accumulators with different n_bins")
+        for name in other._loss_names:
+            if name not in self._loss_names:
+                self._add_loss_column(name)
+        base = len(self._BASE) + 3 * self.n_bins
+        for dimension, table in other._stats.items():
+            mine = self._stats.setdefault(dimension, {})
+            for label, stats in table.items():
+                aligned = np.zeros(self._width)
+                aligned[:base] = stats[:base]
+                for name, pos in other._loss_names.items():
+                    mine_pos = base + 2 * self._loss_names[name]
+                    aligned[mine_pos : mine_pos + 2] = stats[
+                        base + 2 * pos : base + 2 * pos + 2
+                    ]
+                if label in mine:
+                    mine[label] += aligned
+                else:
+                    mine[label] = aligned
+        return self
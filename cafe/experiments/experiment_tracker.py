@@ -1,11 +1,120 @@
+import hashlib
+import json
+import sqlite3
+import threading
 import uuid
 from datetime import UTC, datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+TimeLike = Union[datetime, str, float]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    config_hash TEXT NOT NULL,
+    notes TEXT NOT NULL DEFAULT '',
+    timestamp TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_model_created ON runs (model, created);
+CREATE INDEX IF NOT EXISTS idx_runs_config ON runs (config_hash);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs (created);
+CREATE TABLE IF NOT EXISTS params (
+    run_id TEXT NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    value_num REAL
+);
+CREATE INDEX IF NOT EXISTS idx_params_value ON params (key, value);
+CREATE INDEX IF NOT EXISTS idx_params_num ON params (key, value_num);
+CREATE INDEX IF NOT EXISTS idx_params_run ON params (run_id);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL,
+    lower REAL,
+    upper REAL,
+    interval TEXT,
+    PRIMARY KEY (run_id, name)
+);
+CREATE INDEX IF NOT EXISTS idx_metrics_value ON metrics (name, value);
+CREATE TABLE IF NOT EXISTS artifacts (
+    run_id TEXT NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    uri TEXT NOT NULL,
+    PRIMARY KEY (run_id, name)
+);
+"""
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def config_hash(model: str, parameters: Dict[str, Any]) -> str:
+    """Stable identity of a (model, parameters) configuration."""
+    return hashlib.md5(_canonical([model, parameters]).encode()).hexdigest()
+
+
+def _epoch(value: TimeLike) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
+def _numeric(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
 
 
 class ExperimentTracker:
-    def __init__(self):
-        self.runs = []
+    """
+    Experiment runs stored in SQLite.
+    The default database is in memory; pass a file path to persist runs and
+    to share them between processes. File databases use WAL journaling and a
+    busy timeout, so parallel sweep workers can log to the same file.
+    """
+
+    def __init__(self, db_path: str = ":memory:", timeout: float = 30.0):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            db_path, timeout=timeout, check_same_thread=False, isolation_level=None
+        )
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _write(self, statements: Iterable[Tuple[str, Any]]) -> None:
+        """Run statements in one write transaction (taken immediately)."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, args in statements:
+                    if isinstance(args, list):
+                        self._conn.executemany(sql, args)
+                    else:
+                        self._conn.execute(sql, args)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
 
     def log_run(
         self,
@@ -13,19 +122,230 @@ class ExperimentTracker:
         parameters: Dict[str, Any],
         metrics: Dict[str, float],
         notes: str = "",
+        intervals: Optional[Dict[str, Dict[str, float]]] = None,
+        artifacts: Optional[Dict[str, str]] = None,
     ):
+        """
+        Record one run and return its id.
+        Args:
+            intervals: Optional {metric: {"lower", "upper", ...}}, e.g. from
+                Evaluator.evaluate_with_ci.
+            artifacts: Optional {name: uri} references (files, URLs) for the run.
+        """
         run_id = str(uuid.uuid4())
-        self.runs.append(
-            {
-                "run_id": run_id,
-                "model": model,
-                "parameters": parameters,
-                "metrics": metrics,
-                "notes": notes,
-                "timestamp": datetime.now(UTC).isoformat(),
-            }
+        now = datetime.now(UTC)
+        intervals = intervals or {}
+        self._write(
+            [
+                (
+                    "INSERT INTO runs (run_id, model, parameters, config_hash, notes,"
+                    " timestamp, created) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        run_id,
+                        model,
+                        _canonical(parameters),
+                        config_hash(model, parameters),
+                        notes,
+                        now.isoformat(),
+                        now.timestamp(),
+                    ),
+                ),
+                (
+                    "INSERT INTO params (run_id, key, value, value_num) VALUES (?, ?, ?, ?)",
+                    [
+                        (run_id, key, _canonical(value), _numeric(value))
+                        for key, value in parameters.items()
+                    ],
+                ),
+                (
+                    "INSERT INTO metrics (run_id, name, value, lower, upper, interval)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            run_id,
+                            name,
+                            value,
+                            intervals[name].get("lower") if name in intervals else None,
+                            intervals[name].get("upper") if name in intervals else None,
+                            _canonical(intervals[name]) if name in intervals else None,
+                        )
+                        for name, value in metrics.items()
+                    ],
+                ),
+                (
+                    "INSERT INTO artifacts (run_id, name, uri) VALUES (?, ?, ?)",
+                    [(run_id, name, uri) for name, uri in (artifacts or {}).items()],
+                ),
+            ]
         )
         return run_id
 
+    def log_artifact(self, run_id: str, name: str, uri: str) -> None:
+        """Attach (or replace) an artifact reference on an existing run."""
+        self._write(
+            [
+                (
+                    "INSERT OR REPLACE INTO artifacts (run_id, name, uri) VALUES (?, ?, ?)",
+                    (run_id, name, uri),
+                )
+            ]
+        )
+
+    def has_config(self, model: str, parameters: Dict[str, Any]) -> bool:
+        """True if a run with this exact model and parameters was logged."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM runs WHERE config_hash = ? LIMIT 1",
+                (config_hash(model, parameters),),
+            ).fetchone()
+        return row is not None
+
+    def logged_configs(self) -> set:
+        """Config hashes of every logged run."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT config_hash FROM runs"
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def _load(self, run_ids: List[str]) -> List[Dict[str, Any]]:
+        if not run_ids:
+            return []
+        runs: Dict[str, Dict[str, Any]] = {}
+        # Stay below SQLite's bound-parameter limit
+        for start in range(0, len(run_ids), 500):
+            chunk = run_ids[start : start + 500]
+            marks = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT * FROM runs WHERE run_id IN ({marks})", chunk
+                ).fetchall()
+                metric_rows = self._conn.execute(
+                    f"SELECT * FROM metrics WHERE run_id IN ({marks})", chunk
+                ).fetchall()
+                artifact_rows = self._conn.execute(
+                    f"SELECT * FROM artifacts WHERE run_id IN ({marks})", chunk
+                ).fetchall()
+            for row in rows:
+                runs[row["run_id"]] = {
+                    "run_id": row["run_id"],
+                    "model": row["model"],
+                    "parameters": json.loads(row["parameters"]),
+                    "metrics": {},
+                    "notes": row["notes"],
+                    "timestamp": row["timestamp"],
+                    "intervals": {},
+                    "artifacts": {},
+                    "config_hash": row["config_hash"],
+                }
+            for row in metric_rows:
+                run = runs[row["run_id"]]
+                run["metrics"][row["name"]] = row["value"]
+                if row["interval"] is not None:
+                    run["intervals"][row["name"]] = json.loads(row["interval"])
+            for row in artifact_rows:
+                runs[row["run_id"]]["artifacts"][row["name"]] = row["uri"]
+        return [runs[run_id] for run_id in run_ids if run_id in runs]
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        runs = self._load([run_id])
+        return runs[0] if runs else None
+
     def list_runs(self) -> List[Dict[str, Any]]:
-        return self.runs
+        """Every run, oldest first."""
+        return self.query_runs()
+
+    def query_runs(
+        self,
+        model: Optional[str] = None,
+        parameters: Optional[Dict[str, Any]] = None,
+        min_metrics: Optional[Dict[str, float]] = None,
+        max_metrics: Optional[Dict[str, float]] = None,
+        since: Optional[TimeLike] = None,
+        until: Optional[TimeLike] = None,
+        order_by: Optional[str] = None,
+        ascending: bool = True,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Runs matching every given filter, using the table indexes.
+        Args:
+            model: Exact model name.
+            parameters: Exact parameter values, e.g. {"temperature": 0.2}.
+            min_metrics / max_metrics: Inclusive metric bounds, e.g. {"brier": 0.2}.
+            since / until: Inclusive time range (datetime, ISO string or epoch).
+            order_by: Metric name to sort by (default: run time).
+            limit: Maximum number of runs returned.
+        """
+        # (JOIN clause, its arguments); WHERE arguments are kept separately
+        joins: List[Tuple[str, Tuple[Any, ...]]] = []
+        where: List[str] = []
+        args: List[Any] = []
+        if model is not None:
+            where.append("r.model = ?")
+            args.append(model)
+        if since is not None:
+            where.append("r.created >= ?")
+            args.append(_epoch(since))
+        if until is not None:
+            where.append("r.created <= ?")
+            args.append(_epoch(until))
+        for i, (key, value) in enumerate((parameters or {}).items()):
+            joins.append(
+                (
+                    f"JOIN params p{i} ON p{i}.run_id = r.run_id"
+                    f" AND p{i}.key = ? AND p{i}.value = ?",
+                    (key, _canonical(value)),
+                )
+            )
+        metric_alias: Dict[str, str] = {}
+        bounds = [(name, ">=", v) for name, v in (min_metrics or {}).items()] + [
+            (name, "<=", v) for name, v in (max_metrics or {}).items()
+        ]
+        for name, op, value in bounds:
+            alias = metric_alias.setdefault(name, f"m{len(metric_alias)}")
+            where.append(f"{alias}.value {op} ?")
+            args.append(value)
+        if order_by is not None:
+            metric_alias.setdefault(order_by, f"m{len(metric_alias)}")
+        for name, alias in metric_alias.items():
+            joins.append(
+                (
+                    f"JOIN metrics {alias} ON {alias}.run_id = r.run_id"
+                    f" AND {alias}.name = ?",
+                    (name,),
+                )
+            )
+        direction = "ASC" if ascending else "DESC"
+        if order_by is not None:
+            order = f"{metric_alias[order_by]}.value {direction}, r.created, r.rowid"
+        else:
+            order = f"r.created {direction}, r.rowid {direction}"
+        sql = "SELECT r.run_id FROM runs r " + " ".join(clause for clause, _ in joins)
+        join_args = [arg for _, clause_args in joins for arg in clause_args]
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(sql, join_args + args).fetchall()
+        return self._load([row[0] for row in rows])
+
+    def leaderboard(
+        self,
+        metric: str,
+        limit: int = 10,
+        ascending: bool = True,
+        model: Optional[str] = None,
+        parameters: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Best runs by one metric (lowest first unless ascending=False)."""
+        return self.query_runs(
+            model=model,
+            parameters=parameters,
+            order_by=metric,
+            ascending=ascending,
+            limit=limit,
+        )
@@ -0,0 +1,176 @@
+import asyncio
+import inspect
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .experiment_tracker import ExperimentTracker, config_hash
+
+EXECUTORS = ("process", "thread", "async")
+
+
+def expand_grid(
+    grid: Union[Dict[str, Sequence[Any]], Sequence[Dict[str, Sequence[Any]]]],
+) -> List[Dict[str, Any]]:
+    """
+    Cartesian product of a parameter grid, e.g.
+    {"model": ["gemini"], "temperature": [0.0, 0.5]} -> two configurations.
+    A list of grids is expanded one after another.
+    """
+    grids = [grid] if isinstance(grid, dict) else list(grid)
+    configs = []
+    for g in grids:
+        keys = list(g)
+        for values in itertools.product(*(g[k] for k in keys)):
+            configs.append(dict(zip(keys, values)))
+    return configs
+
+
+def _timed_call(
+    objective: Callable[[Dict[str, Any]], Dict[str, float]], config: Dict[str, Any]
+) -> Tuple[Dict[str, float], float]:
+    start = time.perf_counter()
+    metrics = objective(config)
+    return metrics, time.perf_counter() - start
+
+
+class SweepRunner:
+    """
+    Runs an objective over sweep configurations and logs each finished
+    configuration to an ExperimentTracker as soon as it completes.
+    Configurations already logged (same model and parameters) are skipped, so
+    an interrupted or partly failed sweep resumes where it stopped; failed
+    configurations are not logged and are retried on the next run.
+
+    Args:
+        tracker: Tracker that receives one run per configuration.
+        objective: Callable taking a configuration and returning metrics. With
+            executor="async" it may be a coroutine function (API models);
+            with "process" it must be picklable (a module-level function).
+        executor: "process" (local models), "thread" or "async".
+        max_workers: Pool size, or concurrent tasks for "async".
+        model: Model name logged when a configuration has no "model" key.
+    """
+
+    def __init__(
+        self,
+        tracker: ExperimentTracker,
+        objective: Callable[[Dict[str, Any]], Any],
+        executor: str = "process",
+        max_workers: Optional[int] = None,
+        model: str = "sweep",
+    ):
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {', '.join(EXECUTORS)}")
+        self.tracker = tracker
+        self.objective = objective
+        self.executor = executor
+        self.max_workers = max_workers
+        self.model = model
+
+    def _split(self, config: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        parameters = {k: v for k, v in config.items() if k != "model"}
+        return str(config.get("model", self.model)), parameters
+
+    def _pending(
+        self, configs: Sequence[Dict[str, Any]]
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        seen = self.tracker.logged_configs()
+        todo = []
+        for index, config in enumerate(configs):
+            key = config_hash(*self._split(config))
+            if key not in seen:
+                seen.add(key)
+                todo.append((index, config))
+        return todo
+
+    def pending(self, configs: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Configurations not logged yet, without duplicates, in order."""
+        return [config for _, config in self._pending(configs)]
+
+    def _record(
+        self,
+        config: Dict[str, Any],
+        metrics: Optional[Dict[str, float]] = None,
+        seconds: float = 0.0,
+        error: Optional[BaseException] = None,
+    ) -> Dict[str, Any]:
+        if error is not None:
+            print(f"[SweepRunner] Configuration {config} failed: {error}")
+            return {"config": config, "status": "failed", "error": str(error)}
+        model, parameters = self._split(config)
+        metrics = {**(metrics or {}), "duration_seconds": seconds}
+        run_id = self.tracker.log_run(
+            model=model, parameters=parameters, metrics=metrics
+        )
+        return {
+            "config": config,
+            "status": "done",
+            "run_id": run_id,
+            "metrics": metrics,
+        }
+
+    def run(self, configs: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run every pending configuration.
+        Returns one record per input configuration, in input order, with
+        status "done", "skipped" (already logged) or "failed".
+        """
+        todo = self._pending(configs)
+        if self.executor == "async":
+            finished = asyncio.run(self._run_async(todo))
+        else:
+            finished = self._run_pool(todo)
+        results = []
+        for index, config in enumerate(configs):
+            if index in finished:
+                results.append(finished[index])
+            else:
+                results.append({"config": config, "status": "skipped"})
+        return results
+
+    def _run_pool(
+        self, todo: List[Tuple[int, Dict[str, Any]]]
+    ) -> Dict[int, Dict[str, Any]]:
+        pool_class = (
+            ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+        )
+        finished: Dict[int, Dict[str, Any]] = {}
+        if not todo:
+            return finished
+        with pool_class(max_workers=self.max_workers) as pool:
+            futures = {
+                pool.submit(_timed_call, self.objective, config): (i, config)
+                for i, config in todo
+            }
+            for future in as_completed(futures):
+                i, config = futures[future]
+                try:
+                    metrics, seconds = future.result()
+                    finished[i] = self._record(config, metrics, seconds)
+                except Exception as e:
+                    finished[i] = self._record(config, error=e)
+        return finished
+
+    async def _run_async(
+        self, todo: List[Tuple[int, Dict[str, Any]]]
+    ) -> Dict[int, Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(self.max_workers or 8)
+        finished: Dict[int, Dict[str, Any]] = {}
+
+        async def run_one(i: int, config: Dict[str, Any]) -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    if inspect.iscoroutinefunction(self.objective):
+                        metrics = await self.objective(config)
+                    else:
+                        metrics = await asyncio.to_thread(self.objective, config)
+                except Exception as e:
+                    finished[i] = self._record(config, error=e)
+                    return
+                finished[i] = self._record(config, metrics, time.perf_counter() - start)
+
+        await asyncio.gather(*(run_one(i, config) for i, config in todo))
+        return finished
@@ -1,8 +1,40 @@
+import asyncio
+import hashlib
+import inspect
+import json
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from cafe.context.base import BaseContext
+
+
+def _jsonable(value: Any) -> Any:
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "__dict__"):
+        return vars(value)
+    return str(value)
+
+
+def fingerprint(value: Any) -> str:
+    """Stable hash of a context value (questions, news lists, arrays, ...)."""
+    canonical = json.dumps(value, sort_keys=True, default=_jsonable)
+    return hashlib.md5(canonical.encode()).hexdigest()
 
 
 class PipelineComponent(ABC):
+    # Context keys the component reads and writes. DAGForecastPipeline uses
+    # them to find independent components; ForecastPipeline ignores them.
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    # Cacheable components have outputs that depend only on cache_payload()
+    # and cache_config(); a pipeline with a cache reuses their stored outputs.
+    cacheable: bool = False
+
     @abstractmethod
     def run(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -10,19 +42,433 @@ class PipelineComponent(ABC):
         """
         pass
 
+    def run_batch(self, contexts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Process several question contexts at once. Override to batch model
+        calls or fetch concurrently; the default runs them one by one.
+        """
+        return [self.run(context) for context in contexts]
+
+    def cache_config(self) -> Dict[str, Any]:
+        """Component configuration that changes the outputs."""
+        return {}
+
+    def cache_payload(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Context values the outputs depend on (default: declared inputs)."""
+        return {key: context.get(key) for key in self.inputs}
+
+    def cache_key(self, context: Dict[str, Any]) -> str:
+        config_hash = fingerprint(self.cache_config())
+        payload_hash = fingerprint(self.cache_payload(context))
+        return f"pipeline:{self.describe()}:{config_hash}:{payload_hash}"
+
     def describe(self) -> str:
         return self.__class__.__name__
 
 
+# Marks the end of a run_many stream between stages
+_END = object()
+
+
 class ForecastPipeline:
-    def __init__(self, components: List[PipelineComponent]):
+    """
+    Runs components one after another on a shared context.
+    Args:
+        cache: Optional store (e.g. SQLiteContext) for the outputs of
+            cacheable components. A component is skipped when its cache key
+            (inputs plus configuration) is already stored, so a rerun only
+            executes the stages whose inputs or configuration changed.
+    """
+
+    def __init__(
+        self,
+        components: List[PipelineComponent],
+        cache: Optional[BaseContext] = None,
+    ):
         self.components = components
+        self.cache = cache
 
     def run(self, initial_context: Dict[str, Any]) -> Dict[str, Any]:
         context = initial_context
         for component in self.components:
-            context = component.run(context)
+            context = self._run_component(component, context)
         return context
 
+    def _cache_lookup(
+        self, component: PipelineComponent, context: Dict[str, Any]
+    ) -> Tuple[Optional[str], bool]:
+        """Returns (cache key, hit); on a hit the outputs are put in context."""
+        if self.cache is None or not component.cacheable or not component.outputs:
+            return None, False
+        key = component.cache_key(context)
+        stored = self.cache.get_data(key)
+        if stored is None:
+            return key, False
+        context.update(stored)
+        return key, True
+
+    def _cache_store(
+        self,
+        component: PipelineComponent,
+        key: Optional[str],
+        context: Dict[str, Any],
+    ) -> None:
+        if key is None or self.cache is None:
+            return
+        outputs = {k: context[k] for k in component.outputs if k in context}
+        try:
+            self.cache.set_data(key, outputs)
+        except Exception as e:
+            print(f"[ForecastPipeline] Could not cache {component.describe()}: {e}")
+
+    def _run_component(
+        self, component: PipelineComponent, context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        key, hit = self._cache_lookup(component, context)
+        if hit:
+            return context
+        context = component.run(context)
+        self._cache_store(component, key, context)
+        return context
+
+    def _run_component_batch(
+        self, component: PipelineComponent, contexts: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        results = list(contexts)
+        missing: List[Tuple[int, Optional[str]]] = []
+        for i, context in enumerate(contexts):
+            key, hit = self._cache_lookup(component, context)
+            if not hit:
+                missing.append((i, key))
+        if missing:
+            computed = component.run_batch([contexts[i] for i, _ in missing])
+            for (i, key), context in zip(missing, computed):
+                self._cache_store(component, key, context)
+                results[i] = context
+        return results
+
+    def checkpoint_key(self, context: Dict[str, Any]) -> str:
+        """
+        Checkpoint key of an input context: the question id (if present) and
+        a fingerprint of the whole context (cutoff, refreshed data, ...),
+        under this pipeline's structure and component configs. Changing the
+        inputs, a model or its parameters does not reuse old checkpoints.
+        """
+        question = context.get("question")
+        identity = getattr(question, "id", None)
+        configs = [component.cache_config() for component in self.components]
+        pipeline_hash = fingerprint([self.describe(), configs])
+        return f"checkpoint:{pipeline_hash}:{identity}:{fingerprint(context)}"
+
+    def _run_stage_batch(
+        self,
+        component: PipelineComponent,
+        batch: List[Tuple[int, Dict[str, Any]]],
+        skip: Optional[Set[int]] = None,
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        live = [
+            (pos, ctx)
+            for pos, ctx in batch
+            if "pipeline_error" not in ctx and not (skip and pos in skip)
+        ]
+        if live:
+            try:
+                results = self._run_component_batch(component, [ctx for _, ctx in live])
+                outputs = dict(zip((pos for pos, _ in live), results))
+            except Exception:
+                # Retry one by one so a single bad question does not sink the batch
+                outputs = {}
+                for pos, ctx in live:
+                    try:
+                        outputs[pos] = self._run_component(component, ctx)
+                    except Exception as e:
+                        ctx["pipeline_error"] = f"{component.describe()}: {e}"
+                        outputs[pos] = ctx
+        else:
+            outputs = {}
+        return [(pos, outputs.get(pos, ctx)) for pos, ctx in batch]
+
+    def run_many(
+        self,
+        contexts: Iterable[Dict[str, Any]],
+        batch_size: int = 8,
+        queue_size: int = 4,
+        ordered: bool = True,
+        checkpoint: Optional[BaseContext] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream many question contexts through the pipeline.
+        Every component runs in its own thread on batches of `batch_size`
+        contexts (via run_batch), so different stages work on different
+        batches at once. Stages are connected by queues holding at most
+        `queue_size` batches, so a slow stage throttles the ones before it and
+        the input iterable is consumed lazily.
+        A context whose component fails gets context["pipeline_error"] and
+        skips the remaining stages.
+        Args:
+            ordered: Yield contexts in input order (default) or as soon as
+                each batch finishes.
+            checkpoint: Optional persistent store (e.g. SQLiteContext). Every
+                successfully finished context is saved under the
+                checkpoint_key() of its input as soon as it leaves the pipeline; after a crash, rerunning
+                with the same store yields saved questions without running
+                any component. Failed questions are not saved.
+        """
+        queues: List["queue.Queue"] = [
+            queue.Queue(maxsize=queue_size) for _ in range(len(self.components) + 1)
+        ]
+        stop = threading.Event()
+        failure: List[BaseException] = []
+        # Positions restored from the checkpoint; written by the feeder before
+        # their batch is queued, so stages see them
+        restored: Set[int] = set()
+        # Checkpoint key of each input context, computed before any stage runs
+        keys: Dict[int, str] = {}
+
+        def put(q: "queue.Queue", item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(q: "queue.Queue") -> Any:
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _END
+
+        def feed() -> None:
+            try:
+                batch: List[Tuple[int, Dict[str, Any]]] = []
+                for pos, context in enumerate(contexts):
+                    if checkpoint is not None:
+                        keys[pos] = self.checkpoint_key(context)
+                        saved = checkpoint.get_data(keys[pos])
+                        if saved is not None:
+                            restored.add(pos)
+                            context = saved
+                    batch.append((pos, context))
+                    if len(batch) >= batch_size:
+                        if not put(queues[0], batch):
+                            return
+                        batch = []
+                if batch:
+                    put(queues[0], batch)
+            except BaseException as e:
+                failure.append(e)
+            finally:
+                put(queues[0], _END)
+
+        def stage(index: int) -> None:
+            component = self.components[index]
+            while True:
+                batch = get(queues[index])
+                if batch is _END:
+                    put(queues[index + 1], _END)
+                    return
+                if not put(
+                    queues[index + 1], self._run_stage_batch(component, batch, restored)
+                ):
+                    return
+
+        threads = [threading.Thread(target=feed, daemon=True)] + [
+            threading.Thread(target=stage, args=(i,), daemon=True)
+            for i in range(len(self.components))
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            buffered: Dict[int, Dict[str, Any]] = {}
+            next_pos = 0
+            while True:
+                batch = get(queues[-1])
+                if batch is _END:
+                    break
+                if checkpoint is not None:
+                    self._save_checkpoints(checkpoint, batch, restored, keys)
+                if not ordered:
+                    for _, context in batch:
+                        yield context
+                    continue
+                buffered.update(batch)
+                while next_pos in buffered:
+                    yield buffered.pop(next_pos)
+                    next_pos += 1
+            if failure:
+                raise failure[0]
+        finally:
+            # Also reached when the caller stops iterating early
+            stop.set()
+
+    def _save_checkpoints(
+        self,
+        checkpoint: BaseContext,
+        batch: List[Tuple[int, Dict[str, Any]]],
+        restored: Set[int],
+        keys: Dict[int, str],
+    ) -> None:
+        for pos, context in batch:
+            key = keys.pop(pos, None)
+            if key is None or pos in restored or "pipeline_error" in context:
+                continue
+            try:
+                checkpoint.set_data(key, context)
+            except Exception as e:
+                print(f"[ForecastPipeline] Could not checkpoint question: {e}")
+
     def describe(self) -> str:
         return " -> ".join([c.describe() for c in self.components])
+
+
+class DAGForecastPipeline(ForecastPipeline):
+    """
+    Runs components as a dependency graph built from their declared inputs and
+    outputs, so components that do not depend on each other run concurrently.
+    List order is kept wherever it matters: a component waits for earlier
+    components that write a key it reads or writes, or that read a key it
+    writes. The result therefore matches the sequential ForecastPipeline.
+
+    Each component gets a shallow snapshot of the context and only its
+    declared outputs are merged back. Wall time per component is stored in
+    context["component_timings"].
+    """
+
+    def __init__(
+        self,
+        components: List[PipelineComponent],
+        max_workers: int = 8,
+        cache: Optional[BaseContext] = None,
+    ):
+        super().__init__(components, cache=cache)
+        self.max_workers = max_workers
+        for component in components:
+            if not component.outputs:
+                raise ValueError(
+                    f"{component.describe()} must declare its outputs to run in a DAG"
+                )
+        self.names = self._unique_names()
+        self.dependencies = self._build_dependencies()
+
+    def _unique_names(self) -> List[str]:
+        names: List[str] = []
+        for i, component in enumerate(self.components):
+            name = component.describe()
+            names.append(name if name not in names else f"{name}#{i}")
+        return names
+
+    def _build_dependencies(self) -> List[Set[int]]:
+        dependencies: List[Set[int]] = []
+        for i, component in enumerate(self.components):
+            reads, writes = set(component.inputs), set(component.outputs)
+            depends = set()
+            for j in range(i):
+                earlier = self.components[j]
+                if (
+                    set(earlier.outputs) & (reads | writes)
+                    or set(earlier.inputs) & writes
+                ):
+                    depends.add(j)
+            dependencies.append(depends)
+        return dependencies
+
+    def _merge(
+        self,
+        context: Dict[str, Any],
+        index: int,
+        result: Dict[str, Any],
+        seconds: float,
+    ) -> None:
+        for key in self.components[index].outputs:
+            if key in result:
+                context[key] = result[key]
+        context["component_timings"][self.names[index]] = seconds
+
+    def _ready(self, done: Set[int], started: Set[int]) -> List[int]:
+        return [
+            i
+            for i in range(len(self.components))
+            if i not in started and self.dependencies[i] <= done
+        ]
+
+    def _timed_run(
+        self, index: int, snapshot: Dict[str, Any]
+    ) -> Tuple[int, Dict[str, Any], float]:
+        start = time.perf_counter()
+        result = self._run_component(self.components[index], snapshot)
+        return index, result, time.perf_counter() - start
+
+    def run(self, initial_context: Dict[str, Any]) -> Dict[str, Any]:
+        context = initial_context
+        context["component_timings"] = {}
+        done: Set[int] = set()
+        started: Set[int] = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending: Set[Future] = set()
+            while len(done) < len(self.components):
+                for i in self._ready(done, started):
+                    started.add(i)
+                    pending.add(executor.submit(self._timed_run, i, dict(context)))
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    # Raises the component's exception; the executor then
+                    # waits for running components before propagating it
+                    index, result, seconds = future.result()
+                    self._merge(context, index, result, seconds)
+                    done.add(index)
+        return context
+
+    async def arun(self, initial_context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Asyncio variant of run(). Components with an async `arun(context)`
+        method are awaited; others run in worker threads.
+        """
+        context = initial_context
+        context["component_timings"] = {}
+        done: Set[int] = set()
+        started: Set[int] = set()
+        pending: Dict[asyncio.Task, int] = {}
+
+        async def run_one(index: int, snapshot: Dict[str, Any]) -> Tuple[Dict, float]:
+            component = self.components[index]
+            start = time.perf_counter()
+            if inspect.iscoroutinefunction(getattr(component, "arun", None)):
+                key, hit = self._cache_lookup(component, snapshot)
+                result = snapshot
+                if not hit:
+                    result = await component.arun(snapshot)  # type: ignore[attr-defined]
+                    self._cache_store(component, key, result)
+            else:
+                result = await asyncio.to_thread(
+                    self._run_component, component, snapshot
+                )
+            return result, time.perf_counter() - start
+
+        try:
+            while len(done) < len(self.components):
+                for i in self._ready(done, started):
+                    started.add(i)
+                    pending[asyncio.create_task(run_one(i, dict(context)))] = i
+                finished, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in finished:
+                    index = pending.pop(task)
+                    result, seconds = task.result()
+                    self._merge(context, index, result, seconds)
+                    done.add(index)
+        finally:
+            for task in pending:
+                task.cancel()
+        return context
+
+    def describe(self) -> str:
+        stages = []
+        for i, name in enumerate(self.names):
+            after = ", ".join(self.names[j] for j in sorted(self.dependencies[i]))
+            stages.append(f"{name} <- [{after}]" if after else name)
+        return "; ".join(stages)
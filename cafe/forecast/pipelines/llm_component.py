@@ -1,18 +1,69 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
+from cafe.context.memory import InMemoryContext
 from cafe.forecast.pipelines.base import PipelineComponent
 from cafe.sources.question import MetaculusForecastQuestion
 
 
 class LLMForecastComponent(PipelineComponent):
-    def __init__(self, llm):
+    inputs = ("question",)
+    outputs = ("llm_response",)
+    cacheable = True
+
+    def __init__(
+        self,
+        llm,
+        parameters: Optional[Dict[str, Any]] = None,
+        model_context: Any = None,
+    ):
+        """
+        Args:
+            llm: Model with predict(prompt) or, when parameters/model_context
+                are given, predict(prompt, parameters, context).
+                predict_batch(prompts, parameters, context) is used by
+                run_batch when available, with {} and a fresh InMemoryContext
+                standing in for missing parameters/model_context.
+        """
         self.llm = llm
+        self.parameters = parameters
+        self.model_context = model_context
+
+    def _model_args(self) -> tuple:
+        if self.parameters is None and self.model_context is None:
+            return ()
+        return (self.parameters or {}, self.model_context)
+
+    def cache_config(self) -> Dict[str, Any]:
+        return {
+            "llm": type(self.llm).__name__,
+            "model_path": getattr(self.llm, "model_path", None),
+            "parameters": self.parameters,
+        }
+
+    def cache_payload(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        # The prompt covers everything sent to the model, so prompt changes
+        # invalidate this stage only
+        return {"prompt": self.build_prompt(context["question"])}
 
     def run(self, context: Dict[str, Any]) -> Dict[str, Any]:
         question: MetaculusForecastQuestion = context["question"]
         prompt = self.build_prompt(question)
-        context["llm_response"] = self.llm.predict(prompt)
+        context["llm_response"] = self.llm.predict(prompt, *self._model_args())
         return context
 
+    def run_batch(self, contexts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not hasattr(self.llm, "predict_batch"):
+            return super().run_batch(contexts)
+        prompts = [self.build_prompt(context["question"]) for context in contexts]
+        model_context = self.model_context
+        if model_context is None:
+            model_context = InMemoryContext()
+        responses = self.llm.predict_batch(
+            prompts, self.parameters or {}, model_context
+        )
+        for context, response in zip(contexts, responses):
+            context["llm_response"] = response
+        return contexts
+
     def build_prompt(self, question: MetaculusForecastQuestion) -> str:
         return f"Forecast the following question:\n\n{question.title}\n\n{question.description or ''}"
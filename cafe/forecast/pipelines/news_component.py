@@ -1,14 +1,66 @@
-from typing import Any, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
 
 from cafe.forecast.pipelines.base import PipelineComponent
 
+# Backend attributes that select what a search returns (never credentials)
+_BACKEND_ATTRS = (
+    "db_path",
+    "search_engine_id",
+    "max_head_bytes",
+    "bucket_days",
+    "cache_empty",
+)
+# Wrapped backends, e.g. CachedNewsFetcher.fetcher and its NewsSearchCache
+_NESTED_BACKENDS = ("fetcher", "cache")
+
+
+def _backend_config(news_api) -> Dict[str, Any]:
+    """Type and identifying attributes of a news backend and what it wraps."""
+    config: Dict[str, Any] = {"type": type(news_api).__name__}
+    for name in _BACKEND_ATTRS:
+        if hasattr(news_api, name):
+            config[name] = getattr(news_api, name)
+    for name in _NESTED_BACKENDS:
+        nested = getattr(news_api, name, None)
+        if nested is not None:
+            config[name] = _backend_config(nested)
+    # Backends can describe themselves more precisely
+    if callable(getattr(news_api, "cache_config", None)):
+        config.update(news_api.cache_config())
+    return config
+
 
 class NewsSearchComponent(PipelineComponent):
-    def __init__(self, news_api):
+    inputs = ("question",)
+    outputs = ("news",)
+    cacheable = True
+
+    def __init__(self, news_api, max_workers: int = 8):
         self.news_api = news_api
+        self.max_workers = max_workers
+
+    def cache_config(self) -> Dict[str, Any]:
+        return {"news_api": _backend_config(self.news_api)}
+
+    def cache_payload(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        return {"query": context["question"].title}
 
     def run(self, context: Dict[str, Any]) -> Dict[str, Any]:
         question = context["question"]
         news = self.news_api.search(question.title)
         context["news"] = news
         return context
+
+    def run_batch(self, contexts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Searches are I/O bound, so one thread per query
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(
+                executor.map(
+                    lambda context: self.news_api.search(context["question"].title),
+                    contexts,
+                )
+            )
+        for context, news in zip(contexts, results):
+            context["news"] = news
+        return contexts
@@ -0,0 +1,115 @@
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from cafe.context.memory import InMemoryContext
+from cafe.forecast.pipelines.base import PipelineComponent
+from cafe.sources.processing.timeseries import (
+    parse_frequency,
+    resample_linked_histories,
+)
+
+
+class TimeSeriesForecastComponent(PipelineComponent):
+    """
+    Forecast every question of a linked Metaculus history in bulk.
+    Reads link_comments_to_forecasts output from context[input_key], resamples
+    each aggregation history onto a regular grid and writes per-question
+    forecast tables to context["forecast_table"]:
+        {qid: {"timestamps": [...], "forecast": [...], "last_observed": t,
+               "diagnostics": {...}}} or {qid: {"error": "..."}}
+    """
+
+    outputs = ("forecast_table",)
+    cacheable = True
+
+    def __init__(
+        self,
+        model,
+        parameters: Optional[Dict[str, Any]] = None,
+        freq: Union[str, int, float] = "1D",
+        gap: str = "ffill",
+        max_gap: Optional[Union[str, int, float]] = None,
+        value_key: str = "centers",
+        min_points: int = 3,
+        input_key: str = "linked_series",
+        model_context: Any = None,
+        processes: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.model = model
+        self.parameters = parameters or {}
+        self.freq = freq
+        self.gap = gap
+        self.max_gap = max_gap
+        self.value_key = value_key
+        self.min_points = min_points
+        self.input_key = input_key
+        self.inputs = (input_key,)
+        self.model_context = model_context or InMemoryContext()
+        self.processes = processes
+        self.timeout = timeout
+
+    def cache_config(self) -> Dict[str, Any]:
+        return {
+            "model": type(self.model).__name__,
+            "parameters": self.parameters,
+            "freq": self.freq,
+            "gap": self.gap,
+            "max_gap": self.max_gap,
+            "value_key": self.value_key,
+            "min_points": self.min_points,
+        }
+
+    def run(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        resampled = resample_linked_histories(
+            context[self.input_key],
+            freq=self.freq,
+            gap=self.gap,
+            max_gap=self.max_gap,
+            value_key=self.value_key,
+        )
+        table: Dict[str, Any] = {}
+        series_by_qid = {}
+        for qid, grid in resampled.items():
+            observed = int(np.count_nonzero(~np.isnan(grid["values"])))
+            if observed < self.min_points:
+                table[qid] = {
+                    "error": f"Only {observed} resampled points (need {self.min_points})."
+                }
+            else:
+                series_by_qid[qid] = grid["values"].tolist()
+        results = self._forecast(series_by_qid)
+        step = parse_frequency(self.freq)
+        steps = self.parameters.get("steps", 1)
+        for qid, result in results.items():
+            if "error" in result:
+                table[qid] = result
+                continue
+            last = float(resampled[qid]["timestamps"][-1])
+            table[qid] = {
+                "timestamps": (last + step * np.arange(1, steps + 1)).tolist(),
+                "forecast": result["forecast"],
+                "last_observed": last,
+                "diagnostics": result.get("diagnostics", {}),
+            }
+        context["forecast_table"] = {qid: table[qid] for qid in resampled}
+        return context
+
+    def _forecast(self, series_by_qid: Dict[str, list]) -> Dict[str, Any]:
+        if not series_by_qid:
+            return {}
+        if hasattr(self.model, "predict_many"):
+            return self.model.predict_many(
+                series_by_qid,
+                self.parameters,
+                self.model_context,
+                processes=self.processes,
+                timeout=self.timeout,
+            )
+        return {
+            qid: self.model.predict(
+                qid, {**self.parameters, "series": series}, self.model_context
+            )
+            for qid, series in series_by_qid.items()
+        }
@@ -1,6 +1,21 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from cafe.protocols.api import router
+from cafe.protocols.api import router, scheduler
+from cafe.protocols.metaculus import create_http_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.http_client = create_http_client()
+    try:
+        yield
+    finally:
+        # Let queued micro-batches finish before the loop goes away
+        await scheduler.shutdown()
+        await app.state.http_client.aclose()
+
 
-app = FastAPI(title="Cafe")
+app = FastAPI(title="Cafe", lifespan=lifespan)
 app.include_router(router)
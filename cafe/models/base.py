@@ -1,11 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Protocol
+from typing import Any, Dict, List, Protocol
 
 
 class Predictable(Protocol):
     def predict(self, prompt: str, parameters: Dict[str, Any], context) -> Any: ...
 
 
+class BatchPredictable(Predictable, Protocol):
+    def predict_batch(
+        self, prompts: List[str], parameters: Dict[str, Any], context
+    ) -> List[Any]: ...
+
+
 class BaseModel(Predictable, ABC):
     """Base class for time series models."""
 
@@ -1,7 +1,7 @@
 import logging
 import os
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
 from cafe.config.config import Config
 from cafe.models.llm.postprocessing import GeminiPostprocessor
@@ -76,6 +76,25 @@ class GeminiModel(BaseModel):
             logging.info(f"Gemini prompt: {prompt}")
             logging.info(f"Gemini response: {response}")
 
+    def _generation_config(self, parameters: Dict[str, Any]) -> Any:
+        # Extract config parameters for generation
+        config_kwargs = {}
+        for k in [
+            "max_output_tokens",
+            "temperature",
+            "candidate_count",
+            "top_k",
+            "top_p",
+            "stop_sequences",
+        ]:
+            if k in parameters:
+                config_kwargs[k] = parameters[k]
+        return (
+            genai_types.GenerateContentConfig(**config_kwargs)
+            if config_kwargs
+            else None
+        )
+
     def predict(self, prompt: str, parameters: Dict[str, Any], context) -> Any:
         if not self.api_key and not self.mock_mode:
             raise ValueError("Gemini API key not set.")
@@ -105,24 +124,7 @@ class GeminiModel(BaseModel):
         client = genai.Client(api_key=self.api_key)
         model_name = parameters.get("model", "gemini-2.0-flash")
         contents = [prompt]
-
-        # Extract config parameters for generation
-        config_kwargs = {}
-        for k in [
-            "max_output_tokens",
-            "temperature",
-            "candidate_count",
-            "top_k",
-            "top_p",
-            "stop_sequences",
-        ]:
-            if k in parameters:
-                config_kwargs[k] = parameters[k]
-        config = (
-            genai_types.GenerateContentConfig(**config_kwargs)
-            if config_kwargs
-            else None
-        )
+        config = self._generation_config(parameters)
 
         last_exception = None
         for attempt in range(self.max_retries + 1):
@@ -149,3 +151,39 @@ class GeminiModel(BaseModel):
         raise RuntimeError(
             f"Gemini API call failed after {self.max_retries + 1} attempts: {last_exception}"
         )
+
+    def predict_stream(
+        self, prompt: str, parameters: Dict[str, Any], context
+    ) -> Iterator[str]:
+        """
+        Yield text chunks as Gemini produces them (generate_content_stream).
+        Streamed completions bypass the context cache.
+        """
+        if not self.api_key and not self.mock_mode:
+            raise ValueError("Gemini API key not set.")
+        self._validate_parameters(parameters)
+
+        # Mock mode for testing: echo the prompt back word by word
+        if self.mock_mode:
+            for i, word in enumerate(prompt.split()):
+                yield word if i == 0 else " " + word
+            return
+
+        if genai is None or genai_types is None:
+            raise ImportError(
+                "google-genai package is not installed. Please install it with 'uv pip install google-generativeai'."
+            )
+
+        client = genai.Client(api_key=self.api_key)
+        model_name = parameters.get("model", "gemini-2.0-flash")
+        chunks = []
+        for chunk in client.models.generate_content_stream(
+            model=model_name,
+            contents=[prompt],
+            config=self._generation_config(parameters),
+        ):
+            text = getattr(chunk, "text", None)
+            if text:
+                chunks.append(text)
+                yield text
+        self._log(prompt, "".join(chunks))
@@ -1,4 +1,5 @@
-from typing import Any, Dict, Optional
+import hashlib
+from typing import Any, Dict, Iterator, List, Optional
 
 from .base import BaseModel
 from .postprocessing import HuggingFacePostprocessor
@@ -35,21 +36,11 @@ class HuggingFaceModel(BaseModel):
             self.model = None
             self.tokenizer = None
 
-    def predict(self, prompt: str, parameters: Dict[str, Any], context: Any) -> Any:
-        import hashlib
-
-        if self.model is None or self.tokenizer is None:
-            return {
-                "error": "Local model not loaded. Check transformers install and model path."
-            }
-        # Generate a context cache key
+    def _make_cache_key(self, prompt: str, parameters: Dict[str, Any]) -> str:
         param_hash = hashlib.md5(str(sorted(parameters.items())).encode()).hexdigest()
-        cache_key = (
-            f"huggingface:{hashlib.md5((prompt + param_hash).encode()).hexdigest()}"
-        )
-        cached = context.get_data(cache_key)
-        if cached is not None:
-            return cached
+        return f"huggingface:{hashlib.md5((prompt + param_hash).encode()).hexdigest()}"
+
+    def _generation_kwargs(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         # Normalize parameter names for compatibility
         max_tokens = parameters.get("max_tokens") or parameters.get(
             "max_new_tokens", 64
@@ -60,6 +51,19 @@ class HuggingFaceModel(BaseModel):
             temperature=temperature,
         )
         gen_kwargs.update({k: v for k, v in parameters.items() if k not in gen_kwargs})
+        return gen_kwargs
+
+    def predict(self, prompt: str, parameters: Dict[str, Any], context: Any) -> Any:
+        if self.model is None or self.tokenizer is None:
+            return {
+                "error": "Local model not loaded. Check transformers install and model path."
+            }
+        # Generate a context cache key
+        cache_key = self._make_cache_key(prompt, parameters)
+        cached = context.get_data(cache_key)
+        if cached is not None:
+            return cached
+        gen_kwargs = self._generation_kwargs(parameters)
         import torch
 
         inputs = self.tokenizer(prompt, return_tensors="pt")
@@ -72,3 +76,77 @@ class HuggingFaceModel(BaseModel):
         result = {"text": output_text, "answer": answer}
         context.set_data(cache_key, result)
         return result
+
+    def predict_batch(
+        self, prompts: List[str], parameters: Dict[str, Any], context: Any
+    ) -> List[Any]:
+        """
+        Generate completions for several prompts in one padded forward pass.
+        Prompts already present in the context cache are not regenerated.
+        Returns one result dict per prompt, in input order.
+        """
+        if self.model is None or self.tokenizer is None:
+            error = {
+                "error": "Local model not loaded. Check transformers install and model path."
+            }
+            return [error for _ in prompts]
+        cache_keys = [self._make_cache_key(p, parameters) for p in prompts]
+        results: List[Any] = [context.get_data(k) for k in cache_keys]
+        missing = [i for i, r in enumerate(results) if r is None]
+        if not missing:
+            return results
+        gen_kwargs = self._generation_kwargs(parameters)
+        import torch
+
+        # Decoder-only models must be left-padded for batched generation
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        self.tokenizer.padding_side = "left"
+        inputs = self.tokenizer(
+            [prompts[i] for i in missing], return_tensors="pt", padding=True
+        )
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        gen_kwargs.setdefault("pad_token_id", self.tokenizer.pad_token_id)
+        with torch.no_grad():
+            outputs = self.model.generate(**inputs, **gen_kwargs)
+        texts = self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+        for i, output_text in zip(missing, texts):
+            answer = self.postprocessor.extract_answer(output_text)
+            result = {"text": output_text, "answer": answer}
+            context.set_data(cache_keys[i], result)
+            results[i] = result
+        return results
+
+    def predict_stream(
+        self, prompt: str, parameters: Dict[str, Any], context: Any
+    ) -> Iterator[str]:
+        """
+        Yield decoded text chunks as they are generated (TextIteratorStreamer).
+        Only the completion is streamed, not the prompt. Bypasses the context cache.
+        """
+        if self.model is None or self.tokenizer is None:
+            raise RuntimeError(
+                "Local model not loaded. Check transformers install and model path."
+            )
+        from threading import Thread
+
+        from transformers import TextIteratorStreamer
+
+        gen_kwargs = self._generation_kwargs(parameters)
+        inputs = self.tokenizer(prompt, return_tensors="pt")
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        streamer = TextIteratorStreamer(
+            self.tokenizer, skip_prompt=True, skip_special_tokens=True
+        )
+        thread = Thread(
+            target=self.model.generate,
+            kwargs={**inputs, **gen_kwargs, "streamer": streamer},
+            daemon=True,
+        )
+        thread.start()
+        try:
+            for text in streamer:
+                if text:
+                    yield text
+        finally:
+            thread.join()
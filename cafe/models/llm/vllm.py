@@ -1,5 +1,8 @@
 import hashlib
-from typing import Any, Dict, Optional
+import queue
+import threading
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from .base import BaseModel
 from .postprocessing import VLLMPostprocessor
@@ -19,7 +22,13 @@ class VLLMModel(BaseModel):
     ):
         self.model_path = model_path
         self.dtype = dtype
-        self.llm = None
+        self.llm: Any = None
+        # One driver thread steps the engine for every pending request
+        # (batches and streams alike) and hands outputs to per-request queues.
+        # The lock covers single engine calls, never a wait on a consumer.
+        self._engine_lock = threading.Lock()
+        self._requests: Dict[str, "queue.Queue[Any]"] = {}
+        self._driver: Optional[threading.Thread] = None
         self.postprocessor = VLLMPostprocessor()
         self._load_model(**kwargs)
 
@@ -39,6 +48,19 @@ class VLLMModel(BaseModel):
             print(f"[VLLMModel] Model loading failed: {e}")
             self.llm = None
 
+    def _make_cache_key(self, prompt: str, parameters: Dict[str, Any]) -> str:
+        param_hash = hashlib.md5(str(sorted(parameters.items())).encode()).hexdigest()
+        return f"vllm:{hashlib.md5((prompt + param_hash).encode()).hexdigest()}"
+
+    def _sampling_params(self, parameters: Dict[str, Any]):
+        from vllm import SamplingParams  # type: ignore
+
+        return SamplingParams(
+            max_tokens=parameters.get("max_tokens", 64),
+            temperature=parameters.get("temperature", 1.0),
+            stop=parameters.get("stop"),
+        )
+
     def predict(self, prompt: str, parameters: Dict[str, Any], context: Any) -> Any:
         """
         Generate a completion from the local model using vLLM.
@@ -50,8 +72,7 @@ class VLLMModel(BaseModel):
             Postprocessed model output (str, dict, etc.).
         """
         # Generate a context cache key
-        param_hash = hashlib.md5(str(sorted(parameters.items())).encode()).hexdigest()
-        cache_key = f"vllm:{hashlib.md5((prompt + param_hash).encode()).hexdigest()}"
+        cache_key = self._make_cache_key(prompt, parameters)
         cached = context.get_data(cache_key)
         if cached is not None:
             return cached
@@ -60,14 +81,8 @@ class VLLMModel(BaseModel):
                 "error": "vLLM model not loaded. Check vllm install and model path."
             }
         try:
-            from vllm import SamplingParams  # type: ignore
-
-            sampling_params = SamplingParams(
-                max_tokens=parameters.get("max_tokens", 64),
-                temperature=parameters.get("temperature", 1.0),
-                stop=parameters.get("stop"),
-            )
-            outputs = self.llm.generate([prompt], sampling_params)
+            sampling_params = self._sampling_params(parameters)
+            outputs = self._generate([prompt], sampling_params)
             # vLLM returns a list of RequestOutput, each with .outputs (list of TokenOutputs)
             if not outputs or not outputs[0].outputs:
                 return None
@@ -77,3 +92,132 @@ class VLLMModel(BaseModel):
             return result
         except Exception as e:
             return {"error": f"vLLM inference failed: {e}"}
+
+    def predict_batch(
+        self, prompts: List[str], parameters: Dict[str, Any], context: Any
+    ) -> List[Any]:
+        """
+        Generate completions for several prompts in a single vLLM call.
+        Prompts already present in the context cache are not regenerated.
+        Returns one postprocessed output per prompt, in input order.
+        """
+        cache_keys = [self._make_cache_key(p, parameters) for p in prompts]
+        results: List[Any] = [context.get_data(k) for k in cache_keys]
+        missing = [i for i, r in enumerate(results) if r is None]
+        if not missing:
+            return results
+        if self.llm is None:
+            error = {
+                "error": "vLLM model not loaded. Check vllm install and model path."
+            }
+            return [error if r is None else r for r in results]
+        try:
+            sampling_params = self._sampling_params(parameters)
+            outputs = self._generate([prompts[i] for i in missing], sampling_params)
+        except Exception as e:
+            error = {"error": f"vLLM inference failed: {e}"}
+            return [error if r is None else r for r in results]
+        for i, output in zip(missing, outputs):
+            if not output.outputs:
+                continue
+            result = self.postprocessor.extract_answer(output.outputs[0].text)
+            context.set_data(cache_keys[i], result)
+            results[i] = result
+        # Prompts vLLM produced no completion for are failures, not None
+        error = {"error": "vLLM inference failed: no output returned."}
+        return [error if r is None else r for r in results]
+
+    def _submit(
+        self, prompt: str, sampling_params: Any
+    ) -> Tuple[str, "queue.Queue[Any]"]:
+        """Add a request to the engine; its outputs arrive on the returned queue."""
+        request_id = uuid.uuid4().hex
+        outputs: "queue.Queue[Any]" = queue.Queue()
+        with self._engine_lock:
+            self.llm.llm_engine.add_request(request_id, prompt, sampling_params)
+            self._requests[request_id] = outputs
+            if self._driver is None:
+                self._driver = threading.Thread(target=self._drive, daemon=True)
+                self._driver.start()
+        return request_id, outputs
+
+    def _cancel(self, request_id: str) -> None:
+        with self._engine_lock:
+            if self._requests.pop(request_id, None) is not None:
+                self.llm.llm_engine.abort_request(request_id)
+
+    def _drive(self) -> None:
+        engine = self.llm.llm_engine
+        while True:
+            with self._engine_lock:
+                if not self._requests:
+                    self._driver = None
+                    return
+                try:
+                    step_outputs = engine.step()
+                except Exception as e:
+                    for request_id, outputs in self._requests.items():
+                        engine.abort_request(request_id)
+                        outputs.put(e)
+                    self._requests.clear()
+                    continue
+                for output in step_outputs:
+                    waiting = self._requests.get(output.request_id)
+                    if waiting is None:
+                        continue
+                    waiting.put(output)
+                    if output.finished:
+                        del self._requests[output.request_id]
+
+    @staticmethod
+    def _next_output(outputs: "queue.Queue[Any]") -> Any:
+        output = outputs.get()
+        if isinstance(output, Exception):
+            raise output
+        return output
+
+    def _generate(self, prompts: List[str], sampling_params: Any) -> List[Any]:
+        """Final RequestOutput per prompt, in order (like LLM.generate)."""
+        submitted = [self._submit(prompt, sampling_params) for prompt in prompts]
+        pending = {request_id for request_id, _ in submitted}
+        try:
+            finals = []
+            for request_id, outputs in submitted:
+                output = self._next_output(outputs)
+                while not output.finished:
+                    output = self._next_output(outputs)
+                finals.append(output)
+                pending.discard(request_id)
+            return finals
+        finally:
+            for request_id in pending:
+                self._cancel(request_id)
+
+    def predict_stream(
+        self, prompt: str, parameters: Dict[str, Any], context: Any
+    ) -> Iterator[str]:
+        """
+        Yield text deltas as tokens are produced, from the same engine that
+        serves predict and predict_batch. A slow reader only delays its own
+        stream. Bypasses the context cache.
+        """
+        if self.llm is None:
+            raise RuntimeError(
+                "vLLM model not loaded. Check vllm install and model path."
+            )
+        request_id, outputs = self._submit(prompt, self._sampling_params(parameters))
+        finished = False
+        try:
+            sent = 0
+            while not finished:
+                output = self._next_output(outputs)
+                finished = output.finished
+                if not output.outputs:
+                    continue
+                text = output.outputs[0].text
+                if len(text) > sent:
+                    yield text[sent:]
+                    sent = len(text)
+        finally:
+            if not finished:
+                self._cancel(request_id)
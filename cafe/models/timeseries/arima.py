@@ -0,0 +1,309 @@
+import multiprocessing
+import multiprocessing.connection
+import time
+import warnings
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[Sequence[float], np.ndarray]
+
+
+def validate_arima_inputs(series: Any, order: Any, steps: Any) -> Optional[str]:
+    """Return an error message for invalid ARIMA inputs, or None if they are valid."""
+    if not isinstance(series, (list, tuple)) or not series:
+        return "Parameter 'series' must be a non-empty list or tuple of floats."
+    if order != "auto" and not (isinstance(order, (tuple, list)) and len(order) == 3):
+        return "Parameter 'order' must be 'auto' or a tuple/list of length 3 (ARIMA order)."
+    if not isinstance(steps, int) or steps < 1:
+        return "Parameter 'steps' must be a positive integer (forecast horizon)."
+    return None
+
+
+def fit_arima_results(series: ArrayLike, order: Sequence[int] = (1, 1, 1)):
+    """Fit a statsmodels ARIMA and return its results object (raises on failure)."""
+    from statsmodels.tsa.arima.model import ARIMA
+
+    with warnings.catch_warnings():
+        # Convergence/frequency warnings are reported via diagnostics instead
+        warnings.simplefilter("ignore")
+        return ARIMA(np.asarray(series, dtype=float), order=tuple(order)).fit()
+
+
+def summarize_fit(
+    model_fit: Any, order: Sequence[int], steps: int, fit_seconds: float
+) -> Dict[str, Any]:
+    """Forecast from a fitted ARIMA results object and collect its diagnostics."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        forecast = model_fit.forecast(steps=steps)
+    mle_retvals = getattr(model_fit, "mle_retvals", None) or {}
+    return {
+        "forecast": np.asarray(forecast).tolist(),
+        "diagnostics": {
+            "order": list(order),
+            "aic": float(model_fit.aic),
+            "bic": float(model_fit.bic),
+            "llf": float(model_fit.llf),
+            "nobs": int(model_fit.nobs),
+            "converged": bool(mle_retvals.get("converged", True)),
+            "fit_seconds": fit_seconds,
+        },
+    }
+
+
+def choose_d(series: ArrayLike, max_d: int = 2, alpha: float = 0.05) -> int:
+    """
+    Smallest differencing order whose series passes an augmented Dickey-Fuller
+    stationarity test at level alpha (capped at max_d).
+    """
+    from statsmodels.tsa.stattools import adfuller
+
+    values = np.asarray(series, dtype=float)
+    for d in range(max_d):
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                p_value = adfuller(values, autolag="AIC")[1]
+        except Exception:
+            # Too short or constant: differencing further will not help
+            return d
+        if p_value < alpha:
+            return d
+        values = np.diff(values)
+    return max_d
+
+
+def _score_order(
+    series: Sequence[float], order: Tuple[int, int, int], criterion: str
+) -> Tuple[Tuple[int, int, int], Optional[float]]:
+    """Information criterion of one candidate order (None if the fit fails)."""
+    try:
+        return order, float(getattr(fit_arima_results(series, order), criterion))
+    except Exception:
+        return order, None
+
+
+def _score_order_args(args: tuple) -> Tuple[Tuple[int, int, int], Optional[float]]:
+    return _score_order(*args)
+
+
+def select_order(
+    series: Sequence[float],
+    max_p: int = 3,
+    max_d: int = 2,
+    max_q: int = 3,
+    criterion: str = "aic",
+    processes: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    patience: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Choose an ARIMA (p, d, q) order by information criterion.
+    d is picked first with ADF tests, then the (p, q) grid is fitted simplest
+    candidates first, inline or across a process pool.
+    Args:
+        series: Observations.
+        max_p, max_d, max_q: Upper bounds of the search grid.
+        criterion: "aic" or "bic".
+        processes: Worker processes for the grid. None (default) or 1 searches
+            inline, so API requests do not each start a pool.
+        time_budget: Wall-clock seconds for the whole search. Candidates not
+            scored in time are skipped (inline, the budget is checked between fits).
+        patience: Stop after this many scored candidates without improvement.
+    Returns:
+        {"order", "criterion", "score", "evaluated", "candidates", "stopped",
+        "search_seconds"}; "stopped" is "complete", "patience" or "time_budget".
+        Raises ValueError if no candidate could be fitted.
+    """
+    if criterion not in ("aic", "bic"):
+        raise ValueError("criterion must be 'aic' or 'bic'")
+    start = time.perf_counter()
+    deadline = None if time_budget is None else start + time_budget
+    series = [float(x) for x in series]
+    d = choose_d(series, max_d)
+    candidates = sorted(
+        ((p, d, q) for p in range(max_p + 1) for q in range(max_q + 1)),
+        key=lambda o: (o[0] + o[2], o),
+    )
+    best_order: Optional[Tuple[int, int, int]] = None
+    best_score = float("inf")
+    evaluated = 0
+    without_improvement = 0
+    stopped = "complete"
+    pool = None
+    if processes is not None and processes > 1:
+        pool = multiprocessing.Pool(processes=processes)
+        scores = pool.imap_unordered(
+            _score_order_args, [(series, o, criterion) for o in candidates]
+        )
+    try:
+        for candidate in candidates:
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                stopped = "time_budget"
+                break
+            if pool is None:
+                order, score = _score_order(series, candidate, criterion)
+            else:
+                try:
+                    order, score = scores.next(timeout=remaining)
+                except multiprocessing.TimeoutError:
+                    stopped = "time_budget"
+                    break
+            evaluated += 1
+            if score is not None and score < best_score:
+                best_order, best_score = order, score
+                without_improvement = 0
+            else:
+                without_improvement += 1
+            if patience and without_improvement >= patience:
+                stopped = "patience"
+                break
+    finally:
+        if pool is not None:
+            # terminate (not close) so fits past the budget do not keep running
+            pool.terminate()
+            pool.join()
+    if best_order is None:
+        raise ValueError(f"No ARIMA order could be fitted ({stopped})")
+    return {
+        "order": list(best_order),
+        "criterion": criterion,
+        "score": best_score,
+        "evaluated": evaluated,
+        "candidates": len(candidates),
+        "stopped": stopped,
+        "search_seconds": time.perf_counter() - start,
+    }
+
+
+def fit_arima(
+    series: Sequence[float],
+    order: Any = (1, 1, 1),
+    steps: int = 1,
+    search: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Fit a statsmodels ARIMA and forecast `steps` ahead.
+    With order="auto" the order is chosen inline by select_order(**search) and
+    reported in diagnostics["order_selection"].
+    Returns {"forecast": [...], "diagnostics": {...}} or {"error": "..."}.
+    Never raises, so it is safe to run inside a worker process.
+    """
+    try:
+        import statsmodels  # noqa: F401
+    except ImportError:
+        return {"error": "Required package 'statsmodels' not installed."}
+    start = time.perf_counter()
+    try:
+        selection = None
+        if order == "auto":
+            # Already inside a worker (or a single fit): search without a pool
+            selection = select_order(series, **{**(search or {}), "processes": 1})
+            order = tuple(selection["order"])
+        model_fit = fit_arima_results(series, order)
+        result = summarize_fit(model_fit, order, steps, time.perf_counter() - start)
+        if selection is not None:
+            result["diagnostics"]["order_selection"] = selection
+        return result
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _fit_arima_worker(conn: Any, args: tuple) -> None:
+    """Process target: send fit_arima(*args) back through a pipe."""
+    try:
+        conn.send(fit_arima(*args))
+    finally:
+        conn.close()
+
+
+def fit_arima_many(
+    series_by_id: Mapping[str, Sequence[float]],
+    order: Any = (1, 1, 1),
+    steps: int = 1,
+    processes: Optional[int] = None,
+    timeout: Optional[float] = None,
+    search: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fit one ARIMA per series, each in its own worker process, with at most
+    `processes` running at a time.
+    Args:
+        series_by_id: Mapping of series id to observations.
+        order: ARIMA (p, d, q) order used for every series, "auto", or a mapping
+            of series id to either.
+        steps: Forecast horizon.
+        processes: Concurrent worker processes (default: CPU count). 1 or less
+            fits inline.
+        timeout: Seconds each fit may run, counted from when its process starts.
+            A fit that overruns is reported as an error and its process is
+            terminated, freeing the slot for the next series.
+        search: select_order options for series fitted with order="auto".
+    Returns:
+        Mapping of series id to the fit_arima result, in input order.
+    """
+
+    def order_for(sid: str) -> Any:
+        chosen = order.get(sid, "auto") if isinstance(order, Mapping) else order
+        return chosen if chosen == "auto" else tuple(chosen)
+
+    if processes is not None and processes <= 1:
+        return {
+            sid: fit_arima(list(series), order_for(sid), steps, search)
+            for sid, series in series_by_id.items()
+        }
+    limit = processes or multiprocessing.cpu_count()
+    queue = list(series_by_id.items())[::-1]
+    # receiving end of each worker's pipe -> (series id, process, start time)
+    running: Dict[Any, Tuple[str, Any, float]] = {}
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def stop(receiver: Any) -> None:
+        _, process, _ = running.pop(receiver)
+        process.terminate()
+        process.join()
+        receiver.close()
+
+    try:
+        while queue or running:
+            while queue and len(running) < limit:
+                sid, series = queue.pop()
+                receiver, sender = multiprocessing.Pipe(duplex=False)
+                process = multiprocessing.Process(
+                    target=_fit_arima_worker,
+                    args=(sender, (list(series), order_for(sid), steps, search)),
+                    daemon=True,
+                )
+                process.start()
+                sender.close()
+                running[receiver] = (sid, process, time.monotonic())
+            wait_for = None
+            if timeout is not None:
+                first_deadline = min(t for _, _, t in running.values()) + timeout
+                wait_for = max(0.0, first_deadline - time.monotonic())
+            ready = multiprocessing.connection.wait(list(running), timeout=wait_for)
+            for pipe in [receiver for receiver in running if receiver in ready]:
+                sid, process, _ = running[pipe]
+                try:
+                    results[sid] = pipe.recv()
+                    process.join()
+                except EOFError:
+                    process.join()
+                    results[sid] = {
+                        "error": f"ARIMA worker exited with code {process.exitcode}"
+                    }
+                stop(pipe)
+            if timeout is not None:
+                now = time.monotonic()
+                for pipe, (sid, _, started) in list(running.items()):
+                    if now - started >= timeout:
+                        stop(pipe)
+                        results[sid] = {
+                            "error": f"ARIMA fit timed out after {timeout}s"
+                        }
+    finally:
+        for receiver in list(running):
+            stop(receiver)
+    return {sid: results[sid] for sid in series_by_id}
@@ -0,0 +1,153 @@
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+
+def pack_series(series_list: Sequence[Sequence[float]]) -> np.ndarray:
+    """
+    Pack ragged series into a (n_series, max_len) float array, right-aligned
+    so the last column holds every series' latest observation. Missing leading
+    values are NaN.
+    """
+    width = max((len(s) for s in series_list), default=0)
+    packed = np.full((len(series_list), width), np.nan)
+    for i, s in enumerate(series_list):
+        if len(s):
+            packed[i, width - len(s) :] = np.asarray(s, dtype=float)
+    return packed
+
+
+def _horizon(steps: int) -> np.ndarray:
+    return np.arange(1, steps + 1, dtype=float)
+
+
+def _last_observed(values: np.ndarray) -> np.ndarray:
+    """Last non-NaN value of every row (NaN for empty rows)."""
+    valid = ~np.isnan(values)
+    idx = values.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+    last = values[np.arange(values.shape[0]), idx]
+    return np.where(valid.any(axis=1), last, np.nan)
+
+
+def last_value(values: np.ndarray, steps: int) -> np.ndarray:
+    """Naive forecast: repeat the latest observation."""
+    return np.repeat(_last_observed(values)[:, None], steps, axis=1)
+
+
+def ewma(values: np.ndarray, steps: int, alpha: float = 0.3) -> np.ndarray:
+    """Exponentially weighted mean of each series, held flat over the horizon."""
+    width = values.shape[1]
+    weights = alpha * (1.0 - alpha) ** np.arange(width - 1, -1, -1, dtype=float)
+    valid = ~np.isnan(values)
+    w = np.where(valid, weights, 0.0)
+    total = w.sum(axis=1)
+    level = np.where(valid, values, 0.0) @ weights / np.where(total > 0, total, 1.0)
+    level = np.where(total > 0, level, np.nan)
+    return np.repeat(level[:, None], steps, axis=1)
+
+
+def linear_trend(values: np.ndarray, steps: int, window: int = 0) -> np.ndarray:
+    """
+    Per-series least-squares line extrapolated over the horizon.
+    With window > 0 only the last `window` observations are used.
+    """
+    if window > 0:
+        values = values[:, -window:]
+    width = values.shape[1]
+    t = np.arange(width, dtype=float)
+    valid = ~np.isnan(values)
+    y = np.where(valid, values, 0.0)
+    n = valid.sum(axis=1).astype(float)
+    st = valid @ t
+    stt = valid @ (t * t)
+    sy = y.sum(axis=1)
+    sty = y @ t
+    denom = n * stt - st * st
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(denom > 0, (n * sty - st * sy) / denom, 0.0)
+        intercept = (sy - slope * st) / n
+    future_t = (width - 1) + _horizon(steps)
+    return intercept[:, None] + slope[:, None] * future_t[None, :]
+
+
+def damped_trend(
+    values: np.ndarray,
+    steps: int,
+    alpha: float = 0.5,
+    beta: float = 0.1,
+    phi: float = 0.9,
+) -> np.ndarray:
+    """
+    Holt's damped-trend exponential smoothing. The recursion runs over time,
+    vectorized across all series at each step.
+    """
+    n_series = values.shape[0]
+    level = np.full(n_series, np.nan)
+    trend = np.zeros(n_series)
+    for column in values.T:
+        observed = ~np.isnan(column)
+        started = ~np.isnan(level)
+        first = observed & ~started
+        level[first] = column[first]
+        update = observed & started
+        if update.any():
+            prev_level = level[update]
+            prev_trend = trend[update]
+            new_level = alpha * column[update] + (1 - alpha) * (
+                prev_level + phi * prev_trend
+            )
+            trend[update] = (
+                beta * (new_level - prev_level) + (1 - beta) * phi * prev_trend
+            )
+            level[update] = new_level
+    damping = np.cumsum(phi ** _horizon(steps))
+    return level[:, None] + trend[:, None] * damping[None, :]
+
+
+def logit_random_walk(
+    values: np.ndarray, steps: int, eps: float = 1e-4, drift: bool = False
+) -> np.ndarray:
+    """
+    Random walk in logit space for probability series: the forecast stays at
+    the latest probability, or follows the mean logit increment if drift=True.
+    Forecasts always remain inside (0, 1).
+    """
+    clipped = np.clip(values, eps, 1 - eps)
+    logits = np.log(clipped / (1 - clipped))
+    last = _last_observed(logits)
+    if drift:
+        diffs = np.diff(logits, axis=1)
+        counts = (~np.isnan(diffs)).sum(axis=1)
+        slope = np.where(
+            counts > 0, np.nansum(diffs, axis=1) / np.maximum(counts, 1), 0.0
+        )
+    else:
+        slope = np.zeros_like(last)
+    future = last[:, None] + slope[:, None] * _horizon(steps)[None, :]
+    return 1.0 / (1.0 + np.exp(-future))
+
+
+BASELINES: Dict[str, Callable[..., np.ndarray]] = {
+    "last_value": last_value,
+    "ewma": ewma,
+    "linear_trend": linear_trend,
+    "damped_trend": damped_trend,
+    "logit_random_walk": logit_random_walk,
+}
+
+
+def forecast_baseline(
+    method: str,
+    series_list: Sequence[Sequence[float]],
+    steps: int = 1,
+    options: Optional[Dict[str, Any]] = None,
+) -> np.ndarray:
+    """
+    Forecast every series with one baseline in a single array pass.
+    Returns a (n_series, steps) array.
+    """
+    if method not in BASELINES:
+        raise ValueError(
+            f"Unknown baseline method: {method}. Valid methods: {', '.join(BASELINES)}"
+        )
+    return BASELINES[method](pack_series(series_list), steps, **(options or {}))
@@ -1,52 +1,329 @@
 import hashlib
-from typing import Any, Dict
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
+from .arima import (
+    fit_arima,
+    fit_arima_many,
+    fit_arima_results,
+    select_order,
+    summarize_fit,
+    validate_arima_inputs,
+)
 from .base import BaseModel
+from .baselines import forecast_baseline
 
 
 class TimeSeriesLocalModel(BaseModel):
+    # Incremental updates allowed before a warm-started series is fully refit
+    DEFAULT_REFIT_EVERY = 24
+    # select_order options used for order="auto" unless overridden
+    DEFAULT_ORDER_SEARCH: Dict[str, Any] = {"time_budget": 30.0, "patience": 8}
+
+    def _make_cache_key(self, prompt: str, parameters: Dict[str, Any]) -> str:
+        param_hash = hashlib.md5(str(sorted(parameters.items())).encode()).hexdigest()
+        return f"timeseries_local:{hashlib.md5((prompt + param_hash).encode()).hexdigest()}"
+
     def predict(self, prompt: str, parameters: Dict[str, Any], context: Any) -> Any:
         """
         Local time-series forecasting using ARIMA (via statsmodels).
         parameters should include:
             - series: list of floats (the time series)
-            - order: tuple (p, d, q) for ARIMA (default: (1, 1, 1))
+            - order: tuple (p, d, q) for ARIMA (default: (1, 1, 1)), or "auto" to
+              select it by information criterion. The selected order is cached
+              per series (series_id, or the observations when absent).
+            - order_search: select_order options for "auto" (max_p, max_d, max_q,
+              criterion, processes, time_budget, patience); the search runs
+              in the calling thread unless processes > 1
             - steps: int, forecast horizon (default: 1)
+            - series_id: optional identity of the series. When given, the fitted
+              model is kept in the context and later calls whose series extends
+              the previous one only append the new observations (no refit).
+            - refit_every: full refit after this many incremental updates
+              (default: 24; 0 disables warm start)
+            - method: "arima" (default) or a vectorized baseline from
+              baselines.BASELINES ("last_value", "ewma", "linear_trend",
+              "damped_trend", "logit_random_walk")
+            - options: keyword arguments for the baseline (e.g. {"alpha": 0.2})
+            - fallback: baseline used when the ARIMA fit fails; fallback
+              results are not cached
         """
+        series = parameters.get("series")
+        if series is None:
+            # Rejected by validation, and keeps series a sequence below
+            series = []
+        elif hasattr(series, "tolist"):
+            # numpy arrays (as predict_many accepts) become plain lists, which
+            # also keeps the cache key from using numpy's truncated repr
+            series = series.tolist()
+            parameters = {**parameters, "series": series}
+
         # Generate a context cache key
-        param_hash = hashlib.md5(str(sorted(parameters.items())).encode()).hexdigest()
-        cache_key = f"timeseries_local:{hashlib.md5((prompt + param_hash).encode()).hexdigest()}"
+        cache_key = self._make_cache_key(prompt, parameters)
         cached = context.get_data(cache_key)
         if cached is not None:
             return cached
-        try:
-            import numpy as np
-            from statsmodels.tsa.arima.model import ARIMA
-        except ImportError:
-            return {"error": "Required package 'statsmodels' not installed."}
 
-        series = parameters.get("series")
         order = parameters.get("order", (1, 1, 1))
         steps = parameters.get("steps", 1)
-        if not isinstance(series, (list, tuple)) or not series:
-            return {
-                "error": "Parameter 'series' must be a non-empty list or tuple of floats."
-            }
-        if not (isinstance(order, (tuple, list)) and len(order) == 3):
-            return {
-                "error": "Parameter 'order' must be a tuple/list of length 3 (ARIMA order)."
-            }
-        if not isinstance(steps, int) or steps < 1:
-            return {
-                "error": "Parameter 'steps' must be a positive integer (forecast horizon)."
-            }
+        error = validate_arima_inputs(series, order, steps)
+        if error:
+            return {"error": error}
 
-        try:
-            model = ARIMA(series, order=tuple(order))
-            model_fit = model.fit()
-            forecast = model_fit.forecast(steps=steps)
-            result = {"forecast": forecast.tolist()}
+        method = parameters.get("method", "arima")
+        series_id = parameters.get("series_id")
+        selection: Dict[str, Any] = {}
+        if method == "arima" and order == "auto":
+            order, selection = self._auto_order(series_id, series, parameters, context)
+        if method != "arima":
+            result = self._predict_baselines(method, [series], steps, parameters)[0]
+        elif order is None:
+            result = {"error": selection["error"]}
+        elif series_id is not None:
+            refit_every = parameters.get("refit_every", self.DEFAULT_REFIT_EVERY)
+            result = self._predict_warm(
+                str(series_id), series, order, steps, refit_every, context
+            )
+        else:
+            result = fit_arima(series, order, steps)
+        if selection and "diagnostics" in result:
+            result["diagnostics"]["order_selection"] = selection
+        if "error" not in result:
             context.set_data(cache_key, result)
-            return result
+        elif method == "arima" and parameters.get("fallback"):
+            result = self._fallback(result, [series], steps, parameters)[0]
+        return result
+
+    def _order_search(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        return {**self.DEFAULT_ORDER_SEARCH, **(parameters.get("order_search") or {})}
+
+    def _order_key(
+        self,
+        series_id: Any,
+        series: Sequence[float],
+        search: Dict[str, Any],
+    ) -> str:
+        if series_id is not None:
+            identity = f"id:{series_id}"
+        else:
+            identity = "data:" + hashlib.md5(str(list(series)).encode()).hexdigest()
+        search_hash = hashlib.md5(str(sorted(search.items())).encode()).hexdigest()
+        return f"timeseries_local:order:{identity}:{search_hash}"
+
+    def _auto_order(
+        self,
+        series_id: Any,
+        series: Sequence[float],
+        parameters: Dict[str, Any],
+        context: Any,
+    ) -> Tuple[Optional[Tuple[int, int, int]], Dict[str, Any]]:
+        """
+        Return the selected order (None on failure) and the selection record,
+        searching only when no selection is cached for this series.
+        """
+        search = self._order_search(parameters)
+        order_key = self._order_key(series_id, series, search)
+        cached = context.get_data(order_key)
+        if cached is not None:
+            return tuple(cached["order"]), {**cached, "cached": True}
+        try:
+            selection = select_order(series, **search)
         except Exception as e:
+            return None, {"error": f"Order selection failed: {e}"}
+        context.set_data(order_key, selection)
+        return tuple(selection["order"]), {**selection, "cached": False}
+
+    def _predict_baselines(
+        self,
+        method: str,
+        series_list: Sequence[Sequence[float]],
+        steps: int,
+        parameters: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        try:
+            forecasts = forecast_baseline(
+                method, series_list, steps, parameters.get("options")
+            )
+        except (ValueError, TypeError) as e:
+            return [{"error": str(e)} for _ in series_list]
+        return [
+            {"forecast": row.tolist(), "diagnostics": {"method": method}}
+            for row in forecasts
+        ]
+
+    def _fallback(
+        self,
+        failed: Dict[str, Any],
+        series_list: Sequence[Sequence[float]],
+        steps: int,
+        parameters: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        results = self._predict_baselines(
+            parameters["fallback"], series_list, steps, parameters
+        )
+        for result in results:
+            if "diagnostics" in result:
+                result["diagnostics"]["fallback_from"] = failed["error"]
+        return results
+
+    def _predict_warm(
+        self,
+        series_id: str,
+        series: Sequence[float],
+        order: Sequence[int],
+        steps: int,
+        refit_every: int,
+        context: Any,
+    ) -> Dict[str, Any]:
+        """
+        Forecast a series with identity, reusing the fitted state stored in the
+        context when the new series only extends the previously fitted one.
+        Parameters stay fixed during incremental updates; a full refit happens
+        when the order changes, the history was rewritten, or after refit_every
+        updates.
+        """
+        import numpy as np
+
+        state_key = f"timeseries_local:state:{series_id}"
+        state = context.get_data(state_key)
+        values = np.asarray(series, dtype=float)
+        start = time.perf_counter()
+        fit_mode = "full"
+        updates = 0
+        try:
+            if (
+                state is not None
+                and refit_every > 0
+                and list(state["order"]) == list(order)
+                and state["updates"] < refit_every
+            ):
+                previous = state["results"]
+                fitted = np.asarray(previous.model.endog, dtype=float).ravel()
+                n = len(fitted)
+                if len(values) >= n and np.array_equal(fitted, values[:n]):
+                    model_fit = previous
+                    updates = state["updates"]
+                    if len(values) > n:
+                        model_fit = previous.append(values[n:], refit=False)
+                        updates += 1
+                    fit_mode = "append"
+            if fit_mode == "full":
+                model_fit = fit_arima_results(values, order)
+        except Exception as e:
+            context.set_data(state_key, None)
             return {"error": str(e)}
+        context.set_data(
+            state_key, {"results": model_fit, "order": list(order), "updates": updates}
+        )
+        result = summarize_fit(model_fit, order, steps, time.perf_counter() - start)
+        result["diagnostics"]["fit_mode"] = fit_mode
+        return result
+
+    def predict_many(
+        self,
+        series_by_id: Mapping[str, Sequence[float]],
+        parameters: Dict[str, Any],
+        context: Any,
+        processes: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Forecast many series at once, fitting cache misses across a process pool.
+        Each series is cached in the context under the same key predict() uses
+        with prompt=<series id> and parameters["series"]=<observations>.
+        Fits always start cold (no warm-start state is shared with workers).
+        Args:
+            series_by_id: Mapping of series id (e.g. Metaculus question id) to observations.
+            parameters: Shared parameters (order, order_search, steps, method,
+                fallback), as for predict(). With order="auto" a cached order is
+                looked up per series id, otherwise each worker searches inline.
+            context: Context used as the per-series result cache.
+            processes: Worker processes (default: CPU count). 1 fits inline.
+            timeout: Per-fit timeout in seconds (see fit_arima_many).
+        Returns:
+            Mapping of series id to {"forecast", "diagnostics"} or {"error"}.
+        """
+        order = parameters.get("order", (1, 1, 1))
+        steps = parameters.get("steps", 1)
+        results: Dict[str, Any] = {}
+        to_fit: Dict[str, Sequence[float]] = {}
+        cache_keys: Dict[str, str] = {}
+        for sid, series in series_by_id.items():
+            series = list(series)
+            series_params = {**parameters, "series": series}
+            cache_keys[sid] = self._make_cache_key(str(sid), series_params)
+            cached = context.get_data(cache_keys[sid])
+            if cached is not None:
+                results[sid] = cached
+                continue
+            error = validate_arima_inputs(series, order, steps)
+            if error:
+                results[sid] = {"error": error}
+                continue
+            to_fit[sid] = series
+        method = parameters.get("method", "arima")
+        if to_fit and method != "arima":
+            # Baselines forecast every series in one array operation
+            ids = list(to_fit)
+            forecasts = self._predict_baselines(
+                method, [to_fit[sid] for sid in ids], steps, parameters
+            )
+            fitted = dict(zip(ids, forecasts))
+        elif to_fit and order == "auto":
+            # Workers search the orders that are not cached yet
+            search = self._order_search(parameters)
+            order_keys = {
+                sid: self._order_key(sid, to_fit[sid], search) for sid in to_fit
+            }
+            selections = {sid: context.get_data(key) for sid, key in order_keys.items()}
+            orders = {
+                sid: selection["order"]
+                for sid, selection in selections.items()
+                if selection is not None
+            }
+            fitted = fit_arima_many(
+                to_fit,
+                orders,
+                steps,
+                processes=processes,
+                timeout=timeout,
+                search=search,
+            )
+            for sid, result in fitted.items():
+                diagnostics = result.get("diagnostics")
+                if diagnostics is None:
+                    continue
+                if sid in orders:
+                    diagnostics["order_selection"] = {
+                        **selections[sid],
+                        "cached": True,
+                    }
+                else:
+                    selection = diagnostics["order_selection"]
+                    context.set_data(order_keys[sid], selection)
+                    diagnostics["order_selection"] = {**selection, "cached": False}
+        elif to_fit:
+            fitted = fit_arima_many(
+                to_fit, order, steps, processes=processes, timeout=timeout
+            )
+        else:
+            fitted = {}
+        failed = [sid for sid, result in fitted.items() if "error" in result]
+        for sid, result in fitted.items():
+            if "error" not in result:
+                context.set_data(cache_keys[sid], result)
+            results[sid] = result
+        if failed and method == "arima" and parameters.get("fallback"):
+            for sid, result in zip(
+                failed,
+                self._predict_baselines(
+                    parameters["fallback"],
+                    [to_fit[sid] for sid in failed],
+                    steps,
+                    parameters,
+                ),
+            ):
+                if "diagnostics" in result:
+                    result["diagnostics"]["fallback_from"] = results[sid]["error"]
+                results[sid] = result
+        return {sid: results[sid] for sid in series_by_id}
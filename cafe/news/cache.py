@@ -0,0 +1,346 @@
+import asyncio
+import json
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+DateLike = Union[str, date, datetime]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS news_search (
+    query TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    max_results INTEGER NOT NULL,
+    results TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (query, start_date, end_date)
+);
+"""
+
+_ARTICLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_access ON articles(last_access);
+"""
+
+_EPOCH = date(1970, 1, 1)
+# Sync requests for the same key serialize on one of these locks
+_LOCK_STRIPES = 64
+
+
+def normalize_query(query: str) -> str:
+    """Case- and punctuation-insensitive form of a search query."""
+    return " ".join(re.findall(r"\w+", query.casefold()))
+
+
+def _as_date(value: DateLike) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(value.replace("Z", "")).date()
+
+
+def bucket_date(value: DateLike, bucket_days: int) -> date:
+    """Round a date down to the start of its bucket_days-long bucket."""
+    day = _as_date(value)
+    offset = (day - _EPOCH).days % bucket_days
+    return day - timedelta(days=offset)
+
+
+class NewsSearchCache:
+    """
+    Persistent news search results keyed by normalized query and date window.
+    Window ends are rounded down to buckets of bucket_days, so requests whose
+    windows end in the same bucket share one search. The window is part of
+    the key only: results hold whatever the fetcher returned for it, which
+    for GoogleNewsFetcher is not date-restricted.
+    """
+
+    def __init__(self, db_path: str = ":memory:", bucket_days: int = 7):
+        if bucket_days < 1:
+            raise ValueError("bucket_days must be at least 1")
+        self.db_path = db_path
+        self.bucket_days = bucket_days
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            db_path, check_same_thread=False, isolation_level=None
+        )
+        with self._lock:
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def key(
+        self, query: str, start_date: DateLike, end_date: DateLike
+    ) -> Tuple[str, str, str]:
+        """(normalized query, bucketed start, bucketed end) for a request."""
+        end = bucket_date(end_date, self.bucket_days)
+        length = _as_date(end_date) - _as_date(start_date)
+        return normalize_query(query), str(end - length), str(end)
+
+    def get(
+        self,
+        query: str,
+        start_date: DateLike,
+        end_date: DateLike,
+        max_results: int = 20,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Cached results, or None if missing or stored with fewer max_results."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT max_results, results FROM news_search "
+                "WHERE query = ? AND start_date = ? AND end_date = ?",
+                self.key(query, start_date, end_date),
+            ).fetchone()
+        if row is None or row[0] < max_results:
+            return None
+        return json.loads(row[1])[:max_results]
+
+    def put(
+        self,
+        query: str,
+        start_date: DateLike,
+        end_date: DateLike,
+        max_results: int,
+        results: List[Dict[str, Any]],
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO news_search VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    *self.key(query, start_date, end_date),
+                    max_results,
+                    json.dumps(results),
+                    time.time(),
+                ),
+            )
+
+    def entries(
+        self,
+    ) -> Iterator[Tuple[str, str, str, List[Dict[str, Any]], float]]:
+        """
+        Every cached search as (query, start_date, end_date, results,
+        fetched_at), fetched_at being epoch seconds.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT query, start_date, end_date, results, fetched_at "
+                "FROM news_search"
+            ).fetchall()
+        for query, start, end, results, fetched_at in rows:
+            yield query, start, end, json.loads(results), fetched_at
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM news_search").fetchone()[0]
+
+
+class CachedNewsFetcher:
+    """
+    Wraps a news fetcher (fetch_news / afetch_news, e.g. GoogleNewsFetcher)
+    with a NewsSearchCache. Searches run with the bucketed window, and
+    concurrent requests for the same key wait for a single search.
+    Empty results are not cached by default, since fetchers also return an
+    empty list on errors. With fetchers that report completeness
+    (fetch_news_pages / afetch_news_pages), results cut short by a failed
+    page are returned but not cached.
+    """
+
+    def __init__(self, fetcher, cache: NewsSearchCache, cache_empty: bool = False):
+        self.fetcher = fetcher
+        self.cache = cache
+        self.cache_empty = cache_empty
+        self.hits = 0
+        self.misses = 0
+        self._key_locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+        self._inflight: Dict[Tuple[str, str, str], asyncio.Future] = {}
+
+    def _key_lock(self, key: Tuple[str, str, str]) -> threading.Lock:
+        return self._key_locks[hash(key) % _LOCK_STRIPES]
+
+    def _lookup(
+        self, query: str, start_date: DateLike, end_date: DateLike, max_results: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        cached = self.cache.get(query, start_date, end_date, max_results)
+        if cached is not None:
+            self.hits += 1
+        return cached
+
+    def _store(
+        self,
+        query: str,
+        start_date: DateLike,
+        end_date: DateLike,
+        max_results: int,
+        results: List[Dict[str, Any]],
+        complete: bool = True,
+    ) -> None:
+        self.misses += 1
+        if complete and (results or self.cache_empty):
+            self.cache.put(query, start_date, end_date, max_results, results)
+
+    def fetch_news(
+        self,
+        query: str,
+        start_date: DateLike,
+        end_date: DateLike,
+        max_results: int = 20,
+    ) -> List[Dict[str, Any]]:
+        key = self.cache.key(query, start_date, end_date)
+        with self._key_lock(key):
+            cached = self._lookup(query, start_date, end_date, max_results)
+            if cached is not None:
+                return cached
+            kwargs = dict(
+                query=query, start_date=key[1], end_date=key[2], max_results=max_results
+            )
+            if hasattr(self.fetcher, "fetch_news_pages"):
+                results, complete = self.fetcher.fetch_news_pages(**kwargs)
+            else:
+                results, complete = self.fetcher.fetch_news(**kwargs), True
+            self._store(query, start_date, end_date, max_results, results, complete)
+            return results
+
+    async def afetch_news(
+        self,
+        query: str,
+        start_date: DateLike,
+        end_date: DateLike,
+        max_results: int = 20,
+    ) -> List[Dict[str, Any]]:
+        key = self.cache.key(query, start_date, end_date)
+        while key in self._inflight:
+            await asyncio.shield(self._inflight[key])
+        cached = self._lookup(query, start_date, end_date, max_results)
+        if cached is not None:
+            return cached
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            kwargs = dict(
+                query=query, start_date=key[1], end_date=key[2], max_results=max_results
+            )
+            if hasattr(self.fetcher, "afetch_news_pages"):
+                results, complete = await self.fetcher.afetch_news_pages(**kwargs)
+            else:
+                results, complete = await self.fetcher.afetch_news(**kwargs), True
+            self._store(query, start_date, end_date, max_results, results, complete)
+            return results
+        finally:
+            del self._inflight[key]
+            future.set_result(None)
+
+
+class ArticleCache:
+    """
+    URL-keyed cache of extracted article titles and descriptions, with the
+    ETag / Last-Modified validators of the response they came from.
+    Entries younger than max_age are used as is; older ones are revalidated
+    with a conditional GET (see conditional_headers). At most max_entries
+    articles are kept, evicting the least recently used.
+    """
+
+    def __init__(
+        self,
+        db_path: str = ":memory:",
+        max_entries: int = 10000,
+        max_age: float = 24 * 3600.0,
+    ):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            db_path, check_same_thread=False, isolation_level=None
+        )
+        with self._lock:
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_ARTICLE_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(self, url: str, touch: bool = True) -> Optional[Dict[str, Any]]:
+        """Cached entry for url, or None. touch marks it recently used."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, description, etag, last_modified, fetched_at "
+                "FROM articles WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            if touch:
+                self._conn.execute(
+                    "UPDATE articles SET last_access = ? WHERE url = ?",
+                    (time.time(), url),
+                )
+        keys = ("title", "description", "etag", "last_modified", "fetched_at")
+        return dict(zip(keys, row))
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["fetched_at"] < self.max_age
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for revalidating entry."""
+        headers: Dict[str, str] = {}
+        if entry is None:
+            return headers
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(
+        self,
+        url: str,
+        title: str,
+        description: Optional[str],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, title, description, etag, last_modified, now, now),
+            )
+            # Least recently used entries beyond max_entries
+            self._conn.execute(
+                "DELETE FROM articles WHERE url IN (SELECT url FROM articles "
+                "ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def refresh(self, url: str) -> None:
+        """Mark a cached entry as revalidated (the server answered 304)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE articles SET fetched_at = ?, last_access = ? WHERE url = ?",
+                (now, now, url),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
@@ -1,33 +1,105 @@
+import asyncio
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 from urllib.parse import quote_plus
 
 import httpx
-from bs4 import BeautifulSoup, Tag
 
 from cafe.config.config import get_settings  # Assumed config pattern
+from cafe.news.cache import ArticleCache
+from cafe.news.html_meta import (
+    MAX_HEAD_BYTES,
+    aextract_head_meta,
+    extract_head_meta,
+    title_description,
+)
 from cafe.utils.logging import get_logger  # Assumed logging util
+from cafe.utils.rate_limit import TokenBucket, get_rate_limiter, retry_after_seconds
 
 GOOGLE_SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Custom Search quota: 100 queries per minute
+SEARCH_RATE = 100 / 60
+SEARCH_BURST = 5
+
+
+def extract_title_description(html: str) -> Tuple[str, Optional[str]]:
+    """
+    Page title and meta description (None if the page has none), falling
+    back to OpenGraph tags. Only the <head> is parsed.
+    """
+    return title_description(extract_head_meta([html.encode()]))
+
+
+def compose_summary(
+    title: str, description: Optional[str], fallback_summary: str = ""
+) -> str:
+    full_snippet = description if description is not None else fallback_summary
+    summary = f"{title} - {full_snippet}".strip(" -")
+    return summary or fallback_summary
+
+
+def summary_from_html(html: str, fallback_summary: str = "") -> str:
+    """Title and meta description of an article page as one summary string."""
+    return compose_summary(*extract_title_description(html), fallback_summary)
 
 
 class GoogleNewsFetcher:
     """
     Fetches news results from Google Custom Search API and extracts article summaries.
     Designed for modular use in pipelines or API endpoints.
+    The async methods share one pooled AsyncClient (pass async_client to
+    inject one) and run at most max_concurrency requests at a time.
+    Search requests draw from a token bucket shared by all fetchers in the
+    process (see cafe.utils.rate_limit) instead of sleeping between calls.
+    With an article_cache, extracted summaries are reused and revalidated
+    with conditional GETs once stale. Article bodies are streamed and only
+    read up to </head> (at most max_head_bytes).
     """
 
+    # Retry/backoff config for the async client
+    MAX_RETRIES = 4
+    BACKOFF_FACTOR = 2.0  # exponential
+    INITIAL_DELAY = 1.0  # seconds
+
     def __init__(
         self,
         api_key: Optional[str] = None,
         search_engine_id: Optional[str] = None,
         logger: Optional[logging.Logger] = None,
+        async_client: Optional[httpx.AsyncClient] = None,
+        max_concurrency: int = 10,
+        rate_limiter: Optional[TokenBucket] = None,
+        article_cache: Optional[ArticleCache] = None,
+        max_head_bytes: int = MAX_HEAD_BYTES,
     ):
         settings = get_settings()
         self.api_key = api_key or settings.GOOGLE_SEARCH_API_KEY
         self.search_engine_id = search_engine_id or settings.GOOGLE_SEARCH_CX
         self.logger = logger or get_logger(__name__)
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter or get_rate_limiter(
+            "google_search", SEARCH_RATE, SEARCH_BURST
+        )
+        self.article_cache = article_cache
+        self.max_head_bytes = max_head_bytes
+        self._client: Optional[httpx.Client] = None
+        self._async_client = async_client
+        self._owns_async_client = async_client is None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.Client:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.Client(timeout=5.0, follow_redirects=True)
+        return self._client
+
+    def close(self) -> None:
+        """Close the pooled sync HTTP client, if one was opened."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
 
     def generate_query_params(
         self, query: str, start_date: str, end_date: str, start: int = 1
@@ -50,6 +122,15 @@ class GoogleNewsFetcher:
         Returns a list of news items (dicts with at least 'link', 'title', 'snippet').
         Adds debug printing/logging for troubleshooting.
         """
+        return self.fetch_news_pages(query, start_date, end_date, max_results)[0]
+
+    def fetch_news_pages(
+        self, query: str, start_date: str, end_date: str, max_results: int = 20
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        fetch_news that also reports whether the results are complete: False
+        when a page failed (error or 429) and only earlier pages are returned.
+        """
         print("[DEBUG] --- GoogleNewsFetcher.fetch_news ---")
         print(
             f"[DEBUG] API Key (masked): {self.api_key[:4]}...{'*' * (len(self.api_key) - 8)}...{self.api_key[-4:]}"
@@ -57,11 +138,13 @@ class GoogleNewsFetcher:
         print(f"[DEBUG] Search Engine ID: {self.search_engine_id}")
         print(f"[DEBUG] Query: {query} | Dates: {start_date} to {end_date}")
         all_results = []
+        complete = True
         with httpx.Client(timeout=10.0) as client:
             for start in range(1, max_results + 1, 10):
                 params = self.generate_query_params(query, start_date, end_date, start)
                 print(f"[DEBUG] Request params: {params}")
                 try:
+                    self.rate_limiter.acquire()
                     resp = client.get(GOOGLE_SEARCH_URL, params=params)
                     print(f"[DEBUG] Request URL: {resp.url}")
                     print(f"[DEBUG] Status code: {resp.status_code}")
@@ -83,44 +166,265 @@ class GoogleNewsFetcher:
                     )
                     if e.response.status_code == 429:
                         print("[WARNING] Rate limit hit.")
-                        self.logger.warning(
-                            "Rate limit hit. Consider retry/backoff in pipeline."
+                        self.logger.warning("Rate limit hit. Backing off.")
+                        self.rate_limiter.penalize(
+                            retry_after_seconds(e.response) or self.INITIAL_DELAY
                         )
+                    complete = False
                     break
                 except Exception as e:
                     print(f"[ERROR] Unexpected error during news fetch: {e}")
                     self.logger.error(f"Unexpected error during news fetch: {e}")
+                    complete = False
                     break
         print(f"[DEBUG] Total results returned: {len(all_results)}")
-        return all_results
+        return all_results, complete
 
     def get_full_summary(self, link: str, fallback_summary: str = "") -> str:
         """
         Fetches the full title and meta description from a news article link.
         Returns a summary string or the fallback if extraction fails.
         """
+        entry, fresh = self._cached_article(link)
+        if entry is not None and fresh:
+            return compose_summary(
+                entry["title"], entry["description"], fallback_summary
+            )
         try:
-            with httpx.Client(timeout=5.0) as client:
-                resp = client.get(link)
-                resp.raise_for_status()
-                soup = BeautifulSoup(resp.text, "html.parser")
-                full_title = (
-                    soup.title.string.strip()
-                    if soup.title and soup.title.string
-                    else ""
-                )
-                meta_desc = soup.find("meta", attrs={"name": "description"})
-                content = (
-                    meta_desc.get("content") if isinstance(meta_desc, Tag) else None
+            with self._get_client().stream(
+                "GET", link, headers=ArticleCache.conditional_headers(entry)
+            ) as resp:
+                if resp.status_code != 304:
+                    resp.raise_for_status()
+                meta = extract_head_meta(
+                    resp.iter_bytes(), self.max_head_bytes, resp.charset_encoding
                 )
-                if isinstance(content, str):
-                    full_snippet = content.strip()
-                elif isinstance(content, list):  # AttributeValueList
-                    full_snippet = " ".join(str(x) for x in content).strip()
-                else:
-                    full_snippet = fallback_summary
-                summary = f"{full_title} - {full_snippet}".strip(" -")
-                return summary or fallback_summary
+            return self._article_summary(link, resp, meta, entry, fallback_summary)
         except Exception as e:
             self.logger.error(f"Error fetching summary for {link}: {e}")
+            return self._stale_summary(entry, fallback_summary)
+
+    def _cached_article(self, link: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """(cached entry or None, whether it can be used without revalidating)."""
+        if self.article_cache is None:
+            return None, False
+        entry = self.article_cache.get(link)
+        return entry, entry is not None and self.article_cache.is_fresh(entry)
+
+    def _article_summary(
+        self,
+        link: str,
+        resp: httpx.Response,
+        meta: Dict[str, str],
+        entry: Optional[Dict[str, Any]],
+        fallback_summary: str,
+    ) -> str:
+        """
+        Summary from a 200 response (with its head metadata) or a 304,
+        updating the article cache.
+        """
+        if resp.status_code == 304 and entry is not None:
+            if self.article_cache is not None:
+                self.article_cache.refresh(link)
+            title, description = entry["title"], entry["description"]
+        else:
+            title, description = title_description(meta)
+            if self.article_cache is not None:
+                self.article_cache.put(
+                    link,
+                    title,
+                    description,
+                    etag=resp.headers.get("ETag"),
+                    last_modified=resp.headers.get("Last-Modified"),
+                )
+        return compose_summary(title, description, fallback_summary)
+
+    @staticmethod
+    def _stale_summary(entry: Optional[Dict[str, Any]], fallback_summary: str) -> str:
+        # A stale cached summary beats the fallback when revalidation fails
+        if entry is None:
             return fallback_summary
+        return compose_summary(entry["title"], entry["description"], fallback_summary)
+
+    # Async API: pages and article summaries are fetched concurrently
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(
+                timeout=10.0,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+            self._owns_async_client = True
+        return self._async_client
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores belong to one event loop; make a new one per loop
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def aclose(self) -> None:
+        """Close the pooled async HTTP client if this fetcher opened it."""
+        if self._async_client is not None and self._owns_async_client:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    async def _aget_with_retries(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: float = 10.0,
+        limiter: Optional[TokenBucket] = None,
+    ) -> httpx.Response:
+        """Async GET with retries (see _arequest_with_retries)."""
+        client = self._get_async_client()
+
+        async def request() -> httpx.Response:
+            response = await client.get(url, params=params, timeout=timeout)
+            response.raise_for_status()
+            return response
+
+        return await self._arequest_with_retries(url, request, limiter)
+
+    async def _afetch_head(
+        self, link: str, headers: Dict[str, str]
+    ) -> Tuple[httpx.Response, Dict[str, str]]:
+        """Stream an article until </head>; returns the response and head metadata."""
+        client = self._get_async_client()
+
+        async def request() -> Tuple[httpx.Response, Dict[str, str]]:
+            async with client.stream("GET", link, headers=headers, timeout=5.0) as resp:
+                if resp.status_code != 304:
+                    resp.raise_for_status()
+                meta = await aextract_head_meta(
+                    resp.aiter_bytes(), self.max_head_bytes, resp.charset_encoding
+                )
+            return resp, meta
+
+        return await self._arequest_with_retries(link, request)
+
+    async def _arequest_with_retries(
+        self,
+        url: str,
+        request: Callable[[], Awaitable[Any]],
+        limiter: Optional[TokenBucket] = None,
+    ) -> Any:
+        """
+        Run request() under the concurrency limit (and limiter, if given),
+        retrying 429/5xx and network errors with exponential backoff. A
+        Retry-After header takes precedence over the backoff delay when it
+        asks for longer, and a 429 also penalizes the limiter.
+        """
+        delay = self.INITIAL_DELAY
+        for attempt in range(self.MAX_RETRIES):
+            last_attempt = attempt == self.MAX_RETRIES - 1
+            try:
+                if limiter is not None:
+                    await limiter.aacquire()
+                async with self._get_semaphore():
+                    return await request()
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if status not in RETRY_STATUSES or last_attempt:
+                    raise
+                wait = max(delay, retry_after_seconds(e.response) or 0.0)
+                if status == 429 and limiter is not None:
+                    limiter.penalize(wait)
+                print(
+                    f"[GoogleNews] HTTP {status} for {url} (attempt {attempt+1}/{self.MAX_RETRIES}), retrying in {wait:.1f}s..."
+                )
+            except httpx.RequestError as e:
+                if last_attempt:
+                    raise
+                wait = delay
+                print(
+                    f"[GoogleNews] Network error for {url} (attempt {attempt+1}/{self.MAX_RETRIES}): {e}, retrying in {wait:.1f}s..."
+                )
+            # Sleep outside the semaphore so other requests can proceed
+            await asyncio.sleep(wait)
+            delay *= self.BACKOFF_FACTOR
+        raise RuntimeError(f"No attempts made for {url}")
+
+    async def _afetch_page(
+        self, query: str, start_date: str, end_date: str, start: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        params = self.generate_query_params(query, start_date, end_date, start)
+        try:
+            resp = await self._aget_with_retries(
+                GOOGLE_SEARCH_URL, params=params, limiter=self.rate_limiter
+            )
+            return resp.json().get("items", [])
+        except httpx.HTTPStatusError as e:
+            self.logger.error(
+                f"Google API error: {e.response.status_code} - {e.response.text}"
+            )
+        except Exception as e:
+            self.logger.error(f"Unexpected error during news fetch: {e}")
+        return None
+
+    async def afetch_news(
+        self, query: str, start_date: str, end_date: str, max_results: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Async fetch_news: all result pages are requested concurrently.
+        Pages are joined in order, stopping at the first empty or failed page,
+        so the result matches the sequential version.
+        """
+        pages = await self.afetch_news_pages(query, start_date, end_date, max_results)
+        return pages[0]
+
+    async def afetch_news_pages(
+        self, query: str, start_date: str, end_date: str, max_results: int = 20
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Async fetch_news_pages: (results, whether no page failed)."""
+        starts = range(1, max_results + 1, 10)
+        pages = await asyncio.gather(
+            *(self._afetch_page(query, start_date, end_date, s) for s in starts)
+        )
+        all_results: List[Dict[str, Any]] = []
+        for items in pages:
+            if items is None:
+                return all_results, False
+            if not items:
+                break
+            all_results.extend(items)
+        return all_results, True
+
+    async def aget_full_summary(self, link: str, fallback_summary: str = "") -> str:
+        """Async get_full_summary using the shared client."""
+        entry, fresh = self._cached_article(link)
+        if entry is not None and fresh:
+            return compose_summary(
+                entry["title"], entry["description"], fallback_summary
+            )
+        try:
+            resp, meta = await self._afetch_head(
+                link, ArticleCache.conditional_headers(entry)
+            )
+            return self._article_summary(link, resp, meta, entry, fallback_summary)
+        except Exception as e:
+            self.logger.error(f"Error fetching summary for {link}: {e}")
+            return self._stale_summary(entry, fallback_summary)
+
+    async def afetch_summaries(self, items: Sequence[Dict[str, Any]]) -> List[str]:
+        """
+        Full summaries of news items (dicts with 'link' and optional
+        'snippet'), fetched concurrently. Returns one summary per item, in
+        order; the snippet is the fallback when an article cannot be fetched.
+        """
+        return list(
+            await asyncio.gather(
+                *(
+                    self.aget_full_summary(
+                        item.get("link", ""), item.get("snippet", "")
+                    )
+                    for item in items
+                )
+            )
+        )
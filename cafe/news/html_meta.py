@@ -0,0 +1,117 @@
+import codecs
+from html.parser import HTMLParser
+from typing import AsyncIterable, Dict, Iterable, Optional, Tuple
+
+# Most pages close <head> well within this; larger heads are cut off
+MAX_HEAD_BYTES = 256 * 1024
+
+# (attribute, value) pairs of the meta tags we keep, by result key
+_META_KEYS = {
+    ("name", "description"): "description",
+    ("property", "og:title"): "og_title",
+    ("property", "og:description"): "og_description",
+    ("name", "og:title"): "og_title",
+    ("name", "og:description"): "og_description",
+}
+
+
+class HeadMetaParser(HTMLParser):
+    """
+    Collects <title>, the meta description and OpenGraph title/description
+    from an HTML document fed in pieces. `done` is set at </head> or <body>,
+    after which the rest of the page is not needed.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta: Dict[str, str] = {}
+        self.done = False
+        self._in_title = False
+        self._title_parts: list = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == "title":
+            self._in_title = True
+        elif tag == "meta":
+            values = {k.lower(): v for k, v in attrs if v is not None}
+            content = values.get("content")
+            if content is None:
+                return
+            for attr in ("name", "property"):
+                key = _META_KEYS.get((attr, values.get(attr, "").lower()))
+                if key and key not in self.meta:
+                    self.meta[key] = content.strip()
+        elif tag == "body":
+            self._finish()
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self._in_title:
+            self._in_title = False
+            title = "".join(self._title_parts).strip()
+            if title and "title" not in self.meta:
+                self.meta["title"] = title
+        elif tag == "head":
+            self._finish()
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._title_parts.append(data)
+
+    def _finish(self) -> None:
+        self.done = True
+        self._in_title = False
+
+
+def _decoder(encoding: Optional[str]):
+    try:
+        factory = codecs.getincrementaldecoder(encoding or "utf-8")
+    except LookupError:
+        factory = codecs.getincrementaldecoder("utf-8")
+    return factory(errors="replace")
+
+
+def _feed(parser: HeadMetaParser, decoder, chunk: bytes, seen: int, cap: int) -> int:
+    chunk = chunk[: max(0, cap - seen)]
+    parser.feed(decoder.decode(chunk))
+    return seen + len(chunk)
+
+
+def extract_head_meta(
+    chunks: Iterable[bytes],
+    max_bytes: int = MAX_HEAD_BYTES,
+    encoding: Optional[str] = None,
+) -> Dict[str, str]:
+    """
+    Head metadata from a stream of response bytes (e.g. Response.iter_bytes()).
+    Stops reading at </head> or after max_bytes. Keys present among "title",
+    "description", "og_title" and "og_description".
+    """
+    parser, decoder, seen = HeadMetaParser(), _decoder(encoding), 0
+    for chunk in chunks:
+        seen = _feed(parser, decoder, chunk, seen, max_bytes)
+        if parser.done or seen >= max_bytes:
+            break
+    return parser.meta
+
+
+async def aextract_head_meta(
+    chunks: AsyncIterable[bytes],
+    max_bytes: int = MAX_HEAD_BYTES,
+    encoding: Optional[str] = None,
+) -> Dict[str, str]:
+    """Async extract_head_meta (e.g. for Response.aiter_bytes())."""
+    parser, decoder, seen = HeadMetaParser(), _decoder(encoding), 0
+    async for chunk in chunks:
+        seen = _feed(parser, decoder, chunk, seen, max_bytes)
+        if parser.done or seen >= max_bytes:
+            break
+    return parser.meta
+
+
+def title_description(meta: Dict[str, str]) -> Tuple[str, Optional[str]]:
+    """Title and description, falling back to the OpenGraph tags."""
+    title = meta.get("title") or meta.get("og_title") or ""
+    description = meta.get("description") or meta.get("og_description")
+    return title, description
@@ -1,7 +1,273 @@
-from typing import Optional
+import json
+import re
+import sqlite3
+import threading
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+TimeLike = Union[str, int, float, date, datetime]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    link TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    snippet TEXT NOT NULL DEFAULT '',
+    summary TEXT NOT NULL DEFAULT '',
+    published REAL,
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, snippet, summary, content='articles', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, snippet, summary)
+    VALUES (new.id, new.title, new.snippet, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, snippet, summary)
+    VALUES ('delete', old.id, old.title, old.snippet, old.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, snippet, summary)
+    VALUES ('delete', old.id, old.title, old.snippet, old.summary);
+    INSERT INTO articles_fts(rowid, title, snippet, summary)
+    VALUES (new.id, new.title, new.snippet, new.summary);
+END;
+"""
+
+# BM25 column weights: title, snippet, summary
+_BM25_WEIGHTS = (3.0, 1.0, 1.0)
+
+# Publication time fields, in order of preference (Google CSE puts them in
+# pagemap.metatags)
+_TIME_KEYS = ("published", "published_at", "date", "datePublished")
+_METATAG_TIME_KEYS = (
+    "article:published_time",
+    "og:article:published_time",
+    "datepublished",
+    "article:modified_time",
+    "og:updated_time",
+)
+
+
+def _epoch(value: Optional[TimeLike]) -> Optional[float]:
+    """Epoch seconds; naive times and dates are taken as UTC."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def published_time(article: Dict[str, Any]) -> Optional[float]:
+    """Publication time of a news item (plain fields or Google pagemap)."""
+    for key in _TIME_KEYS:
+        parsed = _epoch(article.get(key))
+        if parsed is not None:
+            return parsed
+    for metatags in (article.get("pagemap") or {}).get("metatags") or []:
+        for key in _METATAG_TIME_KEYS:
+            parsed = _epoch(metatags.get(key))
+            if parsed is not None:
+                return parsed
+    return None
+
+
+def _match_expression(query: str) -> str:
+    # Quoted terms joined with OR: any query text is valid FTS5 syntax, and
+    # BM25 ranks articles matching more (and rarer) terms first
+    terms = re.findall(r"\w+", query.casefold())
+    return " OR ".join(f'"{term}"' for term in terms)
 
 
 class NewsLocalRetriever:
+    """
+    Offline news retrieval over a local SQLite FTS5 index with BM25 ranking.
+    Articles are keyed by link, so adding the same article again updates it,
+    and new articles can be added at any time. Publication times allow
+    point-in-time queries (nothing published after end_date is returned).
+
+    Articles without a known publication time get the `default_time` passed
+    when they are added (e.g. when the search that found them ran); articles
+    with no time at all are excluded by date filters.
+    """
+
+    def __init__(self, db_path: str = ":memory:"):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            db_path, check_same_thread=False, isolation_level=None
+        )
+        with self._lock:
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def add(
+        self,
+        articles: Iterable[Dict[str, Any]],
+        default_time: Optional[TimeLike] = None,
+    ) -> int:
+        """
+        Index news items (dicts with 'link' and any of 'title', 'snippet',
+        'summary'). Returns the number of items indexed; items without a
+        link are skipped.
+        """
+        fallback = _epoch(default_time)
+        rows = []
+        for article in articles:
+            link = article.get("link")
+            if not link:
+                continue
+            published = published_time(article)
+            rows.append(
+                (
+                    link,
+                    article.get("title") or "",
+                    article.get("snippet") or "",
+                    article.get("summary") or article.get("full_summary") or "",
+                    published if published is not None else fallback,
+                    json.dumps(article),
+                )
+            )
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO articles (link, title, snippet, summary, published, raw) "
+                    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(link) DO UPDATE SET "
+                    "title = excluded.title, snippet = excluded.snippet, "
+                    "summary = CASE WHEN excluded.summary != '' "
+                    "THEN excluded.summary ELSE articles.summary END, "
+                    "published = COALESCE(articles.published, excluded.published), "
+                    "raw = excluded.raw",
+                    rows,
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return len(rows)
+
+    def ingest_jsonl(self, path: str, time_key: Optional[str] = None) -> int:
+        """
+        Index a JSONL corpus with one news item per line. time_key names a
+        per-line field used when the item has no publication time.
+        """
+        count = 0
+        batch: List[Dict[str, Any]] = []
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                if time_key and published_time(item) is None and item.get(time_key):
+                    item = {**item, "published": item[time_key]}
+                batch.append(item)
+                if len(batch) >= 1000:
+                    count += self.add(batch)
+                    batch = []
+        return count + self.add(batch)
+
+    def ingest_search_cache(self, search_cache, article_cache=None) -> int:
+        """
+        Index every result stored in a NewsSearchCache, with summaries from
+        an ArticleCache when available. Undated results get the time the
+        search was fetched: searches are not date-restricted, so that is the
+        earliest time they are known to exist.
+        """
+        count = 0
+        for _, _, _, results, fetched_at in search_cache.entries():
+            items = []
+            for item in results:
+                entry = (
+                    article_cache.get(item.get("link", ""), touch=False)
+                    if article_cache is not None
+                    else None
+                )
+                if entry is not None:
+                    parts = (entry["title"], entry["description"] or "")
+                    item = {**item, "summary": " - ".join(p for p in parts if p)}
+                items.append(item)
+            count += self.add(items, default_time=fetched_at)
+        return count
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def query(
+        self,
+        query: str,
+        top_k: int = 10,
+        start_date: Optional[TimeLike] = None,
+        end_date: Optional[TimeLike] = None,
+    ) -> List[Dict[str, Any]]:
+        """Top-k articles for a query by BM25, optionally within a date range."""
+        expression = _match_expression(query)
+        if not expression:
+            return []
+        sql = (
+            "SELECT a.raw, a.published, a.summary, bm25(articles_fts, ?, ?, ?) AS rank "
+            "FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+            "WHERE articles_fts MATCH ?"
+        )
+        args: List[Any] = [*_BM25_WEIGHTS, expression]
+        start, end = _epoch(start_date), _epoch(end_date)
+        if start is not None:
+            sql += " AND a.published >= ?"
+            args.append(start)
+        if end is not None:
+            sql += " AND a.published <= ?"
+            args.append(end)
+        sql += " ORDER BY rank LIMIT ?"
+        args.append(top_k)
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        results = []
+        for raw, published, summary, rank in rows:
+            article = json.loads(raw)
+            if summary:
+                article["summary"] = summary
+            article["published"] = published
+            # bm25() is lower for better matches
+            article["score"] = -rank
+            results.append(article)
+        return results
+
     def retrieve(self, query: str, parameters: Optional[dict] = None) -> dict:
-        # Placeholder: Local news retrieval logic goes here
-        return {"message": "Local news retrieval integration pending"}
+        """
+        Args:
+            parameters: Optional "top_k" (default 10), "start_date" and
+                "end_date" (ISO strings, dates or epoch seconds).
+        Returns {"query": query, "results": [...]}, best match first.
+        """
+        parameters = parameters or {}
+        results = self.query(
+            query,
+            top_k=int(parameters.get("top_k", 10)),
+            start_date=parameters.get("start_date"),
+            end_date=parameters.get("end_date"),
+        )
+        return {"query": query, "results": results}
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """NewsSearchComponent interface: top 10 articles for the query."""
+        return self.query(query)
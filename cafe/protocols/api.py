@@ -1,15 +1,30 @@
+import asyncio
+import json
 import os
+import threading
+from typing import Any, AsyncIterator, Dict, List, cast
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 
 from cafe.context.memory import InMemoryContext
-from cafe.models.base import Predictable
+from cafe.models.base import BatchPredictable, Predictable
 from cafe.models.llm.gemini import GeminiModel
+from cafe.models.llm.huggingface import HuggingFaceModel
 from cafe.models.llm.vllm import VLLMModel
 from cafe.models.timeseries.api import TimeSeriesAPIModel
 from cafe.models.timeseries.local import TimeSeriesLocalModel
 
-from .schemas import ForecastRequest, ForecastResponse
+from .batching import MicroBatchScheduler
+from .schemas import (
+    BatchForecastItem,
+    BatchForecastRequest,
+    BatchForecastResponse,
+    ForecastRequest,
+    ForecastResponse,
+)
 
 router = APIRouter()
 
@@ -18,12 +33,27 @@ from .metaculus import router as metaculus_router
 # Context instance (in-memory)
 context = InMemoryContext()
 
+VALID_MODELS = ["vllm", "huggingface", "gemini", "timeseries_local", "timeseries_api"]
+
+# Models whose concurrent requests are grouped by the micro-batch scheduler
+BATCHED_MODELS = {"vllm", "huggingface"}
+
+scheduler = MicroBatchScheduler(
+    max_batch_size=int(os.getenv("FORECAST_BATCH_MAX_SIZE", "16")),
+    max_wait_ms=float(os.getenv("FORECAST_BATCH_MAX_WAIT_MS", "10")),
+)
+
+# Upper bound on in-flight predictions for models without a batched path
+BATCH_MAX_CONCURRENCY = int(os.getenv("FORECAST_BATCH_MAX_CONCURRENCY", "8"))
+
 # Lazy model getter
 
 
 def get_model(name: str) -> Predictable:
     if name == "vllm":
         return VLLMModel()
+    if name == "huggingface":
+        return HuggingFaceModel()
     if name == "gemini":
         return GeminiModel(api_key=os.getenv("GEMINI_API_KEY"))
     if name == "timeseries_local":
@@ -33,23 +63,190 @@ def get_model(name: str) -> Predictable:
     raise ValueError(f"Unknown model: {name}")
 
 
-@router.post("/forecast", response_model=ForecastResponse)
-def forecast(request: ForecastRequest):
+_shared_models: Dict[str, Predictable] = {}
+_shared_models_lock = threading.Lock()
+
+
+def get_shared_model(name: str) -> Predictable:
+    """Returns one process-wide instance per model, so batched requests share loaded weights."""
+    model = _shared_models.get(name)
+    if model is None:
+        # Double-checked: concurrent first requests must not load weights twice
+        with _shared_models_lock:
+            model = _shared_models.get(name)
+            if model is None:
+                model = get_model(name)
+                _shared_models[name] = model
+    return model
+
+
+async def resolve_model(name: str) -> Predictable:
     try:
-        model = get_model(request.model)
-    except ValueError as e:
-        valid_models = ["vllm", "gemini", "timeseries_local", "timeseries_api"]
+        if name in BATCHED_MODELS:
+            return await run_in_threadpool(get_shared_model, name)
+        return get_model(name)
+    except ValueError:
         raise HTTPException(
             status_code=400,
-            detail=f"Unknown model: {request.model}. Valid models: {', '.join(valid_models)}",
+            detail=f"Unknown model: {name}. Valid models: {', '.join(VALID_MODELS)}",
         )
+
+
+@router.post("/forecast", response_model=ForecastResponse)
+async def forecast(request: ForecastRequest):
+    model = await resolve_model(request.model)
+    parameters = request.parameters or {}
     try:
-        result = model.predict(request.prompt, request.parameters or {}, context)
+        if request.model in BATCHED_MODELS and hasattr(model, "predict_batch"):
+            result = await scheduler.submit(
+                request.model,
+                cast(BatchPredictable, model),
+                request.prompt,
+                parameters,
+                context,
+            )
+        else:
+            result = await run_in_threadpool(
+                model.predict, request.prompt, parameters, context
+            )
         return ForecastResponse(result=result, model=request.model)
     except Exception as e:
         # Always return error in response, even for missing API key
         return ForecastResponse(result=None, model=request.model, error=str(e))
 
 
+def _predict_chunk(
+    model: BatchPredictable, start: int, prompts: List[str], parameters: Dict[str, Any]
+) -> List[BatchForecastItem]:
+    try:
+        results = model.predict_batch(prompts, parameters, context)
+    except Exception as e:
+        return [
+            BatchForecastItem(index=start + i, error=str(e))
+            for i in range(len(prompts))
+        ]
+    return [
+        BatchForecastItem(index=start + i, result=result)
+        for i, result in enumerate(results)
+    ]
+
+
+async def iter_batch_items(
+    model: Predictable, prompts: List[str], parameters: Dict[str, Any]
+) -> AsyncIterator[BatchForecastItem]:
+    """
+    Yields one BatchForecastItem per prompt as soon as it is available.
+    Models with predict_batch are fed chunks of scheduler.max_batch_size prompts;
+    other models run one predict per prompt, at most BATCH_MAX_CONCURRENCY at a time.
+    """
+    if hasattr(model, "predict_batch"):
+        chunk_size = scheduler.max_batch_size
+        for start in range(0, len(prompts), chunk_size):
+            items = await run_in_threadpool(
+                _predict_chunk,
+                cast(BatchPredictable, model),
+                start,
+                prompts[start : start + chunk_size],
+                parameters,
+            )
+            for item in items:
+                yield item
+        return
+
+    semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+    async def predict_one(index: int, prompt: str) -> BatchForecastItem:
+        async with semaphore:
+            try:
+                result = await run_in_threadpool(
+                    model.predict, prompt, parameters, context
+                )
+                return BatchForecastItem(index=index, result=result)
+            except Exception as e:
+                return BatchForecastItem(index=index, error=str(e))
+
+    tasks = [
+        asyncio.ensure_future(predict_one(i, prompt))
+        for i, prompt in enumerate(prompts)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@router.post("/forecast/batch", response_model=BatchForecastResponse)
+async def forecast_batch(request: BatchForecastRequest):
+    """
+    Runs many prompts against one model in a single request.
+    Errors are reported per item. With stream=true, items are returned as NDJSON
+    lines in completion order; otherwise results are returned in prompt order.
+    """
+    model = await resolve_model(request.model)
+    items = iter_batch_items(model, request.prompts, request.parameters or {})
+    if request.stream:
+
+        async def ndjson_lines() -> AsyncIterator[str]:
+            async for item in items:
+                yield json.dumps(jsonable_encoder(item)) + "\n"
+
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+    results = [item async for item in items]
+    results.sort(key=lambda item: item.index)
+    return BatchForecastResponse(model=request.model, results=results)
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+async def iter_stream_events(
+    model: Predictable, model_name: str, prompt: str, parameters: Dict[str, Any]
+) -> AsyncIterator[str]:
+    """
+    Yields Server-Sent Events for a streamed completion: one "token" event per
+    chunk, then a final "answer" event carrying the postprocessed answer.
+    Models without predict_stream emit only the final event. Failures are
+    reported as an "error" event, since the status code has already been sent.
+    """
+    try:
+        predict_stream = getattr(model, "predict_stream", None)
+        if predict_stream is None:
+            result = await run_in_threadpool(model.predict, prompt, parameters, context)
+            yield _sse_event("answer", {"result": result, "model": model_name})
+            return
+        stream = predict_stream(prompt, parameters, context)
+        if not hasattr(stream, "__aiter__"):
+            # Blocking generators (Gemini, HuggingFace, vLLM) run in a worker thread
+            stream = iterate_in_threadpool(stream)
+        chunks: List[str] = []
+        async for chunk in stream:
+            chunks.append(chunk)
+            yield _sse_event("token", {"text": chunk})
+        text = "".join(chunks)
+        postprocessor = getattr(model, "postprocessor", None)
+        answer = postprocessor.extract_answer(text) if postprocessor else text
+        yield _sse_event(
+            "answer", {"text": text, "answer": answer, "model": model_name}
+        )
+    except Exception as e:
+        yield _sse_event("error", {"error": str(e), "model": model_name})
+
+
+@router.post("/forecast/stream")
+async def forecast_stream(request: ForecastRequest):
+    """Streams tokens of a single forecast as text/event-stream."""
+    model = await resolve_model(request.model)
+    return StreamingResponse(
+        iter_stream_events(
+            model, request.model, request.prompt, request.parameters or {}
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # Mount Metaculus endpoints
 router.include_router(metaculus_router, prefix="")
@@ -0,0 +1,122 @@
+import asyncio
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from cafe.models.base import BatchPredictable
+
+
+class _PendingBatch:
+    def __init__(self, model: BatchPredictable, parameters: Dict[str, Any], context):
+        self.model = model
+        self.parameters = parameters
+        self.context = context
+        self.prompts: List[str] = []
+        self.futures: List[asyncio.Future] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class MicroBatchScheduler:
+    """
+    Collects concurrent single-prompt requests into micro-batches.
+
+    Requests for the same model and identical parameters are grouped until either
+    max_batch_size prompts are queued or max_wait_ms has elapsed since the first one,
+    then the whole group is handed to the model's predict_batch in a worker thread.
+    Each caller awaits only its own result.
+    """
+
+    def __init__(self, max_batch_size: int = 16, max_wait_ms: float = 10.0):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._pending: Dict[Tuple[int, str, str], _PendingBatch] = {}
+        # The loop only keeps weak references to tasks; hold dispatches here
+        self._tasks: Set[asyncio.Future] = set()
+
+    def _batch_key(
+        self, model_name: str, parameters: Dict[str, Any]
+    ) -> Tuple[int, str, str]:
+        # Batches are bound to the running loop, so a loop restart never mixes state
+        loop_id = id(asyncio.get_running_loop())
+        param_raw = json.dumps(parameters, sort_keys=True, default=str)
+        return loop_id, model_name, hashlib.md5(param_raw.encode()).hexdigest()
+
+    async def submit(
+        self,
+        model_name: str,
+        model: BatchPredictable,
+        prompt: str,
+        parameters: Dict[str, Any],
+        context,
+    ) -> Any:
+        """Queue a prompt for batched prediction and wait for its individual result."""
+        loop = asyncio.get_running_loop()
+        key = self._batch_key(model_name, parameters)
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _PendingBatch(model, parameters, context)
+            self._pending[key] = batch
+            batch.timer = loop.call_later(
+                self.max_wait_ms / 1000.0, self._flush, key, batch
+            )
+        future: asyncio.Future = loop.create_future()
+        batch.prompts.append(prompt)
+        batch.futures.append(future)
+        if len(batch.prompts) >= self.max_batch_size:
+            self._flush(key, batch)
+        return await future
+
+    def _flush(self, key: Tuple[int, str, str], batch: _PendingBatch) -> None:
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+        if batch.timer is not None:
+            batch.timer.cancel()
+            batch.timer = None
+        if batch.prompts:
+            task = asyncio.ensure_future(self._dispatch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def shutdown(self, cancel: bool = False) -> None:
+        """
+        Flush the batches queued on the running loop and wait for every
+        in-flight dispatch, or cancel them (their callers get CancelledError).
+        """
+        loop = asyncio.get_running_loop()
+        for key, batch in list(self._pending.items()):
+            if key[0] == id(loop):
+                self._flush(key, batch)
+        tasks = [task for task in self._tasks if task.get_loop() is loop]
+        if cancel:
+            for task in tasks:
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _dispatch(self, batch: _PendingBatch) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                None,
+                batch.model.predict_batch,
+                batch.prompts,
+                batch.parameters,
+                batch.context,
+            )
+            if len(results) != len(batch.prompts):
+                raise RuntimeError(
+                    f"predict_batch returned {len(results)} results for {len(batch.prompts)} prompts"
+                )
+        except asyncio.CancelledError:
+            for future in batch.futures:
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result in zip(batch.futures, results):
+            if not future.done():
+                future.set_result(result)
@@ -1,14 +1,20 @@
+import asyncio
 import json
 import os
+from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException
+import httpx
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 
 from cafe.sources.comment import MetaculusComment
 from cafe.sources.question import MetaculusForecastQuestion
 from cafe.sources.source_metaculus import MetaculusForecastSource
 
+from .question_index import get_question_index
+from .responses import json_payload_response, payload_cache
+
 router = APIRouter()
 
 
@@ -28,51 +34,134 @@ class MetaculusCommentOut(BaseModel):
     vote_score: Optional[int]
 
 
-from cafe.sources.source_local import LocalForecastSource
+from cafe.sources.source_local import LocalForecastCommentSource
+
+
+def _read_json(path: str):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _write_json(path: str, data) -> None:
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def _load_cached_comments(path: str) -> List[MetaculusComment]:
+    comments_data = _read_json(path)
+    return [LocalForecastCommentSource("")._parse_comment(c) for c in comments_data]
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Pooled client shared by all Metaculus requests (opened in the app lifespan)."""
+    return httpx.AsyncClient()
+
+
+def _metaculus_source(request: Request) -> MetaculusForecastSource:
+    # Falls back to a per-source client when the app was started without lifespan
+    client = getattr(request.app.state, "http_client", None)
+    return MetaculusForecastSource(async_client=client)
+
+
+def _file_version(kind: str, path: str) -> tuple:
+    st = os.stat(path)
+    return kind, os.path.abspath(path), st.st_mtime_ns, st.st_size
+
+
+# List payloads are built as plain dicts (same fields as the *Out models) and
+# serialized once per file version, instead of validating one model per row.
+
+
+def _question_out(q) -> dict:
+    return {
+        "id": str(q.id),
+        "title": q.title,
+        "description": q.description,
+        "url": q.url,
+        "tags": list(q.tags or []),
+    }
+
+
+def _comment_out(c) -> dict:
+    return {
+        "id": c.id,
+        "text": c.text,
+        "author": c.author.username if c.author else None,
+        "created_at": c.created_at.isoformat() if c.created_at else None,
+        "vote_score": c.vote_score,
+    }
 
 
 @router.get("/metaculus/questions", response_model=List[MetaculusQuestionOut])
-def get_metaculus_questions(
-    force_refresh: bool = False, questions_cache_path: Optional[str] = None
+async def get_metaculus_questions(
+    request: Request,
+    force_refresh: bool = False,
+    questions_cache_path: Optional[str] = None,
+    status: Optional[str] = None,
+    tag: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
 ):
     """
     Returns Metaculus questions. If force_refresh is True, fetch from API and overwrite local cache.
     Otherwise, load from local if available, else fetch from API and save.
     Optionally override the questions cache file path with ?questions_cache_path=...
+    File access runs in a worker thread and API fetches use the async client,
+    so a cache miss does not block other requests.
+
+    The parsed cache is kept in memory and only re-read when the file changes.
+    Results can be filtered by status, tag and created_at range, and paginated with
+    limit/offset; X-Total-Count carries the number of matches before pagination.
+    Responses carry an ETag, and a matching If-None-Match returns 304.
+    Serialized (and gzip/br-compressed) bodies are cached per ETag.
     """
     default_path = os.path.join(
         MetaculusForecastSource.cache_dir, "questions_cache.json"
     )
     local_path = questions_cache_path or default_path
+    index = get_question_index(local_path)
     if not force_refresh and os.path.exists(local_path):
-        with open(local_path, "r") as f:
-            questions_data = json.load(f)
-        # If the cache contains dicts, convert to MetaculusForecastQuestion objects if needed
-        questions = [LocalForecastSource("")._parse_question(q) for q in questions_data]
+        snapshot = await asyncio.to_thread(index.refresh_if_stale)
     else:
-        questions = MetaculusForecastSource().list_questions()
+        source = _metaculus_source(request)
+        try:
+            questions = await source.alist_questions()
+        finally:
+            await source.aclose()
         # Save to cache
-        with open(local_path, "w") as f:
-            json.dump(
-                [q.raw if hasattr(q, "raw") else q for q in questions], f, indent=2
-            )
-    return [
-        MetaculusQuestionOut(
-            id=str(q.id),
-            title=q.title,
-            description=q.description,
-            url=q.url,
-            tags=q.tags,
+        await asyncio.to_thread(
+            _write_json,
+            local_path,
+            [q.raw if hasattr(q, "raw") else q for q in questions],
         )
-        for q in questions
-    ]
+        snapshot = await asyncio.to_thread(index.replace, questions)
+    # Everything below reads this one snapshot, even if a refresh swaps in another
+    etag = snapshot.etag(status, tag, created_after, created_before, limit, offset)
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [candidate.strip() for candidate in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag})
+    positions = await asyncio.to_thread(
+        snapshot.query, status, tag, created_after, created_before
+    )
+    page = positions[offset : offset + limit if limit is not None else None]
+    questions = snapshot.questions
+    return await asyncio.to_thread(
+        json_payload_response,
+        request,
+        lambda: [_question_out(questions[pos]) for pos in page],
+        ("questions", os.path.abspath(local_path), etag),
+        {"ETag": etag, "X-Total-Count": str(len(positions))},
+    )
 
 
 @router.get(
     "/metaculus/questions/{question_id}/comments",
     response_model=List[MetaculusCommentOut],
 )
-def get_metaculus_comments_for_question(
+async def get_metaculus_comments_for_question(
+    request: Request,
     question_id: str,
     force_refresh: bool = False,
     comments_cache_path: Optional[str] = None,
@@ -82,10 +171,6 @@ def get_metaculus_comments_for_question(
     Otherwise, load from local if available, else fetch from API and save.
     Optionally override the comments cache file path with ?comments_cache_path=...
     """
-    import os
-
-    from cafe.sources.source_local import LocalForecastCommentSource
-
     default_comments_dir = os.path.join(
         MetaculusForecastSource.cache_dir, "comments_by_question"
     )
@@ -103,28 +188,32 @@ def get_metaculus_comments_for_question(
             f"Test attempted to access production comments cache: {local_path}. "
             "Patch your test to use a temporary comments_cache_path!"
         )
+    comments: Optional[List[MetaculusComment]] = None
     if not force_refresh and os.path.exists(local_path):
-        with open(local_path, "r") as f:
-            comments_data = json.load(f)
-        comments = [
-            LocalForecastCommentSource("")._parse_comment(c) for c in comments_data
-        ]
+        version = _file_version("comments", local_path)
+        # Skip parsing entirely when this file version is already serialized
+        if payload_cache.get(version, None) is None:
+            comments = await asyncio.to_thread(_load_cached_comments, local_path)
     else:
-        comments = MetaculusForecastSource().list_metaculus_comments_for_question(
-            int(question_id)
-        )
-        # Save to cache
-        with open(local_path, "w") as f:
-            json.dump(
-                [c.raw if hasattr(c, "raw") else c for c in comments], f, indent=2
+        source = _metaculus_source(request)
+        try:
+            comments = await source.alist_metaculus_comments_for_question(
+                int(question_id)
             )
-    return [
-        MetaculusCommentOut(
-            id=c.id,
-            text=c.text,
-            author=c.author.username if c.author else None,
-            created_at=c.created_at.isoformat() if c.created_at else None,
-            vote_score=c.vote_score,
+        finally:
+            await source.aclose()
+        # Save to cache
+        await asyncio.to_thread(
+            _write_json,
+            local_path,
+            [c.raw if hasattr(c, "raw") else c for c in comments],
         )
-        for c in comments
-    ]
+        version = _file_version("comments", local_path)
+
+    def build_payload() -> list:
+        rows = comments if comments is not None else _load_cached_comments(local_path)
+        return [_comment_out(c) for c in rows]
+
+    return await asyncio.to_thread(
+        json_payload_response, request, build_payload, version
+    )
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from cafe.sources.question import MetaculusForecastQuestion
+from cafe.sources.source_local import LocalForecastSource
+
+
+def _timestamp(dt: Optional[datetime]) -> Optional[float]:
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        # Naive datetimes in the cache are treated as UTC
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class QuestionSnapshot:
+    """
+    One loaded version of a questions cache file with its lookup indexes.
+    Never modified after construction (apart from its query cache), so a
+    request that holds a snapshot sees consistent questions and results.
+    """
+
+    MAX_CACHED_QUERIES = 256
+
+    def __init__(
+        self,
+        questions: List[MetaculusForecastQuestion],
+        stat: Optional[Tuple[int, int]] = None,
+    ):
+        by_status: Dict[str, List[int]] = {}
+        by_tag: Dict[str, List[int]] = {}
+        for pos, q in enumerate(questions):
+            status = getattr(q, "status", None)
+            if status:
+                by_status.setdefault(status, []).append(pos)
+            for tag in getattr(q, "tags", None) or []:
+                by_tag.setdefault(tag, []).append(pos)
+        self.questions = questions
+        self.stat = stat
+        self.version = f"{stat[0]:x}-{stat[1]:x}" if stat else ""
+        self._by_status = by_status
+        self._by_tag = by_tag
+        self._created = [_timestamp(getattr(q, "created_at", None)) for q in questions]
+        self._query_cache: Dict[tuple, List[int]] = {}
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        tag: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> List[int]:
+        """
+        Return positions of matching questions, in file order.
+        Questions without a creation date are excluded by date filters.
+        """
+        after = _timestamp(created_after)
+        before = _timestamp(created_before)
+        key = (status, tag, after, before)
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            return cached
+        candidates: Optional[List[int]] = None
+        for posting in (
+            self._by_status.get(status, []) if status else None,
+            self._by_tag.get(tag, []) if tag else None,
+        ):
+            if posting is None:
+                continue
+            if candidates is None:
+                candidates = posting
+            else:
+                allowed = set(posting)
+                candidates = [pos for pos in candidates if pos in allowed]
+        positions = (
+            list(range(len(self.questions))) if candidates is None else candidates
+        )
+        if after is not None or before is not None:
+            created = self._created
+            positions = [
+                pos
+                for pos in positions
+                if created[pos] is not None
+                and (after is None or created[pos] >= after)  # type: ignore[operator]
+                and (before is None or created[pos] <= before)  # type: ignore[operator]
+            ]
+        if len(self._query_cache) >= self.MAX_CACHED_QUERIES:
+            self._query_cache.clear()
+        self._query_cache[key] = positions
+        return positions
+
+    def etag(self, *query_args) -> str:
+        """Weak ETag identifying this file version and the given query parameters."""
+        query_hash = hashlib.md5(repr(query_args).encode()).hexdigest()[:16]
+        return f'W/"{self.version}-{query_hash}"'
+
+
+class QuestionIndex:
+    """
+    Parsed, indexed copy of a questions cache file kept in memory.
+    The file is re-parsed only when its mtime or size changes (or after replace()),
+    and lookups by status, tag and creation date use precomputed indexes.
+    Reloads build a new QuestionSnapshot and swap it in under the lock;
+    readers take snapshot() once and work on that.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._snapshot = QuestionSnapshot([])
+        self._lock = threading.Lock()
+
+    def _file_stat(self) -> Tuple[int, int]:
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def snapshot(self) -> QuestionSnapshot:
+        """The currently loaded version."""
+        with self._lock:
+            return self._snapshot
+
+    def refresh_if_stale(self) -> QuestionSnapshot:
+        """Reload from disk if the file changed since the last load."""
+        with self._lock:
+            stat = self._file_stat()
+            if stat != self._snapshot.stat:
+                with open(self.path, "r") as f:
+                    questions_data = json.load(f)
+                parser = LocalForecastSource("")
+                questions = [parser._parse_question(q) for q in questions_data]
+                self._snapshot = QuestionSnapshot(questions, stat)
+            return self._snapshot
+
+    def replace(self, questions: List[MetaculusForecastQuestion]) -> QuestionSnapshot:
+        """Install freshly fetched questions (after the cache file was rewritten)."""
+        with self._lock:
+            self._snapshot = QuestionSnapshot(questions, self._file_stat())
+            return self._snapshot
+
+
+_indexes: Dict[str, QuestionIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_question_index(path: str) -> QuestionIndex:
+    """Return the shared index for a cache file path (not loaded until refreshed)."""
+    key = os.path.abspath(path)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = QuestionIndex(path)
+    return index
@@ -0,0 +1,128 @@
+import gzip
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+
+orjson: Any
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Payloads smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = 1024
+
+
+def dumps_json(data: Any) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the best supported content coding from an Accept-Encoding header.
+    Returns "br" (if brotli is installed), "gzip", or None for identity.
+    """
+    offered: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            offered[coding.strip().lower()] = q
+    for coding in ("br", "gzip"):
+        if coding == "br" and brotli is None:
+            continue
+        q = offered.get(coding, offered.get("*", 0.0))
+        if q > 0:
+            return coding
+    return None
+
+
+def _compress(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+
+class EncodedPayloadCache:
+    """
+    Small LRU of serialized (and compressed) response bodies.
+    Entries are keyed by a caller-supplied version key plus content coding, so a
+    payload is serialized once and compressed at most once per coding.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Hashable, Optional[str]], bytes]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, encoding: Optional[str]) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get((key, encoding))
+            if body is not None:
+                self._entries.move_to_end((key, encoding))
+            return body
+
+    def put(self, key: Hashable, encoding: Optional[str], body: bytes) -> None:
+        with self._lock:
+            self._entries[(key, encoding)] = body
+            self._entries.move_to_end((key, encoding))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+payload_cache = EncodedPayloadCache()
+
+
+def json_payload_response(
+    request: Request,
+    build_payload: Callable[[], Any],
+    cache_key: Optional[Hashable] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Build a JSON response body once per cache_key and serve it in the client's
+    preferred content coding. Without a cache_key the body is built every time.
+    """
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    body = payload_cache.get(cache_key, encoding) if cache_key is not None else None
+    if body is None:
+        raw = payload_cache.get(cache_key, None) if cache_key is not None else None
+        if raw is None:
+            raw = dumps_json(build_payload())
+            if cache_key is not None:
+                payload_cache.put(cache_key, None, raw)
+        if len(raw) < MIN_COMPRESS_SIZE:
+            encoding = None
+        body = _compress(raw, encoding)
+        if cache_key is not None and encoding is not None:
+            payload_cache.put(cache_key, encoding, body)
+    response_headers = {"Vary": "Accept-Encoding", **(headers or {})}
+    if encoding is not None:
+        response_headers["Content-Encoding"] = encoding
+    return Response(
+        content=body, media_type="application/json", headers=response_headers
+    )
@@ -1,4 +1,4 @@
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 from pydantic import BaseModel
 
@@ -13,3 +13,21 @@ class ForecastResponse(BaseModel):
     result: Any
     model: str
     error: Optional[str] = None
+
+
+class BatchForecastRequest(BaseModel):
+    model: str
+    prompts: List[str]
+    parameters: Optional[dict] = None
+    stream: bool = False  # If True, results are streamed back as NDJSON lines
+
+
+class BatchForecastItem(BaseModel):
+    index: int  # Position of the prompt in the request
+    result: Any = None
+    error: Optional[str] = None
+
+
+class BatchForecastResponse(BaseModel):
+    model: str
+    results: List[BatchForecastItem]
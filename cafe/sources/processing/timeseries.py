@@ -0,0 +1,139 @@
+import math
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .metaculus import parse_time
+
+GAP_MODES = ("ffill", "nan", "linear")
+
+_FREQ_UNITS = {"s": 1, "min": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def parse_frequency(freq: Union[str, int, float]) -> float:
+    """
+    Convert a frequency such as "6h", "1D", "30min" or a number of seconds
+    into seconds.
+    """
+    if isinstance(freq, (int, float)):
+        seconds = float(freq)
+    else:
+        match = re.fullmatch(r"\s*(\d*\.?\d*)\s*(s|min|h|d|w)\s*", freq.lower())
+        if not match:
+            raise ValueError(f"Unrecognized frequency: {freq!r}")
+        seconds = float(match.group(1) or 1) * _FREQ_UNITS[match.group(2)]
+    if seconds <= 0:
+        raise ValueError("Frequency must be positive")
+    return seconds
+
+
+def _to_float(value: Any) -> float:
+    if isinstance(value, (list, tuple)):
+        value = value[0] if value else None
+    if isinstance(value, str):
+        try:
+            return parse_time(value)
+        except ValueError:
+            return math.nan
+    try:
+        return float(value) if value is not None else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def history_arrays(
+    time_series: List[dict], value_key: str = "centers"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pull (timestamps, values) arrays out of one question's linked history
+    (the output of link_comments_to_forecasts). List-valued fields such as
+    "centers" use their first element and ISO timestamps are accepted.
+    Snapshots without a numeric time or value are dropped; the result is
+    sorted by time.
+    """
+    times = np.array(
+        [_to_float(entry.get("timestamp")) for entry in time_series], dtype=float
+    )
+    values = np.array(
+        [
+            _to_float((entry.get("forecast") or {}).get(value_key))
+            for entry in time_series
+        ],
+        dtype=float,
+    )
+    keep = ~(np.isnan(times) | np.isnan(values))
+    times, values = times[keep], values[keep]
+    order = np.argsort(times, kind="stable")
+    return times[order], values[order]
+
+
+def resample_history(
+    times: np.ndarray,
+    values: np.ndarray,
+    freq: Union[str, int, float] = "1D",
+    gap: str = "ffill",
+    max_gap: Optional[Union[str, int, float]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Resample irregular snapshots onto a regular grid of `freq` spacing.
+    Grid points run from the first to the last snapshot (rounded up to the
+    grid) and each point only uses snapshots at or before it.
+    Args:
+        times: Snapshot times in seconds, sorted ascending.
+        values: Snapshot values.
+        freq: Grid spacing ("1D", "6h", ... or seconds).
+        gap: "ffill" carries the latest value forward, "nan" leaves grid points
+            with no snapshot in the preceding interval empty, and "linear"
+            interpolates between neighbouring snapshots.
+        max_gap: Points further than this from the snapshot they are filled
+            from ("ffill") or between snapshots further apart ("linear") are NaN.
+    Returns:
+        (grid_times, grid_values) arrays.
+    """
+    if gap not in GAP_MODES:
+        raise ValueError(f"gap must be one of {', '.join(GAP_MODES)}")
+    step = parse_frequency(freq)
+    limit = parse_frequency(max_gap) if max_gap is not None else None
+    times = np.asarray(times, dtype=float)
+    values = np.asarray(values, dtype=float)
+    if times.size == 0:
+        return np.empty(0), np.empty(0)
+    start = math.ceil(times[0] / step) * step
+    stop = math.ceil(times[-1] / step) * step
+    grid = start + step * np.arange(int(round((stop - start) / step)) + 1)
+    # Latest snapshot at or before each grid point
+    idx = np.searchsorted(times, grid, side="right") - 1
+    age = grid - times[idx]
+    if gap == "linear":
+        resampled = np.interp(grid, times, values)
+        if limit is not None:
+            nxt = np.minimum(idx + 1, times.size - 1)
+            span = times[nxt] - times[idx]
+            resampled[(span > limit) & (age > 0)] = np.nan
+    else:
+        resampled = values[idx].copy()
+        if gap == "nan":
+            resampled[age >= step] = np.nan
+        elif limit is not None:
+            resampled[age > limit] = np.nan
+    return grid, resampled
+
+
+def resample_linked_histories(
+    series_by_qid: Dict[str, List[dict]],
+    freq: Union[str, int, float] = "1D",
+    gap: str = "ffill",
+    max_gap: Optional[Union[str, int, float]] = None,
+    value_key: str = "centers",
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Resample every question of link_comments_to_forecasts output.
+    Returns {qid: {"timestamps": grid_times, "values": grid_values}}.
+    """
+    resampled = {}
+    for qid, time_series in series_by_qid.items():
+        times, values = history_arrays(time_series, value_key)
+        grid, grid_values = resample_history(times, values, freq, gap, max_gap)
+        resampled[qid] = {"timestamps": grid, "values": grid_values}
+    return resampled
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import os
 import time
@@ -8,6 +9,8 @@ import httpx
 from dotenv import load_dotenv
 from httpx import HTTPStatusError, RequestError
 
+from cafe.utils.rate_limit import TokenBucket, get_rate_limiter, retry_after_seconds
+
 from .comment import (
     MetaculusChangedMyMind,
     MetaculusComment,
@@ -24,7 +27,9 @@ class MetaculusForecastSource(ForecastSourceBase):
     MAX_RETRIES = 5
     BACKOFF_FACTOR = 2.0  # exponential
     INITIAL_DELAY = 1.0  # seconds
-    PAGINATED_REQUEST_DELAY = 0.5  # seconds between paginated requests
+    # Request budget shared by every MetaculusForecastSource in the process
+    REQUESTS_PER_SECOND = 2.0
+    REQUEST_BURST = 5
 
     @classmethod
     def from_env(cls, base_url: Optional[str] = None, api_key: Optional[str] = None):
@@ -55,7 +60,6 @@ class MetaculusForecastSource(ForecastSourceBase):
         """
         import json
         import sys
-        import time
         from pathlib import Path
 
         from cafe.sources.processing.metadata import get_metadata
@@ -137,7 +141,6 @@ class MetaculusForecastSource(ForecastSourceBase):
             page += 1
             if not next_url:
                 break
-            time.sleep(0.2)
         print(f"Total questions fetched: {len(all_questions)}")
         # Fetch comments
         comments_by_qid = {}
@@ -178,7 +181,13 @@ class MetaculusForecastSource(ForecastSourceBase):
                 )
         return all_questions, comments_by_qid
 
-    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        async_client: Optional[httpx.AsyncClient] = None,
+    ):
         load_dotenv()
         # Remove trailing slash if present, then add /questions/
         base = (
@@ -190,6 +199,12 @@ class MetaculusForecastSource(ForecastSourceBase):
         self.base_url = f"{base}/posts/"
         self.api_url = base  # For generic resources
         self.api_key = api_key or os.getenv("METACULUS_API_KEY", "")
+        # An injected client (e.g. the app-wide one) is shared, not closed here
+        self._async_client = async_client
+        self._owns_async_client = async_client is None
+        self.rate_limiter = rate_limiter or get_rate_limiter(
+            "metaculus", self.REQUESTS_PER_SECOND, self.REQUEST_BURST
+        )
 
     def _headers(self):
         headers = {}
@@ -223,6 +238,16 @@ class MetaculusForecastSource(ForecastSourceBase):
             print(f"[Metaculus] Error fetching {url}: {e}")
             return None
 
+    def _backoff(self, response: httpx.Response, delay: float) -> float:
+        """
+        Delay before retrying a 429/5xx: at least what Retry-After asks for.
+        A 429 also holds back every other request sharing the rate limiter.
+        """
+        delay = max(delay, retry_after_seconds(response) or 0.0)
+        if response.status_code == 429:
+            self.rate_limiter.penalize(delay)
+        return delay
+
     def _httpx_get_with_retries(
         self,
         url,
@@ -245,6 +270,7 @@ class MetaculusForecastSource(ForecastSourceBase):
         last_exc = None
         for attempt in range(max_retries):
             try:
+                self.rate_limiter.acquire()
                 response = httpx.get(
                     url, headers=headers, params=params, timeout=timeout
                 )
@@ -253,6 +279,7 @@ class MetaculusForecastSource(ForecastSourceBase):
             except HTTPStatusError as e:
                 status = e.response.status_code
                 if status in (429, 500, 502, 503, 504):
+                    delay = self._backoff(e.response, delay)
                     print(
                         f"[Metaculus] HTTP {status} for {url} (attempt {attempt+1}/{max_retries}), retrying in {delay:.1f}s..."
                     )
@@ -343,12 +370,7 @@ class MetaculusForecastSource(ForecastSourceBase):
         max_pages: int = 50,
     ) -> list:
         """Fetch all comments from the /api/comments/ endpoint, handling pagination. Returns List[MetaculusComment]."""
-        import urllib.parse
-
-        url: Optional[str] = (
-            self.api_url.replace("http://", "https://").replace("/api2", "/api")
-            + "/comments/"
-        )
+        url: Optional[str] = self._comments_url()
         all_items = []
         next_params: Optional[Dict[str, Union[str, int, float, bool, None]]] = (
             dict(params) if params else None
@@ -394,20 +416,8 @@ class MetaculusForecastSource(ForecastSourceBase):
                     url = None
                 # Prepare next_params for pagination
                 if url:
-                    parsed = urllib.parse.urlparse(url)
-                    query = urllib.parse.parse_qs(parsed.query)
-                    query_str = {}
-                    for k, v in query.items():
-                        if v is not None:
-                            query_str[str(k)] = str(v)
-                    query_str = cast(Dict[str, str], query_str)
-                    url = str(
-                        parsed._replace(
-                            query=urllib.parse.urlencode(query_str)
-                        ).geturl()
-                    )
+                    url = self._normalize_next_url(url)
                     next_params = None
-                    time.sleep(self.PAGINATED_REQUEST_DELAY)
                 else:
                     url = None
             except Exception as e:
@@ -415,6 +425,26 @@ class MetaculusForecastSource(ForecastSourceBase):
                 break
         return all_items
 
+    def _comments_url(self) -> str:
+        return (
+            self.api_url.replace("http://", "https://").replace("/api2", "/api")
+            + "/comments/"
+        )
+
+    @staticmethod
+    def _normalize_next_url(url: str) -> str:
+        """Re-encode the query string of a pagination 'next' link."""
+        import urllib.parse
+
+        parsed = urllib.parse.urlparse(url)
+        query = urllib.parse.parse_qs(parsed.query)
+        query_str = {}
+        for k, v in query.items():
+            if v is not None:
+                query_str[str(k)] = str(v)
+        query_str = cast(Dict[str, str], query_str)
+        return str(parsed._replace(query=urllib.parse.urlencode(query_str)).geturl())
+
     def list_metaculus_comments_for_question(
         self,
         question_id: int,
@@ -422,6 +452,18 @@ class MetaculusForecastSource(ForecastSourceBase):
     ) -> list:
         """Fetch all comments for a given Metaculus question by id. Returns List[MetaculusComment]."""
         q = self.get_question(str(question_id))
+        params_dict = self._comments_params_for_question(q, question_id, params)
+        if params_dict is None:
+            return []
+        return self.list_metaculus_comments(params=params_dict)
+
+    @staticmethod
+    def _comments_params_for_question(
+        q: Any,
+        question_id: int,
+        params: Optional[Mapping[str, Union[str, int, float, bool, None]]] = None,
+    ) -> Optional[Dict[str, Union[str, int, float, bool, None]]]:
+        """Build /comments/ query params for a question, or None if its post id is unknown."""
         # Always work with a dict for 'raw'
         raw = (
             q.raw
@@ -445,7 +487,7 @@ class MetaculusForecastSource(ForecastSourceBase):
         )
         if not post_id:
             print(f"[Metaculus] Could not resolve post id for question {question_id}")
-            return []
+            return None
         params_dict: Dict[str, Union[str, int, float, bool, None]] = (
             dict(params) if params else {}
         )
@@ -454,7 +496,7 @@ class MetaculusForecastSource(ForecastSourceBase):
             params_dict["post"] = int(post_id)
         else:
             params_dict["post"] = post_id
-        return self.list_metaculus_comments(params=params_dict)
+        return params_dict
 
     def list_series(self, params: Optional[dict] = None):
         return self.list_resource("series", params=params or {})
@@ -465,6 +507,191 @@ class MetaculusForecastSource(ForecastSourceBase):
     def list_groups(self, params: Optional[dict] = None):
         return self.list_resource("groups", params=params or {})
 
+    # Async API: same resources as above, without blocking the event loop
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient()
+            self._owns_async_client = True
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """Close the pooled async HTTP client if this source opened it."""
+        if self._async_client is not None and self._owns_async_client:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    async def _ahttpx_get_with_retries(
+        self,
+        url,
+        headers=None,
+        params=None,
+        max_retries=None,
+        backoff_factor=None,
+        initial_delay=None,
+        timeout=30.0,
+    ):
+        """Async HTTP GET with retries and exponential backoff (asyncio.sleep between attempts)."""
+        max_retries = max_retries if max_retries is not None else self.MAX_RETRIES
+        backoff_factor = (
+            backoff_factor if backoff_factor is not None else self.BACKOFF_FACTOR
+        )
+        initial_delay = (
+            initial_delay if initial_delay is not None else self.INITIAL_DELAY
+        )
+        client = self._get_async_client()
+        delay = initial_delay
+        last_exc = None
+        for attempt in range(max_retries):
+            try:
+                await self.rate_limiter.aacquire()
+                response = await client.get(
+                    url, headers=headers, params=params, timeout=timeout
+                )
+                response.raise_for_status()
+                return response
+            except HTTPStatusError as e:
+                status = e.response.status_code
+                if status in (429, 500, 502, 503, 504):
+                    delay = self._backoff(e.response, delay)
+                    print(
+                        f"[Metaculus] HTTP {status} for {url} (attempt {attempt+1}/{max_retries}), retrying in {delay:.1f}s..."
+                    )
+                    await asyncio.sleep(delay)
+                    delay *= backoff_factor
+                    last_exc = e
+                    continue
+                else:
+                    print(f"[Metaculus] Fatal HTTP error {status} for {url}: {e}")
+                    raise
+            except Exception as e:
+                print(
+                    f"[Metaculus] Request error for {url} (attempt {attempt+1}/{max_retries}): {e}, retrying in {delay:.1f}s..."
+                )
+                await asyncio.sleep(delay)
+                delay *= backoff_factor
+                last_exc = e
+                continue
+        print(f"[Metaculus] Giving up on {url} after {max_retries} attempts.")
+        if last_exc:
+            raise last_exc
+        return None
+
+    async def alist_resource(
+        self,
+        resource: str,
+        params: Optional[Mapping[str, Union[str, int, float, bool, None]]] = None,
+    ):
+        """Async version of list_resource."""
+        url = f"{self.api_url}/{resource}/"
+        try:
+            response = await self._ahttpx_get_with_retries(
+                url, headers=self._headers(), params=params or {}
+            )
+            if response is None:
+                return None
+            data = response.json()
+            if isinstance(data, dict) and "results" in data:
+                return data["results"]
+            return data
+        except Exception as e:
+            print(f"[Metaculus] Error fetching {url}: {e}")
+            return None
+
+    async def aget_resource(self, resource: str, id: str):
+        """Async version of get_resource."""
+        url = f"{self.api_url}/{resource}/{id}/"
+        try:
+            response = await self._ahttpx_get_with_retries(url, headers=self._headers())
+            if response is None:
+                return None
+            return response.json()
+        except Exception as e:
+            print(f"[Metaculus] Error fetching {url}: {e}")
+            return None
+
+    async def alist_questions(
+        self, params: Optional[Mapping[str, Union[str, int, float, bool, None]]] = None
+    ) -> List[MetaculusForecastQuestion]:
+        """Async version of list_questions."""
+        raw_items = await self.alist_resource("posts", params=params or {})
+        if not raw_items:
+            return []
+        return [self._parse_metaculus_question(item) for item in raw_items]
+
+    async def aget_question(self, id: str) -> MetaculusForecastQuestion:
+        """Async version of get_question."""
+        raw = await self.aget_resource("posts", id)
+        if not raw:
+            raise ValueError(f"Question with id {id} not found.")
+        return self._parse_metaculus_question(raw)
+
+    async def alist_metaculus_comments(
+        self,
+        params: Optional[Mapping[str, Union[str, int, float, bool, None]]] = None,
+        max_pages: int = 50,
+    ) -> list:
+        """Async version of list_metaculus_comments."""
+        url: Optional[str] = self._comments_url()
+        all_items = []
+        next_params: Optional[Dict[str, Union[str, int, float, bool, None]]] = (
+            dict(params) if params else None
+        )
+        seen_urls = set()
+        page_count = 0
+        while url:
+            if url in seen_urls:
+                print(
+                    f"[Metaculus] Detected repeating URL in comments pagination: {url}. Breaking to prevent infinite loop."
+                )
+                break
+            seen_urls.add(url)
+            page_count += 1
+            if page_count > max_pages:
+                print(
+                    f"[Metaculus] Reached max_pages={max_pages} in comments pagination for url {url}. Breaking loop."
+                )
+                break
+            try:
+                if url.startswith("http://"):
+                    url = url.replace("http://", "https://", 1)
+                response = await self._ahttpx_get_with_retries(
+                    url, headers=self._headers(), params=next_params or {}
+                )
+                if response is None:
+                    print(f"[Metaculus] Failed to fetch comments page: {url}")
+                    break
+                data = response.json()
+                if isinstance(data, dict) and "results" in data:
+                    all_items.extend(
+                        [self._parse_metaculus_comment(i) for i in data["results"]]
+                    )
+                    url = data.get("next")
+                else:
+                    all_items.extend(
+                        [self._parse_metaculus_comment(item) for item in data]
+                    )
+                    url = None
+                if url:
+                    url = self._normalize_next_url(url)
+                    next_params = None
+            except Exception as e:
+                print(f"[Metaculus] Error fetching comments: {e}")
+                break
+        return all_items
+
+    async def alist_metaculus_comments_for_question(
+        self,
+        question_id: int,
+        params: Optional[Mapping[str, Union[str, int, float, bool, None]]] = None,
+    ) -> list:
+        """Async version of list_metaculus_comments_for_question."""
+        q = await self.aget_question(str(question_id))
+        params_dict = self._comments_params_for_question(q, question_id, params)
+        if params_dict is None:
+            return []
+        return await self.alist_metaculus_comments(params=params_dict)
+
     def _parse_date(self, s):
         if not s:
             return None
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: buckets are only shared within a process
+    fcntl = None  # type: ignore
+
+# Directory for file-locked buckets shared by every process on the machine
+RATE_LIMIT_DIR_ENV = "CAFE_RATE_LIMIT_DIR"
+
+
+def retry_after_seconds(response) -> Optional[float]:
+    """Seconds requested by a Retry-After header (delta or HTTP date), if any."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter: `rate` requests per second on average, with
+    bursts of up to `burst` requests. acquire() blocks and aacquire() awaits
+    until a token is free; penalize() empties the bucket for a while, e.g.
+    for a Retry-After header, so every caller backs off together.
+
+    With lock_path the bucket state lives in that file and is updated under
+    an fcntl lock, so all processes using the same file share one quota.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, lock_path: Optional[str] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        if lock_path is not None and fcntl is None:
+            print("[RateLimit] fcntl unavailable; limiting within this process only.")
+            lock_path = None
+        self.lock_path = lock_path
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = self._now()
+
+    def _now(self) -> float:
+        # Wall-clock time is comparable between processes; monotonic is not
+        return time.time() if self.lock_path else time.monotonic()
+
+    def _load(self, handle) -> Tuple[float, float]:
+        handle.seek(0)
+        try:
+            state = json.loads(handle.read() or "{}")
+            return float(state["tokens"]), float(state["updated"])
+        except (KeyError, TypeError, ValueError):
+            return float(self.burst), self._now()
+
+    def _store(self, handle, tokens: float, updated: float) -> None:
+        handle.seek(0)
+        handle.truncate()
+        handle.write(json.dumps({"tokens": tokens, "updated": updated}))
+        handle.flush()
+
+    def _update(self, tokens: float, penalty: float = 0.0) -> float:
+        """
+        Refill, then take `tokens` if available (or apply a penalty).
+        Returns 0.0 when the tokens were taken, else seconds to wait.
+        """
+        with self._lock:
+            if self.lock_path is None:
+                wait, self._tokens, self._updated = self._step(
+                    self._tokens, self._updated, tokens, penalty
+                )
+                return wait
+            with open(self.lock_path, "a+") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    wait, level, updated = self._step(
+                        *self._load(handle), tokens, penalty
+                    )
+                    self._store(handle, level, updated)
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+                return wait
+
+    def _step(
+        self, level: float, updated: float, tokens: float, penalty: float
+    ) -> Tuple[float, float, float]:
+        now = self._now()
+        level = min(float(self.burst), level + max(0.0, now - updated) * self.rate)
+        if penalty > 0:
+            # Debt worth `penalty` seconds of refill: nobody gets a token sooner
+            level = min(level, 0.0) - penalty * self.rate
+            return 0.0, level, now
+        if level >= tokens:
+            return 0.0, level - tokens, now
+        return (tokens - level) / self.rate, level, now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens without blocking; returns 0.0 on success, else the wait."""
+        return self._update(tokens)
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        while True:
+            wait = self._update(tokens)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: float = 1.0) -> None:
+        while True:
+            wait = self._update(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def penalize(self, seconds: float) -> None:
+        """Hold back all callers for at least `seconds` (e.g. Retry-After)."""
+        if seconds > 0:
+            self._update(0.0, penalty=seconds)
+
+
+_registry: Dict[str, TokenBucket] = {}
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, rate: float, burst: int = 1) -> TokenBucket:
+    """
+    Process-wide bucket for a named quota (e.g. "google_search"), created on
+    first use. When CAFE_RATE_LIMIT_DIR is set, the bucket is shared with
+    other processes through <dir>/<name>.bucket.
+    """
+    with _registry_lock:
+        bucket = _registry.get(name)
+        if bucket is None:
+            directory = os.getenv(RATE_LIMIT_DIR_ENV)
+            lock_path = None
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+                lock_path = os.path.join(directory, f"{name}.bucket")
+            bucket = TokenBucket(rate, burst, lock_path=lock_path)
+            _registry[name] = bucket
+        return bucket
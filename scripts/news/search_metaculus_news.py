@@ -3,17 +3,14 @@ import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from cafe.news.cache import CachedNewsFetcher, NewsSearchCache
 from cafe.news.google import GoogleNewsFetcher
 
-def process_all_questions_with_comments(json_path, days=7, output_path="metaculus_news_results.json", cache_path="metaculus_news_cache.json"):
-    import os
+def process_all_questions_with_comments(json_path, days=7, output_path="metaculus_news_results.json", cache_path="metaculus_news_cache.db", bucket_days=7):
     from tqdm import tqdm
-    # Load cache if exists
-    if os.path.exists(cache_path):
-        with open(cache_path, "r") as f:
-            cache = json.load(f)
-    else:
-        cache = {}
+    # Searches are cached by normalized title and bucketed date window, so
+    # comments on the same question within one bucket share a single search
+    cache = NewsSearchCache(cache_path, bucket_days=bucket_days)
 
     with open(json_path, "r") as f:
         data = json.load(f)
@@ -25,7 +22,7 @@ def process_all_questions_with_comments(json_path, days=7, output_path="metaculu
     else:
         raise ValueError("Unrecognized questions structure in JSON.")
 
-    fetcher = GoogleNewsFetcher()
+    fetcher = CachedNewsFetcher(GoogleNewsFetcher(), cache)
     results = []
     for question in tqdm(questions_iter, desc="Questions"):
         qid = str(question.get("id"))
@@ -38,26 +35,14 @@ def process_all_questions_with_comments(json_path, days=7, output_path="metaculu
                 created_at = comment.get("created_at")
                 if not (title and created_at):
                     continue
-                cache_key = f"{qid}:{comment_id}"
-                if cache_key in cache:
-                    news_results = cache[cache_key]
-                    print(f"[CACHE] Hit for QID {qid} | Comment {comment_id}")
-                else:
-                    end_date = datetime.fromisoformat(created_at.replace("Z", ""))
-                    start_date = end_date - timedelta(days=days)
-                    print(f"[INFO] Searching news for QID {qid} | Comment {comment_id} | Title: {title}")
-                    news_results = fetcher.fetch_news(
-                        query=title,
-                        start_date=str(start_date.date()),
-                        end_date=str(end_date.date()),
-                        max_results=5,
-                    )
-                    cache[cache_key] = news_results
-                    # Write cache after each new fetch
-                    with open(cache_path, "w") as cf:
-                        json.dump(cache, cf)
-                    import time
-                    time.sleep(0.7)  # Google API rate limit: 100 requests/minute
+                end_date = datetime.fromisoformat(created_at.replace("Z", ""))
+                start_date = end_date - timedelta(days=days)
+                news_results = fetcher.fetch_news(
+                    query=title,
+                    start_date=str(start_date.date()),
+                    end_date=str(end_date.date()),
+                    max_results=5,
+                )
                 results.append({
                     "question_id": qid,
                     "comment_id": comment_id,
@@ -65,6 +50,7 @@ def process_all_questions_with_comments(json_path, days=7, output_path="metaculu
                     "created_at": created_at,
                     "news_results": news_results,
                 })
+    print(f"[INFO] News searches: {fetcher.misses} fetched, {fetcher.hits} from cache")
     print(f"[INFO] Saving all news results to {output_path}")
     with open(output_path, "w") as f:
         json.dump(results, f, indent=2)
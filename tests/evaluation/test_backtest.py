@@ -0,0 +1,116 @@
+from cafe.evaluation.backtest import Backtester, PointInTimeStore
+from cafe.forecast.pipelines.base import ForecastPipeline, PipelineComponent
+
+DAY = 86400.0
+
+
+def make_question(qid, resolution, resolve_day=10):
+    history = [
+        {"start_time": d * DAY, "end_time": (d + 1) * DAY, "centers": [0.1 * d]}
+        for d in range(1, 6)
+    ]
+    return {
+        "id": qid,
+        "question": {
+            "title": f"Question {qid}",
+            "open_time": DAY,
+            "actual_resolve_time": resolve_day * DAY,
+            "resolution": resolution,
+            "aggregations": {"recency_weighted": {"history": history}},
+        },
+    }
+
+
+COMMENTS = {
+    "1": [
+        {"id": 2, "created_at": 3.5 * DAY, "text": "later"},
+        {"id": 1, "created_at": 1.5 * DAY, "text": "early"},
+    ]
+}
+
+
+def test_store_reconstructs_state_without_lookahead():
+    store = PointInTimeStore([make_question(1, "yes")], COMMENTS)
+    states = list(store.states("1", [0.5 * DAY, 2.5 * DAY, 4.0 * DAY, 20 * DAY]))
+    # Before opening and after resolution the question is not available
+    assert [s.cutoff for s in states] == [2.5 * DAY, 4.0 * DAY]
+    early, later = states
+    assert early.community_prediction == 0.2
+    assert early.history_times.tolist() == [DAY, 2 * DAY]
+    assert [c["id"] for c in early.comments] == [1]
+    assert later.community_prediction == 0.4
+    assert [c["id"] for c in later.comments] == [1, 2]
+    context = later.to_context()
+    assert "resolution" not in context
+    assert context["question"].raw == {}
+    assert store.resolution("1") == 1.0
+
+
+class CommunityComponent(PipelineComponent):
+    def run(self, context):
+        if context["question"].id == "3":
+            raise RuntimeError("model failed")
+        context["probability"] = context["community_prediction"]
+        return context
+
+
+def test_backtester_runs_and_scores():
+    store = PointInTimeStore(
+        [make_question(1, "yes"), make_question(2, "no"), make_question(3, "yes")],
+        COMMENTS,
+    )
+    component = CommunityComponent()
+    backtester = Backtester(store, ForecastPipeline([component]), max_workers=4)
+    cutoffs = [2.5 * DAY, 4.5 * DAY]
+    result = backtester.run(cutoffs)
+    predictions = result["predictions"]
+    assert [(p["qid"], p["cutoff"]) for p in predictions] == [
+        (q, c) for q in ("1", "2", "3") for c in cutoffs
+    ]
+    assert predictions[0]["probability"] == 0.2
+    assert "model failed" in predictions[-1]["error"]
+    # Only the successful questions are scored
+    expected = ((1 - 0.2) ** 2 + (1 - 0.4) ** 2 + 0.2**2 + 0.4**2) / 4
+    assert abs(result["metrics"]["brier"] - expected) < 1e-12
+    assert set(result["by_cutoff"]) == set(cutoffs)
+
+
+def test_unresolved_questions_and_empty_centers_are_skipped():
+    unresolved = make_question(4, None)
+    history = unresolved["question"]["aggregations"]["recency_weighted"]["history"]
+    history[1]["centers"] = []
+    store = PointInTimeStore([make_question(1, "yes"), unresolved], {})
+    assert store.resolution("4") is None
+    backtester = Backtester(store, ForecastPipeline([CommunityComponent()]))
+    result = backtester.run([2.5 * DAY])
+    assert [p["qid"] for p in result["predictions"]] == ["1", "4"]
+    assert result["predictions"][1]["resolution"] is None
+    # Only question 1 has a resolution to score against
+    assert result["metrics"]["brier"] == (1 - 0.2) ** 2
+
+
+def test_empty_centers_and_null_aggregations_are_ignored():
+    question = make_question(1, "yes")
+    history = question["question"]["aggregations"]["recency_weighted"]["history"]
+    history[1]["centers"] = []
+    null_history = {
+        "id": 2,
+        "community_prediction": None,
+        "question": {"open_time": DAY, "resolution": "no", "aggregations": None},
+    }
+    store = PointInTimeStore([question, null_history], {})
+    backtester = Backtester(store, ForecastPipeline([CommunityComponent()]))
+    result = backtester.run([2.5 * DAY])
+    # The snapshot without a center is skipped: day 1's value is still current
+    assert result["predictions"][0]["probability"] == 0.1
+    assert result["predictions"][1]["probability"] is None
+    assert result["metrics"]["brier"] == (1 - 0.1) ** 2
+
+
+def test_score_skips_non_finite_probabilities():
+    backtester = Backtester(PointInTimeStore([]), ForecastPipeline([]))
+    records = [
+        {"cutoff": 1.0, "probability": float("nan"), "resolution": 1.0},
+        {"cutoff": 1.0, "probability": 0.25, "resolution": 0.0},
+    ]
+    assert backtester.score(records)["metrics"]["brier"] == 0.25**2
@@ -0,0 +1,75 @@
+import numpy as np
+
+from cafe.evaluation import bootstrap
+from cafe.evaluation.bootstrap import bootstrap_ci, paired_bootstrap
+from cafe.evaluation.evaluator import DefaultEvaluator, Evaluator
+from cafe.evaluation.metrics import brier_score, pointwise_brier
+from cafe.experiments.experiment_tracker import ExperimentTracker
+
+
+def make_forecasts(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    truth = rng.uniform(size=n)
+    y_true = (rng.uniform(size=n) < truth).astype(float)
+    good = np.clip(truth + rng.normal(scale=0.05, size=n), 0.01, 0.99)
+    bad = np.full(n, 0.5)
+    return y_true, good, bad
+
+
+def test_bootstrap_ci_is_deterministic_and_covers_estimate():
+    y_true, good, _ = make_forecasts()
+    losses = pointwise_brier(y_true, good)
+    first = bootstrap_ci(losses, n_resamples=500, seed=1, processes=1)
+    again = bootstrap_ci(losses, n_resamples=500, seed=1, processes=1)
+    assert first == again
+    assert first["lower"] < first["estimate"] < first["upper"]
+    assert abs(first["estimate"] - brier_score(y_true, good)) < 1e-12
+
+
+def test_results_do_not_depend_on_workers(monkeypatch):
+    monkeypatch.setattr(bootstrap, "CHUNK_SIZE", 50)
+    y_true, good, _ = make_forecasts(n=100)
+    losses = pointwise_brier(y_true, good)
+    inline = bootstrap_ci(losses, n_resamples=200, seed=3, processes=1)
+    pooled = bootstrap_ci(losses, n_resamples=200, seed=3, processes=2)
+    assert inline == pooled
+
+
+def test_paired_bootstrap_detects_better_model():
+    y_true, good, bad = make_forecasts()
+    result = paired_bootstrap(
+        pointwise_brier(y_true, good), pointwise_brier(y_true, bad), seed=0
+    )
+    assert result["upper"] < 0
+    assert result["p_value"] < 0.05
+
+
+def test_evaluator_ci_and_compare_cover_generic_metrics():
+    y_true, good, bad = make_forecasts(n=200)
+
+    def max_error(y_true, y_prob):
+        return float(np.max(np.abs(y_true - y_prob)))
+
+    evaluator = Evaluator({"brier": brier_score, "max_error": max_error})
+    intervals = evaluator.evaluate_with_ci(y_true, good, n_resamples=100, processes=1)
+    assert set(intervals) == {"brier", "max_error"}
+    assert intervals["max_error"]["lower"] <= intervals["max_error"]["upper"]
+
+    diff = DefaultEvaluator.compare(
+        y_true, good, bad, y_pred_a=good > 0.5, y_pred_b=bad > 0.5, n_resamples=200
+    )
+    assert set(diff) == {"brier", "log_loss", "accuracy"}
+    assert diff["brier"]["estimate"] < 0
+
+
+def test_tracker_logs_intervals():
+    y_true, good, _ = make_forecasts(n=100)
+    intervals = DefaultEvaluator.evaluate_with_ci(y_true, good, n_resamples=50)
+    tracker = ExperimentTracker()
+    tracker.log_run(
+        model="m",
+        parameters={},
+        metrics={k: v["estimate"] for k, v in intervals.items()},
+        intervals=intervals,
+    )
+    assert tracker.list_runs()[0]["intervals"]["brier"] == intervals["brier"]
@@ -1,6 +1,16 @@
+import numpy as np
 import pytest
 
-from cafe.evaluation.metrics import accuracy, brier_score, log_loss
+from cafe.evaluation import metrics
+from cafe.evaluation.evaluator import Evaluator
+from cafe.evaluation.metrics import (
+    accuracy,
+    brier_decomposition,
+    brier_score,
+    calibration_curve,
+    crps_cdf,
+    log_loss,
+)
 
 
 def test_brier_score():
@@ -19,3 +29,53 @@ def test_accuracy():
     y_true = [1, 0, 1]
     y_pred = [1, 0, 0]
     assert accuracy(y_true, y_pred) == 2 / 3
+
+
+def test_metrics_accept_arrays_without_copying():
+    y_prob = np.array([0.8, 0.2, 0.6])
+    assert np.shares_memory(metrics._as_float(y_prob), y_prob)
+    assert abs(brier_score(np.array([1.0, 0.0, 1.0]), y_prob) - 0.08) < 1e-6
+
+
+def test_calibration_and_decomposition():
+    y_true = np.array([0, 0, 1, 1, 1, 0])
+    y_prob = np.array([0.1, 0.1, 0.9, 0.9, 0.9, 0.9])
+    curve = calibration_curve(y_true, y_prob, n_bins=10)
+    assert curve["count"][1] == 2 and curve["count"][9] == 4
+    assert curve["frac_true"][9] == 0.75
+    assert np.isnan(curve["mean_prob"][5])
+    parts = brier_decomposition(y_true, y_prob, n_bins=10)
+    # Exact when each bin holds a single probability value
+    assert (
+        abs(
+            parts["reliability"]
+            - parts["resolution"]
+            + parts["uncertainty"]
+            - brier_score(y_true, y_prob)
+        )
+        < 1e-12
+    )
+
+
+def test_crps_cdf():
+    grid = np.linspace(0, 10, 1001)
+    perfect = (grid >= 4).astype(float)
+    assert crps_cdf(perfect, grid, [4.0]) < 1e-2
+    uniform = grid / 10
+    # CRPS of U(0, 10) at its midpoint is 10/12
+    assert abs(crps_cdf(uniform, grid, [5.0]) - 10 / 12) < 1e-3
+    both = metrics.pointwise_crps_cdf(np.vstack([perfect, uniform]), grid, [4.0, 5.0])
+    assert both.shape == (2,)
+
+
+def test_evaluator_generic_and_grouped():
+    evaluator = Evaluator({"brier": brier_score, "accuracy": accuracy})
+    y_true = [1, 0, 1, 0]
+    y_prob = [0.9, 0.1, 0.4, 0.6]
+    assert evaluator.evaluate(y_true, y_prob) == {"brier": brier_score(y_true, y_prob)}
+    grouped = evaluator.evaluate_grouped(
+        y_true, y_prob, ["a", "b", "a", "b"], y_pred=[1, 0, 0, 1]
+    )
+    assert set(grouped) == {"a", "b"}
+    assert grouped["a"]["accuracy"] == 0.5
+    assert abs(grouped["b"]["brier"] - (0.01 + 0.36) / 2) < 1e-12
@@ -0,0 +1,62 @@
+import numpy as np
+
+from cafe.evaluation.metrics import brier_decomposition, brier_score, log_loss
+from cafe.evaluation.streaming import StreamingMetrics, time_buckets
+
+
+def make_forecasts(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    y_prob = rng.uniform(size=n)
+    y_true = (rng.uniform(size=n) < y_prob).astype(float)
+    models = np.where(np.arange(n) % 3 == 0, "gemini", "vllm")
+    return y_true, y_prob, models
+
+
+def test_streaming_matches_batch_metrics():
+    y_true, y_prob, _ = make_forecasts()
+    acc = StreamingMetrics()
+    for start in range(0, len(y_true), 128):
+        acc.update(y_true[start : start + 128], y_prob[start : start + 128])
+    result = acc.result()
+    assert result["count"] == len(y_true)
+    assert abs(result["brier"] - brier_score(y_true, y_prob)) < 1e-12
+    assert abs(result["log_loss"] - log_loss(y_true, y_prob)) < 1e-12
+    expected = brier_decomposition(y_true, y_prob)
+    for key in ("reliability", "resolution", "uncertainty"):
+        assert abs(result[key] - expected[key]) < 1e-12
+
+
+def test_grouped_in_one_pass_and_merge():
+    y_true, y_prob, models = make_forecasts()
+    buckets = time_buckets(np.arange(len(y_true)) * 3600.0, 86400)
+    crps = np.abs(y_true - y_prob)
+    first, second = StreamingMetrics(), StreamingMetrics()
+    first.update(
+        y_true[:500],
+        y_prob[:500],
+        groups={"model": models[:500], "day": buckets[:500]},
+        losses={"crps": crps[:500]},
+    )
+    second.update(
+        y_true[500:],
+        y_prob[500:],
+        groups={"model": models[500:], "day": buckets[500:]},
+        losses={"crps": crps[500:]},
+    )
+    grouped = first.merge(second).grouped()
+    assert set(grouped) == {"model", "day"}
+    mask = models == "gemini"
+    gemini = grouped["model"]["gemini"]
+    assert gemini["count"] == mask.sum()
+    assert abs(gemini["brier"] - brier_score(y_true[mask], y_prob[mask])) < 1e-12
+    assert abs(gemini["crps"] - crps[mask].mean()) < 1e-12
+    assert len(grouped["day"]) == int(np.ceil(len(y_true) / 24))
+
+
+def test_out_of_range_probabilities_are_clipped():
+    acc = StreamingMetrics(n_bins=4)
+    acc.update([0.0, 1.0, 1.0], [-0.2, 1.3, 0.6])
+    result = acc.result()
+    assert result["count"] == 3
+    # -0.2 is clipped into the first bin and 1.3 into the last
+    assert result["calibration"]["count"].tolist() == [1.0, 0.0, 1.0, 1.0]
@@ -1,3 +1,7 @@
+import threading
+
+import pytest
+
 from cafe.experiments.experiment_tracker import ExperimentTracker
 
 
@@ -13,3 +17,71 @@ def test_experiment_tracker():
     assert len(runs) == 1
     assert runs[0]["run_id"] == run_id
     assert runs[0]["model"] == "test-model"
+
+
+def test_runs_persist_with_artifacts(tmp_path):
+    db_path = str(tmp_path / "runs.sqlite")
+    tracker = ExperimentTracker(db_path)
+    run_id = tracker.log_run(
+        model="m",
+        parameters={"temperature": 0.2},
+        metrics={"brier": 0.1},
+        artifacts={"predictions": "file:///tmp/preds.jsonl"},
+    )
+    tracker.log_artifact(run_id, "plot", "file:///tmp/calibration.png")
+    tracker.close()
+
+    reopened = ExperimentTracker(db_path)
+    run = reopened.get_run(run_id)
+    assert run["parameters"] == {"temperature": 0.2}
+    assert run["artifacts"] == {
+        "predictions": "file:///tmp/preds.jsonl",
+        "plot": "file:///tmp/calibration.png",
+    }
+    assert reopened.has_config("m", {"temperature": 0.2})
+    assert not reopened.has_config("m", {"temperature": 0.3})
+
+
+def test_query_runs_and_leaderboard():
+    tracker = ExperimentTracker()
+    for i, model in enumerate(["gemini", "vllm", "gemini", "vllm"]):
+        tracker.log_run(
+            model=model,
+            parameters={"temperature": i / 10, "prompt": "v1" if i < 2 else "v2"},
+            metrics={"brier": 0.3 - i * 0.05, "log_loss": 0.6},
+        )
+    assert len(tracker.query_runs(model="gemini")) == 2
+    assert [
+        r["parameters"]["temperature"]
+        for r in tracker.query_runs(parameters={"prompt": "v2"})
+    ] == [0.2, 0.3]
+    assert len(tracker.query_runs(max_metrics={"brier": 0.2})) == 2
+    assert len(tracker.query_runs(min_metrics={"brier": 0.2}, model="vllm")) == 1
+    assert tracker.query_runs(since="2999-01-01") == []
+    best = tracker.leaderboard("brier", limit=2)
+    assert [r["metrics"]["brier"] for r in best] == [
+        pytest.approx(0.15),
+        pytest.approx(0.2),
+    ]
+    assert (
+        tracker.leaderboard("brier", model="gemini")[0]["parameters"]["temperature"]
+        == 0.2
+    )
+
+
+def test_concurrent_writers_share_one_file(tmp_path):
+    db_path = str(tmp_path / "runs.sqlite")
+    trackers = [ExperimentTracker(db_path) for _ in range(4)]
+
+    def log_many(tracker, worker):
+        for i in range(25):
+            tracker.log_run("m", {"worker": worker, "i": i}, {"brier": 0.1})
+
+    threads = [
+        threading.Thread(target=log_many, args=(t, w)) for w, t in enumerate(trackers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(ExperimentTracker(db_path).list_runs()) == 100
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from cafe.experiments.experiment_tracker import ExperimentTracker
+from cafe.experiments.sweep import SweepRunner, expand_grid
+
+
+def quadratic(config):
+    if config.get("temperature") == 0.9:
+        raise ValueError("unstable")
+    return {"brier": (config["temperature"] - 0.3) ** 2}
+
+
+async def async_quadratic(config):
+    await asyncio.sleep(0)
+    return quadratic(config)
+
+
+def test_expand_grid():
+    configs = expand_grid({"model": ["a", "b"], "temperature": [0.0, 0.5, 1.0]})
+    assert len(configs) == 6
+    assert configs[0] == {"model": "a", "temperature": 0.0}
+    assert len(expand_grid([{"x": [1]}, {"x": [2, 3]}])) == 3
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_sweep_logs_results_and_resumes(tmp_path, executor):
+    tracker = ExperimentTracker(str(tmp_path / "sweep.sqlite"))
+    configs = expand_grid({"model": ["m"], "temperature": [0.1, 0.3, 0.9]})
+    runner = SweepRunner(tracker, quadratic, executor=executor, max_workers=2)
+    results = runner.run(configs)
+    assert [r["status"] for r in results] == ["done", "done", "failed"]
+    assert "duration_seconds" in results[0]["metrics"]
+    assert tracker.leaderboard("brier")[0]["parameters"] == {"temperature": 0.3}
+
+    # Finished configurations are skipped, failed ones are retried
+    again = runner.run(configs + [{"model": "m", "temperature": 0.5}])
+    assert [r["status"] for r in again] == ["skipped", "skipped", "failed", "done"]
+    assert len(tracker.list_runs()) == 3
+
+
+def test_async_sweep_deduplicates_configs():
+    tracker = ExperimentTracker()
+    runner = SweepRunner(
+        tracker, async_quadratic, executor="async", max_workers=4, model="api"
+    )
+    configs = [{"temperature": 0.1}, {"temperature": 0.1}, {"temperature": 0.2}]
+    results = runner.run(configs)
+    assert [r["status"] for r in results] == ["done", "skipped", "done"]
+    assert {r["model"] for r in tracker.list_runs()} == {"api"}
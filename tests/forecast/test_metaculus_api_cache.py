@@ -109,14 +109,14 @@ def test_questions_cache(tmp_path, monkeypatch):
             self.url = d["url"]
             self.tags = d["tags"]
 
-    def fake_api_list_questions(self):
+    async def fake_api_list_questions(self):
         return [FakeQ(q) for q in SAMPLE_QUESTIONS[::-1]]  # reverse order
 
     from cafe.sources.source_metaculus import MetaculusForecastSource
 
     monkeypatch.setattr(
         MetaculusForecastSource,
-        "list_questions",
+        "alist_questions",
         fake_api_list_questions,
     )
     resp = client.get(
@@ -160,12 +160,12 @@ def test_comments_cache(tmp_path, monkeypatch):
             )
             self.vote_score = d["vote_score"]
 
-    def fake_api_list_comments(self, qid):
+    async def fake_api_list_comments(self, qid):
         return [FakeC(c) for c in SAMPLE_COMMENTS[::-1]]
 
     monkeypatch.setattr(
         MetaculusForecastSource,
-        "list_metaculus_comments_for_question",
+        "alist_metaculus_comments_for_question",
         fake_api_list_comments,
     )
     # Always use a temporary comments_cache_path so we never pollute real data
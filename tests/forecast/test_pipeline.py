@@ -1,8 +1,18 @@
+import asyncio
+import time
+
 import pytest
 
-from cafe.forecast.pipelines.base import ForecastPipeline, PipelineComponent
+from cafe.context.sqlite import SQLiteContext
+from cafe.forecast.pipelines.base import (
+    DAGForecastPipeline,
+    ForecastPipeline,
+    PipelineComponent,
+)
 from cafe.forecast.pipelines.llm_component import LLMForecastComponent
 from cafe.forecast.pipelines.news_component import NewsSearchComponent
+from cafe.news.cache import CachedNewsFetcher, NewsSearchCache
+from cafe.news.local import NewsLocalRetriever
 from cafe.sources.question import MetaculusForecastQuestion
 
 
@@ -32,3 +42,288 @@ def test_llm_and_news_pipeline():
     assert "news" in result
     assert result["news"] == ["News about Test Q"]
     assert result["llm_response"].startswith("LLM answer to: ")
+
+
+class SleepyComponent(PipelineComponent):
+    def __init__(self, inputs, outputs, delay=0.2):
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.delay = delay
+
+    def run(self, context):
+        time.sleep(self.delay)
+        for key in self.outputs:
+            context[key] = [context.get(k) for k in self.inputs]
+        # Undeclared writes are not merged back
+        context["scratch"] = True
+        return context
+
+    def describe(self):
+        return "+".join(self.outputs)
+
+
+def test_dag_pipeline_runs_independent_components_concurrently():
+    pipeline = DAGForecastPipeline(
+        [
+            SleepyComponent(["question"], ["news"]),
+            SleepyComponent(["question"], ["draft"]),
+            SleepyComponent(["news", "draft"], ["answer"], delay=0.0),
+        ]
+    )
+    assert pipeline.dependencies == [set(), set(), {0, 1}]
+    start = time.perf_counter()
+    result = pipeline.run({"question": "q"})
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.35
+    assert result["answer"] == [["q"], ["q"]]
+    assert "scratch" not in result
+    assert set(result["component_timings"]) == {"news", "draft", "answer"}
+    assert result["component_timings"]["news"] >= 0.2
+
+
+def test_dag_pipeline_keeps_sequential_semantics_and_async():
+    components = [
+        SleepyComponent(["question"], ["a"], delay=0.0),
+        SleepyComponent(["question"], ["a"], delay=0.0),
+    ]
+    pipeline = DAGForecastPipeline(components)
+    # Both write "a", so the second waits for the first
+    assert pipeline.dependencies == [set(), {0}]
+    result = asyncio.run(pipeline.arun({"question": "q"}))
+    assert result["a"] == ["q"]
+    assert set(result["component_timings"]) == {"a", "a#1"}
+
+
+def test_dag_pipeline_with_builtin_components():
+    pipeline = DAGForecastPipeline(
+        [NewsSearchComponent(DummyNewsAPI()), LLMForecastComponent(DummyLLM())]
+    )
+    assert pipeline.dependencies == [set(), set()]
+    question = MetaculusForecastQuestion(id="1", title="Test Q", description="Desc")
+    result = pipeline.run({"question": question})
+    assert result["news"] == ["News about Test Q"]
+    assert result["llm_response"].startswith("LLM answer to: ")
+
+
+class BatchLLM(DummyLLM):
+    def __init__(self):
+        self.batches = []
+
+    def predict_batch(self, prompts, parameters, context):
+        self.batches.append(len(prompts))
+        return [f"batched {parameters['temperature']}" for _ in prompts]
+
+
+class StrictBatchLLM:
+    """predict_batch with the VLLM/HuggingFace signature (no defaults)."""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, prompt, parameters, context):
+        raise AssertionError("run_batch must not fall back to predict")
+
+    def predict_batch(self, prompts, parameters, context):
+        self.calls.append((len(prompts), parameters, context))
+        return [context.get_data(p) or "fresh" for p in prompts]
+
+
+def test_run_batch_passes_parameters_and_context_without_config():
+    llm = StrictBatchLLM()
+    component = LLMForecastComponent(llm)
+    questions = _questions(["A", "B"])
+    results = component.run_batch(questions)
+    assert [r["llm_response"] for r in results] == ["fresh", "fresh"]
+    ((size, parameters, context),) = llm.calls
+    assert size == 2 and parameters == {}
+    assert hasattr(context, "get_data")
+
+
+class FlakyNewsAPI(DummyNewsAPI):
+    def search(self, query):
+        if query == "bad":
+            raise RuntimeError("search failed")
+        return super().search(query)
+
+
+def _questions(titles):
+    return [
+        {"question": MetaculusForecastQuestion(id=str(i), title=t)}
+        for i, t in enumerate(titles)
+    ]
+
+
+def test_run_many_batches_llm_calls_in_order():
+    llm = BatchLLM()
+    pipeline = ForecastPipeline(
+        [
+            NewsSearchComponent(DummyNewsAPI()),
+            LLMForecastComponent(llm, parameters={"temperature": 0.1}),
+        ]
+    )
+    titles = [f"Q{i}" for i in range(10)]
+    results = list(pipeline.run_many(_questions(titles), batch_size=4))
+    assert [r["question"].title for r in results] == titles
+    assert all(r["llm_response"] == "batched 0.1" for r in results)
+    assert results[3]["news"] == ["News about Q3"]
+    assert llm.batches == [4, 4, 2]
+
+
+def test_run_many_isolates_failures_and_unordered_mode():
+    pipeline = ForecastPipeline(
+        [NewsSearchComponent(FlakyNewsAPI()), LLMForecastComponent(DummyLLM())]
+    )
+    titles = ["a", "bad", "c"]
+    results = list(pipeline.run_many(_questions(titles), batch_size=2, ordered=False))
+    assert sorted(r["question"].title for r in results) == ["a", "bad", "c"]
+    failed = [r for r in results if "pipeline_error" in r]
+    assert len(failed) == 1
+    assert failed[0]["pipeline_error"].startswith("NewsSearchComponent: ")
+    assert "llm_response" not in failed[0]
+    ok = [r for r in results if "pipeline_error" not in r]
+    assert all(r["llm_response"].startswith("LLM answer to: ") for r in ok)
+
+
+def test_run_many_consumes_input_lazily():
+    consumed = []
+
+    def contexts():
+        for i in range(1000):
+            consumed.append(i)
+            yield {"question": MetaculusForecastQuestion(id=str(i), title=str(i))}
+
+    pipeline = ForecastPipeline([NewsSearchComponent(DummyNewsAPI())])
+    stream = pipeline.run_many(contexts(), batch_size=2, queue_size=1)
+    first = next(stream)
+    assert first["news"] == ["News about 0"]
+    time.sleep(0.2)
+    # Bounded queues stop the feeder long before the end of the input
+    assert len(consumed) < 50
+    stream.close()
+
+
+class CountingNewsAPI(DummyNewsAPI):
+    def __init__(self, failing=()):
+        self.queries = []
+        self.failing = set(failing)
+
+    def search(self, query):
+        self.queries.append(query)
+        if query in self.failing:
+            raise RuntimeError("search failed")
+        return super().search(query)
+
+
+class CountingLLM(DummyLLM):
+    def __init__(self):
+        self.prompts = []
+
+    def predict(self, prompt):
+        self.prompts.append(prompt)
+        return super().predict(prompt)
+
+
+class ShortPromptComponent(LLMForecastComponent):
+    def build_prompt(self, question):
+        return f"Probability that {question.title}?"
+
+
+def test_sqlite_context_roundtrip(tmp_path):
+    store = SQLiteContext(str(tmp_path / "context.db"))
+    store.set_data("a:1", {"news": ["x"]})
+    store.set_data("b_1", 2)
+    assert store.get_data("a:1") == {"news": ["x"]}
+    assert store.get_data("missing") is None
+    assert store.keys("a:") == ["a:1"]
+    store.close()
+    assert SQLiteContext(str(tmp_path / "context.db")).get_data("b_1") == 2
+
+
+def test_pipeline_cache_reruns_only_invalidated_stages(tmp_path):
+    cache = SQLiteContext(str(tmp_path / "cache.db"))
+    news_api, llm = CountingNewsAPI(), CountingLLM()
+    question = MetaculusForecastQuestion(id="1", title="Test Q", description="Desc")
+    first = ForecastPipeline(
+        [NewsSearchComponent(news_api), LLMForecastComponent(llm)], cache=cache
+    ).run({"question": question})
+    # Changing only the prompt re-runs the LLM stage but not the news search
+    second = ForecastPipeline(
+        [NewsSearchComponent(news_api), ShortPromptComponent(llm)], cache=cache
+    ).run({"question": question})
+    assert news_api.queries == ["Test Q"]
+    assert len(llm.prompts) == 2
+    assert second["news"] == first["news"]
+    assert second["llm_response"].startswith("LLM answer to: Probability")
+    # A changed question invalidates both stages
+    other = MetaculusForecastQuestion(id="2", title="Other Q")
+    ForecastPipeline(
+        [NewsSearchComponent(news_api), ShortPromptComponent(llm)], cache=cache
+    ).run({"question": other})
+    assert news_api.queries == ["Test Q", "Other Q"]
+
+
+def test_run_many_resumes_from_checkpoint(tmp_path):
+    checkpoint = SQLiteContext(str(tmp_path / "checkpoint.db"))
+    titles = ["a", "bad", "c", "d"]
+
+    def run(news_api, temperature):
+        llm = LLMForecastComponent(BatchLLM(), parameters={"temperature": temperature})
+        pipeline = ForecastPipeline([NewsSearchComponent(news_api), llm])
+        return list(
+            pipeline.run_many(_questions(titles), batch_size=2, checkpoint=checkpoint)
+        )
+
+    results = run(CountingNewsAPI(failing=["bad"]), 0.1)
+    assert "pipeline_error" in results[1]
+    # Only finished questions are saved; the failed one runs again
+    news_api = CountingNewsAPI()
+    results = run(news_api, 0.1)
+    assert news_api.queries == ["bad"]
+    assert [r["news"] for r in results] == [[f"News about {t}"] for t in titles]
+    # A different model config does not reuse those checkpoints
+    news_api = CountingNewsAPI()
+    results = run(news_api, 0.2)
+    assert news_api.queries == titles
+    assert all(r["llm_response"] == "batched 0.2" for r in results)
+
+
+class CutoffComponent(PipelineComponent):
+    def __init__(self):
+        self.calls = 0
+
+    def run(self, context):
+        self.calls += 1
+        context["probability"] = context["cutoff"]
+        return context
+
+
+def test_checkpoint_key_covers_the_input_context(tmp_path):
+    checkpoint = SQLiteContext(str(tmp_path / "checkpoint.db"))
+    question = MetaculusForecastQuestion(id="1", title="a")
+    component = CutoffComponent()
+    pipeline = ForecastPipeline([component])
+
+    def run(cutoff):
+        contexts = [{"question": question, "cutoff": cutoff}]
+        return list(pipeline.run_many(contexts, checkpoint=checkpoint))
+
+    assert run(1)[0]["probability"] == 1
+    # Same question with a new cutoff is not restored from the old checkpoint
+    assert run(2)[0]["probability"] == 2
+    assert component.calls == 2
+    assert run(2)[0]["probability"] == 2
+    assert component.calls == 2
+
+
+def test_news_cache_config_identifies_the_backend(tmp_path):
+    def config(news_api):
+        return NewsSearchComponent(news_api).cache_config()
+
+    first = NewsLocalRetriever(str(tmp_path / "first.db"))
+    second = NewsLocalRetriever(str(tmp_path / "second.db"))
+    assert config(first) != config(second)
+    assert config(first) == config(NewsLocalRetriever(str(tmp_path / "first.db")))
+    # Wrapped fetchers are described too
+    cached = CachedNewsFetcher(first, NewsSearchCache())
+    assert config(cached) != config(CachedNewsFetcher(second, NewsSearchCache()))
+    assert config(cached)["news_api"]["fetcher"]["db_path"] == first.db_path
@@ -0,0 +1,84 @@
+import math
+
+import numpy as np
+import pytest
+
+from cafe.forecast.pipelines.base import ForecastPipeline
+from cafe.forecast.pipelines.timeseries_component import TimeSeriesForecastComponent
+from cafe.models.timeseries.local import TimeSeriesLocalModel
+from cafe.sources.processing.metaculus import link_comments_to_forecasts
+from cafe.sources.processing.timeseries import (
+    history_arrays,
+    parse_frequency,
+    resample_history,
+)
+
+DAY = 86400.0
+
+
+def make_question(qid, points):
+    history = [
+        {"start_time": t - DAY, "end_time": t, "centers": [v]} for t, v in points
+    ]
+    return {
+        "id": qid,
+        "question": {"aggregations": {"recency_weighted": {"history": history}}},
+    }
+
+
+def test_parse_frequency():
+    assert parse_frequency("1D") == DAY
+    assert parse_frequency("6h") == 6 * 3600
+    assert parse_frequency("30min") == 1800
+    assert parse_frequency(60) == 60.0
+    with pytest.raises(ValueError):
+        parse_frequency("fortnightly")
+
+
+def test_history_arrays_reads_linked_output():
+    linked = link_comments_to_forecasts(
+        [make_question(1, [(2 * DAY, 0.3), (DAY, 0.2)])], {}
+    )
+    times, values = history_arrays(linked["1"])
+    assert times.tolist() == [DAY, 2 * DAY]
+    assert values.tolist() == [0.2, 0.3]
+
+
+def test_resample_gap_modes():
+    times = np.array([0.0, 1.5 * DAY, 5 * DAY])
+    values = np.array([0.1, 0.2, 0.5])
+    grid, ffill = resample_history(times, values, "1D", "ffill")
+    assert grid.tolist() == [i * DAY for i in range(6)]
+    assert ffill.tolist() == [0.1, 0.1, 0.2, 0.2, 0.2, 0.5]
+
+    _, limited = resample_history(times, values, "1D", "ffill", max_gap="2D")
+    assert math.isnan(limited[4]) and limited[3] == 0.2
+
+    _, sparse = resample_history(times, values, "1D", "nan")
+    assert np.isnan(sparse).tolist() == [False, True, False, True, True, False]
+
+    _, linear = resample_history(times, values, "1D", "linear")
+    np.testing.assert_allclose(linear[:2], [0.1, 0.1 + 0.1 / 1.5])
+
+    with pytest.raises(ValueError):
+        resample_history(times, values, "1D", "cubic")
+
+
+def test_component_builds_forecast_tables():
+    questions = [
+        make_question(1, [(i * DAY, 0.1 * i) for i in range(1, 6)]),
+        make_question(2, [(DAY, 0.5)]),
+    ]
+    linked = link_comments_to_forecasts(questions, {})
+    component = TimeSeriesForecastComponent(
+        TimeSeriesLocalModel(),
+        parameters={"method": "last_value", "steps": 2},
+        freq="1D",
+    )
+    result = ForecastPipeline([component]).run({"linked_series": linked})
+    table = result["forecast_table"]
+    assert list(table) == ["1", "2"]
+    np.testing.assert_allclose(table["1"]["forecast"], [0.5, 0.5])
+    assert table["1"]["last_observed"] == 5 * DAY
+    assert table["1"]["timestamps"] == [6 * DAY, 7 * DAY]
+    assert "error" in table["2"]
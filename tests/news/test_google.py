@@ -1,9 +1,13 @@
+import asyncio
 import os
 from datetime import datetime, timedelta
 
+import httpx
 import pytest
 
+from cafe.news.cache import ArticleCache
 from cafe.news.google import GoogleNewsFetcher
+from cafe.utils.rate_limit import TokenBucket
 
 
 @pytest.mark.integration
@@ -25,3 +29,118 @@ def test_google_news_fetcher_basic():
     assert "link" in first
     assert "title" in first
     assert "snippet" in first
+
+
+def _fetcher(handler, **kwargs):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    fetcher = GoogleNewsFetcher(
+        api_key="key",
+        search_engine_id="cx",
+        async_client=client,
+        rate_limiter=TokenBucket(rate=1000, burst=100),
+        **kwargs,
+    )
+    fetcher.INITIAL_DELAY = 0.0
+    return fetcher
+
+
+def test_afetch_news_pages_concurrently_and_retries():
+    calls = []
+    active = {"now": 0, "max": 0}
+
+    async def handler(request):
+        start = int(request.url.params["start"])
+        calls.append(start)
+        if start == 11 and calls.count(11) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.05)
+        active["now"] -= 1
+        items = [] if start > 21 else [{"link": f"https://n/{start}", "title": "t"}]
+        return httpx.Response(200, json={"items": items})
+
+    fetcher = _fetcher(handler, max_concurrency=2)
+    results = asyncio.run(fetcher.afetch_news("q", "2024-01-01", "2024-01-08", 50))
+    # Page 11 was retried after the 429; the empty page 31 ends the results
+    assert [r["link"] for r in results] == [
+        "https://n/1",
+        "https://n/11",
+        "https://n/21",
+    ]
+    assert calls.count(11) == 2
+    assert active["max"] == 2
+
+
+def _failing_page_handler(request):
+    start = int(request.url.params["start"])
+    if start == 11:
+        return httpx.Response(403, json={"error": "quota"})
+    return httpx.Response(200, json={"items": [{"link": f"https://n/{start}"}]})
+
+
+def test_fetch_news_pages_reports_failed_pages(monkeypatch):
+    real_client = httpx.Client
+
+    def mock_client(**kwargs):
+        return real_client(transport=httpx.MockTransport(_failing_page_handler))
+
+    monkeypatch.setattr(httpx, "Client", mock_client)
+    fetcher = _fetcher(_failing_page_handler)
+    results, complete = fetcher.fetch_news_pages("q", "2024-01-01", "2024-01-08", 30)
+    assert [r["link"] for r in results] == ["https://n/1"]
+    assert complete is False
+    results, complete = fetcher.fetch_news_pages("q", "2024-01-01", "2024-01-08", 10)
+    assert complete is True
+
+    async def handler(request):
+        return _failing_page_handler(request)
+
+    fetcher = _fetcher(handler)
+    results, complete = asyncio.run(
+        fetcher.afetch_news_pages("q", "2024-01-01", "2024-01-08", 30)
+    )
+    assert [r["link"] for r in results] == ["https://n/1"]
+    assert complete is False
+
+
+def test_afetch_summaries_keeps_order_and_falls_back():
+    def handler(request):
+        if request.url.path == "/missing":
+            return httpx.Response(404)
+        html = (
+            "<html><head><title>Title</title>"
+            '<meta name="description" content="Desc"></head></html>'
+        )
+        return httpx.Response(200, text=html)
+
+    fetcher = _fetcher(handler)
+    items = [
+        {"link": "https://a/ok", "snippet": "s1"},
+        {"link": "https://a/missing", "snippet": "s2"},
+    ]
+    assert asyncio.run(fetcher.afetch_summaries(items)) == ["Title - Desc", "s2"]
+
+
+def test_article_cache_revalidates_with_conditional_get():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        html = "<html><head><title>Title</title></head></html>"
+        return httpx.Response(200, text=html, headers={"ETag": '"v1"'})
+
+    cache = ArticleCache(max_age=0.0)
+    fetcher = _fetcher(handler, article_cache=cache)
+    first = asyncio.run(fetcher.aget_full_summary("https://a/1", "snippet"))
+    # Stale entry: revalidated with If-None-Match, served from cache on 304
+    second = asyncio.run(fetcher.aget_full_summary("https://a/1", "other"))
+    assert first == "Title - snippet"
+    assert second == "Title - other"
+    assert [r.headers.get("If-None-Match") for r in requests] == [None, '"v1"']
+    # Fresh entries need no request at all
+    cache.max_age = 3600.0
+    asyncio.run(fetcher.aget_full_summary("https://a/1"))
+    assert len(requests) == 2
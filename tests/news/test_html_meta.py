@@ -0,0 +1,51 @@
+import asyncio
+
+from cafe.news.google import extract_title_description
+from cafe.news.html_meta import aextract_head_meta, extract_head_meta, title_description
+
+HEAD = (
+    b"<html><head><TITLE>Rates &amp; Markets</TITLE>"
+    b'<meta property="og:title" content="OG title">'
+    b'<meta property="og:description" content="OG description">'
+    b"</head>"
+)
+
+
+def _chunks(consumed, size=16):
+    body = HEAD + b"<body>" + b"<p>article</p>" * 100_000 + b"</body></html>"
+    for start in range(0, len(body), size):
+        consumed.append(start)
+        yield body[start : start + size]
+
+
+def test_extract_head_meta_stops_at_head():
+    consumed = []
+    meta = extract_head_meta(_chunks(consumed))
+    assert meta == {
+        "title": "Rates & Markets",
+        "og_title": "OG title",
+        "og_description": "OG description",
+    }
+    # Only the chunks up to </head> were read
+    assert consumed[-1] < len(HEAD)
+    # No meta description: the OpenGraph one is used
+    assert title_description(meta) == ("Rates & Markets", "OG description")
+
+
+def test_extract_head_meta_byte_cap_and_async():
+    consumed = []
+    assert extract_head_meta(_chunks(consumed), max_bytes=10) == {}
+    assert len(consumed) == 1
+
+    async def chunks():
+        yield '<head><meta name="Description" content=" Déjà vu ">'.encode("latin-1")
+        yield b"</head>"
+
+    meta = asyncio.run(aextract_head_meta(chunks(), encoding="latin-1"))
+    assert meta == {"description": "Déjà vu"}
+
+
+def test_extract_title_description_from_html():
+    html = '<html><head><title>Title</title><meta name="description" content="Desc">'
+    assert extract_title_description(html) == ("Title", "Desc")
+    assert extract_title_description("<html><body>No head</body></html>") == ("", None)
@@ -0,0 +1,86 @@
+import json
+import time
+
+from cafe.news.cache import ArticleCache, NewsSearchCache
+from cafe.news.local import NewsLocalRetriever
+
+ARTICLES = [
+    {
+        "link": "https://n/fed",
+        "title": "Fed raises interest rates",
+        "snippet": "The central bank raised rates again.",
+        "published": "2024-01-05",
+    },
+    {
+        "link": "https://n/ecb",
+        "title": "ECB holds rates",
+        "snippet": "Interest rates in Europe unchanged.",
+        "pagemap": {"metatags": [{"article:published_time": "2024-02-01T10:00:00Z"}]},
+    },
+    {
+        "link": "https://n/sport",
+        "title": "Local team wins",
+        "snippet": "A football match.",
+        "published": "2024-01-06",
+    },
+]
+
+
+def test_bm25_ranking_and_date_filter(tmp_path):
+    retriever = NewsLocalRetriever(str(tmp_path / "news.db"))
+    assert retriever.add(ARTICLES) == 3
+    results = retriever.retrieve("Fed interest rates?")["results"]
+    assert [r["link"] for r in results] == ["https://n/fed", "https://n/ecb"]
+    assert results[0]["score"] > results[1]["score"]
+    # Point in time: nothing published after end_date
+    before = retriever.retrieve("interest rates", {"end_date": "2024-01-31"})
+    assert [r["link"] for r in before["results"]] == ["https://n/fed"]
+    assert retriever.query("rates", top_k=1, start_date="2024-01-10")[0]["link"] == (
+        "https://n/ecb"
+    )
+    assert retriever.query("!!!") == []
+
+
+def test_incremental_adds_update_by_link(tmp_path):
+    path = str(tmp_path / "news.db")
+    retriever = NewsLocalRetriever(path)
+    retriever.add(ARTICLES[:1])
+    retriever.add([{**ARTICLES[0], "summary": "Inflation worries persist"}])
+    reopened = NewsLocalRetriever(path)
+    assert len(reopened) == 1
+    assert reopened.search("inflation")[0]["summary"] == "Inflation worries persist"
+    # The old text is no longer indexed twice
+    assert len(reopened.search("fed")) == 1
+
+
+def test_ingest_jsonl_and_search_cache(tmp_path):
+    corpus = tmp_path / "corpus.jsonl"
+    corpus.write_text(
+        "\n".join(json.dumps({**a, "seen": "2024-03-01"}) for a in ARTICLES[1:]) + "\n"
+    )
+    retriever = NewsLocalRetriever()
+    assert retriever.ingest_jsonl(str(corpus), time_key="seen") == 2
+
+    cache = NewsSearchCache()
+    fetched_after = time.time()
+    cache.put(
+        "election",
+        "2024-01-01",
+        "2024-01-08",
+        5,
+        [
+            {"link": "https://n/vote", "title": "Vote"},
+            # Searches are not date-restricted: this one came out months later
+            {"link": "https://n/recount", "title": "Recount", "date": "2024-06-01"},
+        ],
+    )
+    articles = ArticleCache()
+    articles.put("https://n/vote", "Election results", "Turnout was high")
+    assert retriever.ingest_search_cache(cache, articles) == 2
+    hit = retriever.query("turnout")[0]
+    assert hit["summary"] == "Election results - Turnout was high"
+    # Undated result: dated by when the search ran, not by its window
+    assert hit["published"] >= fetched_after
+    assert retriever.query("turnout", end_date="2024-01-08") == []
+    assert retriever.query("recount", end_date="2024-01-08") == []
+    assert retriever.query("recount", end_date="2024-06-01")
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import time
+
+from cafe.news.cache import (
+    ArticleCache,
+    CachedNewsFetcher,
+    NewsSearchCache,
+    bucket_date,
+    normalize_query,
+)
+
+
+class CountingFetcher:
+    def __init__(self, results=None):
+        self.calls = []
+        self.results = results
+
+    def fetch_news(self, query, start_date, end_date, max_results=20):
+        self.calls.append((query, start_date, end_date, max_results))
+        time.sleep(0.05)
+        if self.results is not None:
+            return self.results
+        return [{"link": f"https://n/{i}", "title": query} for i in range(max_results)]
+
+    async def afetch_news(self, query, start_date, end_date, max_results=20):
+        self.calls.append((query, start_date, end_date, max_results))
+        await asyncio.sleep(0.05)
+        return [{"link": "https://n/0", "title": query}]
+
+
+def test_query_normalization_and_bucketing():
+    assert normalize_query("  Will  GPT-5 launch?") == "will gpt 5 launch"
+    # 1970-01-01 starts a bucket; later dates round down within 7-day buckets
+    assert str(bucket_date("2024-01-10", 7)) == "2024-01-04"
+    assert str(bucket_date("2024-01-10T12:00:00Z", 1)) == "2024-01-10"
+
+
+def test_overlapping_windows_share_one_search(tmp_path):
+    fetcher = CountingFetcher()
+    cache = NewsSearchCache(str(tmp_path / "news.db"), bucket_days=7)
+    cached = CachedNewsFetcher(fetcher, cache)
+    first = cached.fetch_news("Will X happen?", "2024-01-01", "2024-01-08", 5)
+    second = cached.fetch_news("will x happen", "2024-01-03", "2024-01-10", 3)
+    assert len(fetcher.calls) == 1
+    # The search is keyed (and sent) with the bucketed window
+    assert fetcher.calls[0][1:3] == ("2023-12-28", "2024-01-04")
+    assert second == first[:3]
+    # More results than cached means a new search
+    cached.fetch_news("will x happen", "2024-01-03", "2024-01-10", 10)
+    assert len(fetcher.calls) == 2
+    # Persisted across instances
+    reopened = CachedNewsFetcher(fetcher, NewsSearchCache(str(tmp_path / "news.db")))
+    reopened.fetch_news("WILL X HAPPEN", "2024-01-01", "2024-01-08", 10)
+    assert len(fetcher.calls) == 2
+    assert reopened.hits == 1
+
+
+def test_concurrent_identical_requests_are_deduplicated():
+    fetcher = CountingFetcher()
+    cached = CachedNewsFetcher(fetcher, NewsSearchCache())
+    threads = [
+        threading.Thread(
+            target=cached.fetch_news, args=("q", "2024-01-01", "2024-01-08", 5)
+        )
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(fetcher.calls) == 1
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                cached.afetch_news("other", "2024-01-01", "2024-01-08", 1)
+                for _ in range(5)
+            )
+        )
+
+    assert len(asyncio.run(run())) == 5
+    assert len(fetcher.calls) == 2
+
+
+def test_empty_results_are_not_cached_by_default():
+    fetcher = CountingFetcher(results=[])
+    cached = CachedNewsFetcher(fetcher, NewsSearchCache())
+    cached.fetch_news("q", "2024-01-01", "2024-01-08")
+    cached.fetch_news("q", "2024-01-01", "2024-01-08")
+    assert len(fetcher.calls) == 2
+    assert len(cached.cache) == 0
+
+
+class PartialFetcher:
+    """Reports the search as incomplete on the first call."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def _results(self, max_results):
+        self.calls += 1
+        results = [{"link": f"https://n/{i}"} for i in range(max_results)]
+        if self.calls == 1:
+            return results[:10], False
+        return results, True
+
+    def fetch_news_pages(self, query, start_date, end_date, max_results=20):
+        return self._results(max_results)
+
+    async def afetch_news_pages(self, query, start_date, end_date, max_results=20):
+        return self._results(max_results)
+
+
+def test_incomplete_searches_are_not_cached():
+    fetcher = PartialFetcher()
+    cached = CachedNewsFetcher(fetcher, NewsSearchCache())
+    assert len(cached.fetch_news("q", "2024-01-01", "2024-01-08", 20)) == 10
+    assert len(cached.cache) == 0
+    assert len(cached.fetch_news("q", "2024-01-01", "2024-01-08", 20)) == 20
+    assert len(cached.fetch_news("q", "2024-01-01", "2024-01-08", 20)) == 20
+    assert fetcher.calls == 2
+
+    fetcher = PartialFetcher()
+    cached = CachedNewsFetcher(fetcher, NewsSearchCache())
+    first = asyncio.run(cached.afetch_news("q", "2024-01-01", "2024-01-08", 20))
+    assert len(first) == 10 and len(cached.cache) == 0
+    asyncio.run(cached.afetch_news("q", "2024-01-01", "2024-01-08", 20))
+    assert len(cached.cache) == 1
+
+
+def test_article_cache_evicts_least_recently_used(tmp_path):
+    cache = ArticleCache(str(tmp_path / "articles.db"), max_entries=2)
+    cache.put("https://a/1", "One", "d1", etag='"1"')
+    time.sleep(0.01)
+    cache.put("https://a/2", "Two", None, last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    time.sleep(0.01)
+    assert cache.get("https://a/1")["title"] == "One"
+    time.sleep(0.01)
+    cache.put("https://a/3", "Three", "d3")
+    assert len(cache) == 2
+    assert cache.get("https://a/2") is None
+    assert ArticleCache.conditional_headers(cache.get("https://a/1")) == {
+        "If-None-Match": '"1"'
+    }
@@ -0,0 +1,67 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from cafe.main import app
+from cafe.protocols import api
+
+client = TestClient(app)
+
+
+class DummyBatchModel:
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, prompt, parameters, context):
+        return self.predict_batch([prompt], parameters, context)[0]
+
+    def predict_batch(self, prompts, parameters, context):
+        self.batches.append(list(prompts))
+        if "boom" in prompts:
+            raise RuntimeError("batch failed")
+        return [p.upper() for p in prompts]
+
+
+def test_batch_forecast_uses_predict_batch(monkeypatch):
+    model = DummyBatchModel()
+    monkeypatch.setitem(api._shared_models, "vllm", model)
+    monkeypatch.setattr(api.scheduler, "max_batch_size", 2)
+    response = client.post(
+        "/forecast/batch", json={"model": "vllm", "prompts": ["a", "b", "c"]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["result"] for item in data["results"]] == ["A", "B", "C"]
+    assert [item["index"] for item in data["results"]] == [0, 1, 2]
+    assert model.batches == [["a", "b"], ["c"]]
+
+
+def test_batch_forecast_per_item_errors(monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    monkeypatch.setattr("cafe.config.config.Config.GEMINI_API_KEY", None)
+    response = client.post(
+        "/forecast/batch", json={"model": "gemini", "prompts": ["x", "y"]}
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 2
+    assert all(item["error"] is not None for item in results)
+
+
+def test_batch_forecast_streams_ndjson(monkeypatch):
+    monkeypatch.setenv("GEMINI_MOCK_MODE", "1")
+    response = client.post(
+        "/forecast/batch",
+        json={"model": "gemini", "prompts": ["p0", "p1", "p2"], "stream": True},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    assert sorted(item["index"] for item in lines) == [0, 1, 2]
+    for item in lines:
+        assert item["result"]["prompt"] == f"p{item['index']}"
+
+
+def test_batch_forecast_unknown_model():
+    response = client.post("/forecast/batch", json={"model": "nope", "prompts": ["a"]})
+    assert response.status_code == 400
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from cafe.context.memory import InMemoryContext
+from cafe.protocols.batching import MicroBatchScheduler
+
+
+class DummyBatchModel:
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def predict(self, prompt, parameters, context):
+        return self.predict_batch([prompt], parameters, context)[0]
+
+    def predict_batch(self, prompts, parameters, context):
+        with self.lock:
+            self.batches.append(list(prompts))
+        if self.fail:
+            raise RuntimeError("backend down")
+        return [f"{p}:{parameters.get('temperature')}" for p in prompts]
+
+
+def _submit_all(scheduler, model, prompts, parameters_list):
+    async def run():
+        context = InMemoryContext()
+        return await asyncio.gather(
+            *[
+                scheduler.submit("dummy", model, p, params, context)
+                for p, params in zip(prompts, parameters_list)
+            ],
+            return_exceptions=True,
+        )
+
+    return asyncio.run(run())
+
+
+def test_scheduler_groups_up_to_max_batch_size():
+    model = DummyBatchModel()
+    scheduler = MicroBatchScheduler(max_batch_size=4, max_wait_ms=50)
+    prompts = [f"p{i}" for i in range(8)]
+    results = _submit_all(scheduler, model, prompts, [{}] * 8)
+    assert results == [f"p{i}:None" for i in range(8)]
+    assert sorted(len(b) for b in model.batches) == [4, 4]
+
+
+def test_scheduler_flushes_partial_batch_after_wait():
+    model = DummyBatchModel()
+    scheduler = MicroBatchScheduler(max_batch_size=100, max_wait_ms=5)
+    results = _submit_all(scheduler, model, ["a", "b", "c"], [{}] * 3)
+    assert results == ["a:None", "b:None", "c:None"]
+    assert model.batches == [["a", "b", "c"]]
+
+
+def test_scheduler_does_not_mix_parameters():
+    model = DummyBatchModel()
+    scheduler = MicroBatchScheduler(max_batch_size=10, max_wait_ms=5)
+    params = [{"temperature": 0.1}, {"temperature": 0.9}, {"temperature": 0.1}]
+    results = _submit_all(scheduler, model, ["a", "b", "c"], params)
+    assert results == ["a:0.1", "b:0.9", "c:0.1"]
+    assert sorted(model.batches) == [["a", "c"], ["b"]]
+
+
+def test_scheduler_propagates_batch_errors():
+    model = DummyBatchModel(fail=True)
+    scheduler = MicroBatchScheduler(max_batch_size=2, max_wait_ms=5)
+    results = _submit_all(scheduler, model, ["a", "b"], [{}] * 2)
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_scheduler_rejects_invalid_batch_size():
+    with pytest.raises(ValueError):
+        MicroBatchScheduler(max_batch_size=0)
+
+
+def test_scheduler_keeps_dispatch_tasks_until_done():
+    model = DummyBatchModel()
+    scheduler = MicroBatchScheduler(max_batch_size=2, max_wait_ms=1000)
+
+    async def run():
+        context = InMemoryContext()
+        futures = [
+            asyncio.ensure_future(scheduler.submit("dummy", model, p, {}, context))
+            for p in ["a", "b", "c"]
+        ]
+        await asyncio.sleep(0)
+        # The full batch is dispatching; the partial one is still queued
+        assert len(scheduler._tasks) == 1
+        await scheduler.shutdown()
+        assert not scheduler._tasks
+        return await asyncio.gather(*futures)
+
+    assert asyncio.run(run()) == ["a:None", "b:None", "c:None"]
+
+
+def test_shared_model_is_created_once_under_concurrency(monkeypatch):
+    from cafe.protocols import api
+
+    created = []
+
+    def slow_get_model(name):
+        created.append(name)
+        time.sleep(0.05)
+        return object()
+
+    monkeypatch.setattr(api, "get_model", slow_get_model)
+    monkeypatch.setattr(api, "_shared_models", {})
+    threads = [
+        threading.Thread(target=api.get_shared_model, args=("vllm",)) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert created == ["vllm"]
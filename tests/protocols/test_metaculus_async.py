@@ -0,0 +1,104 @@
+import asyncio
+import json
+import time
+
+import httpx
+
+from cafe.main import app
+from cafe.sources.source_metaculus import MetaculusForecastSource
+
+UPSTREAM_DELAY = 0.3
+N_REQUESTS = 8
+
+
+def _fake_comment(qid):
+    return type(
+        "C",
+        (),
+        {
+            "raw": {"id": qid, "text": f"comment {qid}"},
+            "id": qid,
+            "text": f"comment {qid}",
+            "author": None,
+            "created_at": None,
+            "vote_score": None,
+        },
+    )()
+
+
+async def _slow_upstream(self, qid):
+    # Simulates a slow Metaculus API on cache miss
+    await asyncio.sleep(UPSTREAM_DELAY)
+    return [_fake_comment(qid)]
+
+
+async def _get_comments(client, tmp_path, qid, force_refresh=True):
+    path = tmp_path / f"{qid}.json"
+    return await client.get(
+        f"/metaculus/questions/{qid}/comments",
+        params={"force_refresh": force_refresh, "comments_cache_path": str(path)},
+    )
+
+
+def test_cache_misses_are_served_concurrently(tmp_path, monkeypatch):
+    """Load test: N slow upstream fetches overlap, all on the app's shared client."""
+    intervals = []
+    clients = []
+
+    async def recording_upstream(self, qid):
+        clients.append(self._get_async_client())
+        start = time.perf_counter()
+        await asyncio.sleep(UPSTREAM_DELAY)
+        intervals.append((start, time.perf_counter()))
+        return [_fake_comment(qid)]
+
+    monkeypatch.setattr(
+        MetaculusForecastSource,
+        "alist_metaculus_comments_for_question",
+        recording_upstream,
+    )
+
+    async def run():
+        async with app.router.lifespan_context(app):
+            shared = app.state.http_client
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+                responses = await asyncio.gather(
+                    *[_get_comments(c, tmp_path, qid) for qid in range(N_REQUESTS)]
+                )
+            assert not shared.is_closed
+        return responses, shared
+
+    responses, shared = asyncio.run(run())
+    assert all(r.status_code == 200 for r in responses)
+    assert [r.json()[0]["id"] for r in responses] == list(range(N_REQUESTS))
+    # Every upstream call was in flight at the same moment
+    assert len(intervals) == N_REQUESTS
+    assert max(start for start, _ in intervals) < min(end for _, end in intervals)
+    assert all(client is shared for client in clients)
+    assert shared.is_closed
+
+
+def test_cache_hit_not_starved_by_slow_miss(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        MetaculusForecastSource, "alist_metaculus_comments_for_question", _slow_upstream
+    )
+    cached = tmp_path / "99.json"
+    cached.write_text(
+        json.dumps([{"id": 99, "text": "cached", "author": {"id": 1, "username": "u"}}])
+    )
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            slow = asyncio.ensure_future(_get_comments(c, tmp_path, 1))
+            await asyncio.sleep(0.01)
+            start = time.perf_counter()
+            fast = await _get_comments(c, tmp_path, 99, force_refresh=False)
+            fast_elapsed = time.perf_counter() - start
+            await slow
+            return fast, fast_elapsed
+
+    fast, fast_elapsed = asyncio.run(run())
+    assert fast.json()[0]["text"] == "cached"
+    assert fast_elapsed < UPSTREAM_DELAY
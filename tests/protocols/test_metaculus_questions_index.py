@@ -0,0 +1,112 @@
+import json
+import os
+
+from fastapi.testclient import TestClient
+
+from cafe.main import app
+from cafe.protocols import question_index
+
+client = TestClient(app)
+
+QUESTIONS = [
+    {
+        "id": i,
+        "title": f"Q{i}",
+        "status": "open" if i % 2 else "resolved",
+        "tags": ["ai"] if i < 3 else ["politics"],
+        "created_at": f"2024-01-0{i + 1}T00:00:00",
+    }
+    for i in range(6)
+]
+
+
+def write_cache(tmp_path, questions=QUESTIONS):
+    path = tmp_path / "questions_cache.json"
+    path.write_text(json.dumps(questions))
+    return str(path)
+
+
+def get_questions(path, headers=None, **params):
+    return client.get(
+        "/metaculus/questions",
+        params={"questions_cache_path": path, **params},
+        headers=headers or {},
+    )
+
+
+def test_pagination_and_total_count(tmp_path):
+    path = write_cache(tmp_path)
+    resp = get_questions(path, limit=2, offset=1)
+    assert resp.status_code == 200
+    assert [q["id"] for q in resp.json()] == ["1", "2"]
+    assert resp.headers["X-Total-Count"] == "6"
+
+
+def test_filters_by_status_tag_and_dates(tmp_path):
+    path = write_cache(tmp_path)
+    resp = get_questions(path, status="open", tag="ai")
+    assert [q["id"] for q in resp.json()] == ["1"]
+    resp = get_questions(
+        path, created_after="2024-01-03T00:00:00", created_before="2024-01-05"
+    )
+    assert [q["id"] for q in resp.json()] == ["2", "3", "4"]
+
+
+def test_etag_returns_not_modified(tmp_path):
+    path = write_cache(tmp_path)
+    first = get_questions(path, status="open")
+    etag = first.headers["ETag"]
+    second = get_questions(path, headers={"If-None-Match": etag}, status="open")
+    assert second.status_code == 304
+    # A different query has a different ETag
+    other = get_questions(path, headers={"If-None-Match": etag}, status="resolved")
+    assert other.status_code == 200
+
+
+def test_index_reloads_when_file_changes(tmp_path):
+    path = write_cache(tmp_path)
+    etag = get_questions(path).headers["ETag"]
+    write_cache(tmp_path, QUESTIONS[:2])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    resp = get_questions(path, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert len(resp.json()) == 2
+
+
+def test_index_parses_file_once(tmp_path, monkeypatch):
+    path = write_cache(tmp_path)
+    get_questions(path)
+    calls = []
+    original = question_index.LocalForecastSource._parse_question
+
+    def counting_parse(self, item):
+        calls.append(item)
+        return original(self, item)
+
+    monkeypatch.setattr(
+        question_index.LocalForecastSource, "_parse_question", counting_parse
+    )
+    get_questions(path, limit=1)
+    assert calls == []
+
+
+def test_snapshot_is_unaffected_by_refresh(tmp_path):
+    path = write_cache(tmp_path)
+    index = question_index.QuestionIndex(path)
+    old = index.refresh_if_stale()
+    assert old.query(status="open") == [1, 3, 5]
+    write_cache(tmp_path, QUESTIONS[:2])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    new = index.refresh_if_stale()
+    assert index.snapshot() is new
+    assert new.query(status="open") == [1]
+    # A reader holding the old snapshot keeps matching questions and positions
+    assert old.query(status="open") == [1, 3, 5]
+    assert [old.questions[pos].title for pos in old.query(status="open")] == [
+        "Q1",
+        "Q3",
+        "Q5",
+    ]
+    assert old.version != new.version
@@ -0,0 +1,78 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from cafe.main import app
+from cafe.protocols import responses
+from cafe.protocols.responses import negotiate_encoding
+
+client = TestClient(app)
+
+QUESTIONS = [
+    {"id": i, "title": f"Question number {i}", "description": "x" * 50, "tags": []}
+    for i in range(100)
+]
+
+
+def write_cache(tmp_path):
+    path = tmp_path / "questions_cache.json"
+    path.write_text(json.dumps(QUESTIONS))
+    return str(path)
+
+
+def test_negotiate_encoding(monkeypatch):
+    monkeypatch.setattr(responses, "brotli", None)
+    assert negotiate_encoding("gzip, deflate, br") == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("*") == "gzip"
+    assert negotiate_encoding("") is None
+    monkeypatch.setattr(responses, "brotli", object())
+    assert negotiate_encoding("gzip, br") == "br"
+
+
+def test_questions_gzip_and_identity(tmp_path):
+    path = write_cache(tmp_path)
+    params = {"questions_cache_path": path}
+    gz = client.get(
+        "/metaculus/questions", params=params, headers={"Accept-Encoding": "gzip"}
+    )
+    assert gz.headers["content-encoding"] == "gzip"
+    assert gz.headers["vary"] == "Accept-Encoding"
+    plain = client.get(
+        "/metaculus/questions", params=params, headers={"Accept-Encoding": "identity"}
+    )
+    assert "content-encoding" not in plain.headers
+    assert gz.json() == plain.json()
+    assert plain.json()[0] == {
+        "id": "0",
+        "title": "Question number 0",
+        "description": "x" * 50,
+        "url": None,
+        "tags": [],
+    }
+
+
+def test_questions_payload_serialized_once(tmp_path, monkeypatch):
+    path = write_cache(tmp_path)
+    calls = []
+    original = responses.dumps_json
+    monkeypatch.setattr(
+        responses, "dumps_json", lambda data: calls.append(1) or original(data)
+    )
+    for _ in range(3):
+        client.get("/metaculus/questions", params={"questions_cache_path": path})
+    assert len(calls) == 1
+
+
+def test_small_comment_payload_not_compressed(tmp_path):
+    path = tmp_path / "1.json"
+    path.write_text(
+        json.dumps([{"id": 1, "text": "hi", "author": {"id": 1, "username": "u"}}])
+    )
+    resp = client.get(
+        "/metaculus/questions/1/comments",
+        params={"comments_cache_path": str(path)},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert "content-encoding" not in resp.headers
+    assert resp.json()[0]["author"] == "u"
@@ -0,0 +1,54 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from cafe.main import app
+
+client = TestClient(app)
+
+
+def parse_sse(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_forecast_stream_gemini_mock(monkeypatch):
+    monkeypatch.setenv("GEMINI_MOCK_MODE", "1")
+    response = client.post(
+        "/forecast/stream",
+        json={"model": "gemini", "prompt": "my probability is 0.7"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(response.text)
+    tokens = [data["text"] for name, data in events if name == "token"]
+    assert len(tokens) == 4
+    assert "".join(tokens) == "my probability is 0.7"
+    name, data = events[-1]
+    assert name == "answer"
+    assert data["answer"] == "0.7"
+
+
+def test_forecast_stream_reports_errors(monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    monkeypatch.delenv("GEMINI_MOCK_MODE", raising=False)
+    monkeypatch.setattr("cafe.config.config.Config.GEMINI_API_KEY", None)
+    response = client.post(
+        "/forecast/stream", json={"model": "gemini", "prompt": "Test prompt"}
+    )
+    assert response.status_code == 200
+    name, data = parse_sse(response.text)[-1]
+    assert name == "error"
+    assert "API key" in data["error"]
+
+
+def test_forecast_stream_falls_back_to_predict():
+    response = client.post(
+        "/forecast/stream", json={"model": "timeseries_api", "prompt": "x"}
+    )
+    events = parse_sse(response.text)
+    assert [name for name, _ in events] == ["answer"]
+    assert events[0][1]["result"]["message"]
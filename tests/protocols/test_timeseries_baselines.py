@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from cafe.context.memory import InMemoryContext
+from cafe.models.timeseries import local
+from cafe.models.timeseries.baselines import forecast_baseline, pack_series
+from cafe.models.timeseries.local import TimeSeriesLocalModel
+
+
+def test_pack_series_right_aligns_ragged_input():
+    packed = pack_series([[1.0, 2.0, 3.0], [5.0]])
+    assert packed.shape == (2, 3)
+    assert packed[1, -1] == 5.0
+    assert np.isnan(packed[1, 0])
+
+
+def test_baselines_forecast_many_series_at_once():
+    series = [[1.0, 2.0, 3.0, 4.0], [10.0, 10.0], [0.2, 0.3, 0.4]]
+    last = forecast_baseline("last_value", series, steps=2)
+    assert last.tolist() == [[4.0, 4.0], [10.0, 10.0], [0.4, 0.4]]
+
+    trend = forecast_baseline("linear_trend", series, steps=2)
+    np.testing.assert_allclose(trend[0], [5.0, 6.0])
+    np.testing.assert_allclose(trend[1], [10.0, 10.0])
+
+    ewma = forecast_baseline("ewma", series, steps=1, options={"alpha": 1.0})
+    np.testing.assert_allclose(ewma[:, 0], [4.0, 10.0, 0.4])
+
+    damped = forecast_baseline("damped_trend", series, steps=3)
+    assert damped.shape == (3, 3)
+    assert np.all(np.diff(damped[0]) > 0)
+
+
+def test_logit_random_walk_stays_in_unit_interval():
+    series = [[0.9, 0.95, 0.99, 0.999], [0.5, 0.4, 0.3]]
+    forecast = forecast_baseline(
+        "logit_random_walk", series, steps=5, options={"drift": True}
+    )
+    assert np.all((forecast > 0) & (forecast < 1))
+    assert forecast[0, -1] > 0.999
+    assert forecast[1, -1] < 0.3
+
+
+def test_unknown_baseline_raises():
+    with pytest.raises(ValueError):
+        forecast_baseline("nope", [[1.0]])
+
+
+def test_predict_selects_baseline_by_method():
+    model = TimeSeriesLocalModel()
+    result = model.predict(
+        "q1",
+        {"series": [1.0, 2.0, 3.0], "steps": 2, "method": "linear_trend"},
+        InMemoryContext(),
+    )
+    np.testing.assert_allclose(result["forecast"], [4.0, 5.0])
+    assert result["diagnostics"]["method"] == "linear_trend"
+
+    bad = model.predict(
+        "q1",
+        {"series": [1.0], "method": "ewma", "options": {"beta": 1}},
+        InMemoryContext(),
+    )
+    assert "error" in bad
+
+
+def test_predict_many_with_baseline_skips_arima(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("ARIMA should not be fitted")
+
+    monkeypatch.setattr(local, "fit_arima_many", fail)
+    model = TimeSeriesLocalModel()
+    series_by_id = {f"q{i}": [float(i)] * (i + 1) for i in range(100)}
+    results = model.predict_many(
+        series_by_id, {"steps": 1, "method": "last_value"}, InMemoryContext()
+    )
+    assert results["q42"]["forecast"] == [42.0]
+
+
+def test_fallback_replaces_failed_arima(monkeypatch):
+    monkeypatch.setattr(
+        local, "fit_arima", lambda series, order, steps: {"error": "did not converge"}
+    )
+    monkeypatch.setattr(
+        local,
+        "fit_arima_many",
+        lambda series_by_id, order, steps, processes=None, timeout=None: {
+            sid: {"error": "ARIMA fit timed out after 1s"} for sid in series_by_id
+        },
+    )
+    model = TimeSeriesLocalModel()
+    context = InMemoryContext()
+    params = {"series": [1.0, 2.0], "fallback": "last_value"}
+    result = model.predict("q1", params, context)
+    assert result["forecast"] == [2.0]
+    assert result["diagnostics"]["fallback_from"] == "did not converge"
+    # Fallbacks are not cached, so ARIMA is retried on the next call
+    assert context.get_data(model._make_cache_key("q1", params)) is None
+
+    results = model.predict_many(
+        {"a": [3.0, 4.0]}, {"fallback": "last_value"}, context, timeout=1
+    )
+    assert results["a"]["forecast"] == [4.0]
+    assert "timed out" in results["a"]["diagnostics"]["fallback_from"]
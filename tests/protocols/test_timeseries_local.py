@@ -0,0 +1,202 @@
+import multiprocessing
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("statsmodels", reason="statsmodels not installed")
+
+from cafe.context.memory import InMemoryContext
+from cafe.models.timeseries import arima, local
+from cafe.models.timeseries.local import TimeSeriesLocalModel
+
+
+def random_walk(seed, n=40):
+    rng = np.random.default_rng(seed)
+    return (np.cumsum(rng.normal(size=n)) + 50).tolist()
+
+
+def test_predict_returns_forecast_and_diagnostics():
+    model = TimeSeriesLocalModel()
+    result = model.predict(
+        "q1", {"series": random_walk(0), "steps": 3}, InMemoryContext()
+    )
+    assert len(result["forecast"]) == 3
+    assert result["diagnostics"]["nobs"] == 40
+    assert "aic" in result["diagnostics"]
+
+
+def test_predict_validates_parameters():
+    model = TimeSeriesLocalModel()
+    result = model.predict("q1", {"series": []}, InMemoryContext())
+    assert "error" in result
+    assert "error" in model.predict("q1", {}, InMemoryContext())
+
+
+def test_predict_accepts_numpy_series():
+    model = TimeSeriesLocalModel()
+    series = np.asarray(random_walk(0))
+    result = model.predict("q1", {"series": series, "steps": 2}, InMemoryContext())
+    assert len(result["forecast"]) == 2
+    empty = model.predict("q1", {"series": np.array([])}, InMemoryContext())
+    assert "error" in empty
+
+
+def test_predict_many_across_processes():
+    model = TimeSeriesLocalModel()
+    series_by_id = {f"q{i}": random_walk(i) for i in range(4)}
+    series_by_id["bad"] = []
+    results = model.predict_many(
+        series_by_id, {"steps": 2}, InMemoryContext(), processes=2, timeout=60
+    )
+    assert list(results) == ["q0", "q1", "q2", "q3", "bad"]
+    for sid in ["q0", "q1", "q2", "q3"]:
+        assert len(results[sid]["forecast"]) == 2
+    assert "error" in results["bad"]
+
+
+def test_predict_many_shares_cache_with_predict(monkeypatch):
+    model = TimeSeriesLocalModel()
+    context = InMemoryContext()
+    series = random_walk(7)
+    single = model.predict("q7", {"series": series, "steps": 2}, context)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached series must not be refit")
+
+    monkeypatch.setattr(local, "fit_arima_many", fail)
+    results = model.predict_many({"q7": series}, {"steps": 2}, context)
+    assert results["q7"] == single
+
+
+def test_warm_start_appends_new_points():
+    model = TimeSeriesLocalModel()
+    context = InMemoryContext()
+    series = random_walk(3, n=60)
+    params = {"series_id": "q3", "steps": 2}
+    first = model.predict("q3", {**params, "series": series[:50]}, context)
+    assert first["diagnostics"]["fit_mode"] == "full"
+    second = model.predict("q3", {**params, "series": series[:55]}, context)
+    assert second["diagnostics"]["fit_mode"] == "append"
+    assert second["diagnostics"]["nobs"] == 55
+    assert len(second["forecast"]) == 2
+
+
+def test_warm_start_refits_on_policy_and_rewritten_history():
+    model = TimeSeriesLocalModel()
+    context = InMemoryContext()
+    series = random_walk(4, n=60)
+    params = {"series_id": "q4", "refit_every": 1}
+    model.predict("q4", {**params, "series": series[:50]}, context)
+    assert (
+        model.predict("q4", {**params, "series": series[:52]}, context)["diagnostics"][
+            "fit_mode"
+        ]
+        == "append"
+    )
+    # refit_every=1 allows a single incremental update
+    assert (
+        model.predict("q4", {**params, "series": series[:54]}, context)["diagnostics"][
+            "fit_mode"
+        ]
+        == "full"
+    )
+    rewritten = [v + 1.0 for v in series[:56]]
+    assert (
+        model.predict("q4", {**params, "series": rewritten}, context)["diagnostics"][
+            "fit_mode"
+        ]
+        == "full"
+    )
+
+
+def test_select_order_respects_bounds_and_patience():
+    series = random_walk(5, n=80)
+    selection = arima.select_order(series, max_p=2, max_d=1, max_q=2, processes=2)
+    assert selection["stopped"] == "complete"
+    assert selection["evaluated"] == selection["candidates"] == 9
+    p, d, q = selection["order"]
+    assert p <= 2 and d <= 1 and q <= 2
+
+    early = arima.select_order(series, max_p=2, max_q=2, processes=1, patience=1)
+    assert early["stopped"] in ("patience", "complete")
+    assert early["evaluated"] <= 9
+
+    with pytest.raises(ValueError, match="time_budget"):
+        arima.select_order(series, processes=1, time_budget=0)
+
+
+def test_auto_order_searches_inline_by_default(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("order search must not start a pool by default")
+
+    monkeypatch.setattr(arima.multiprocessing, "Pool", no_pool)
+    model = TimeSeriesLocalModel()
+    result = model.predict(
+        "q8",
+        {"series": random_walk(8), "order": "auto", "order_search": {"max_p": 1}},
+        InMemoryContext(),
+    )
+    assert result["diagnostics"]["order_selection"]["cached"] is False
+
+    missing = model.predict("q8", {"order": "auto"}, InMemoryContext())
+    assert "error" in missing
+
+
+def test_auto_order_is_cached_per_series(monkeypatch):
+    model = TimeSeriesLocalModel()
+    context = InMemoryContext()
+    series = random_walk(6, n=60)
+    params = {
+        "series_id": "q6",
+        "order": "auto",
+        "order_search": {"max_p": 1, "max_q": 1, "processes": 1},
+    }
+    first = model.predict("q6", {**params, "series": series[:50]}, context)
+    selection = first["diagnostics"]["order_selection"]
+    assert selection["cached"] is False
+    assert first["diagnostics"]["order"] == selection["order"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("order search must not run again")
+
+    monkeypatch.setattr(local, "select_order", fail)
+    second = model.predict("q6", {**params, "series": series}, context)
+    assert second["diagnostics"]["order_selection"]["cached"] is True
+    assert second["diagnostics"]["order"] == selection["order"]
+
+    # predict_many reuses the order cached under the same series id
+    many = model.predict_many(
+        {"q6": series[:55]},
+        {k: v for k, v in params.items() if k != "series_id"},
+        context,
+        processes=1,
+    )
+    assert many["q6"]["diagnostics"]["order_selection"]["cached"] is True
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="patched fit_arima only reaches workers under fork",
+)
+def test_fit_many_times_out_only_hung_fits(monkeypatch):
+    original = arima.fit_arima
+
+    def maybe_hang(series, *args):
+        if series[0] < 0:
+            time.sleep(60)
+        return original(series, *args)
+
+    monkeypatch.setattr(arima, "fit_arima", maybe_hang)
+    series_by_id = {f"hung{i}": [-1.0] * 40 for i in range(2)}
+    series_by_id.update({f"q{i}": random_walk(i) for i in range(6)})
+    start = time.perf_counter()
+    results = arima.fit_arima_many(series_by_id, steps=2, processes=2, timeout=1)
+    elapsed = time.perf_counter() - start
+    assert list(results) == list(series_by_id)
+    for sid in ["hung0", "hung1"]:
+        assert "timed out" in results[sid]["error"]
+    for i in range(6):
+        assert len(results[f"q{i}"]["forecast"]) == 2
+    # The hung workers are killed after their own timeout, not waited on
+    assert elapsed < 10
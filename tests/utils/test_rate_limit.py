@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from cafe.utils.rate_limit import TokenBucket, get_rate_limiter, retry_after_seconds
+
+
+def test_token_bucket_allows_burst_then_rate():
+    bucket = TokenBucket(rate=20, burst=3)
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_acquire() == pytest.approx(0.05, abs=0.01)
+    start = time.perf_counter()
+    for _ in range(4):
+        bucket.acquire()
+    assert time.perf_counter() - start == pytest.approx(0.2, abs=0.06)
+
+
+def test_token_bucket_async_and_penalty():
+    bucket = TokenBucket(rate=50, burst=2)
+    bucket.penalize(0.2)
+    # A Retry-After style penalty holds back every caller
+    assert bucket.try_acquire() >= 0.19
+
+    async def run():
+        start = time.perf_counter()
+        await asyncio.gather(*(bucket.aacquire() for _ in range(3)))
+        return time.perf_counter() - start
+
+    assert 0.2 <= asyncio.run(run()) <= 0.4
+
+
+def test_token_bucket_shared_through_lock_file(tmp_path):
+    path = str(tmp_path / "quota.bucket")
+    first = TokenBucket(rate=10, burst=2, lock_path=path)
+    second = TokenBucket(rate=10, burst=2, lock_path=path)
+    assert first.try_acquire() == 0.0
+    assert first.try_acquire() == 0.0
+    # The other process-level bucket sees the same (empty) state
+    assert second.try_acquire() == pytest.approx(0.1, abs=0.02)
+
+
+def test_registry_and_retry_after():
+    assert get_rate_limiter("test_quota", 5) is get_rate_limiter("test_quota", 1)
+    assert retry_after_seconds(httpx.Response(429, headers={"Retry-After": "3"})) == 3
+    assert retry_after_seconds(httpx.Response(429)) is None
+    past = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert retry_after_seconds(httpx.Response(503, headers={"Retry-After": past})) == 0